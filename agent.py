@@ -1,9 +1,56 @@
+import calendar
 import random
-from dataclasses import dataclass, field
-from typing import List, Optional, Dict
+from dataclasses import dataclass, field, InitVar
+from typing import List, Optional, Dict, Tuple
 from enum import Enum
-import uuid
-from datetime import datetime, date
+import itertools
+from datetime import datetime, date, timedelta
+
+from registry import LOOSE_ID_BASE
+from social_graph import FriendIdsView
+
+# Version stamps for traits that feed compatibility scores (see compatibility.py)
+_trait_versions = itertools.count(1)
+
+# Accidental pregnancy: chance per female/male encounter, higher if they know each other
+ACCIDENTAL_ENCOUNTER_CHANCE = 0.001  # 0.1% per interaction
+ACCIDENTAL_KNOWN_MULTIPLIER = 10  # Friends or dating: 1.0%
+
+# Pregnancy timeline in days (the city schedules a timer for the end of each)
+PREGNANCY_TERM_DAYS = 270  # 9 months
+POSTPARTUM_DAYS = 180  # ~6 months of recovery before the next pregnancy
+
+# A new city's start date; relationships of agents never in a city are measured against it
+DEFAULT_START_DATE = date(2024, 1, 1)
+
+# Ids for agents created outside any city, in a range no city issues from (see registry.py)
+_loose_agent_ids = itertools.count(LOOSE_ID_BASE)
+
+def new_agent_id(city=None) -> int:
+    """Next id from the city's registry, or from the process-wide counter without a city"""
+    if city is not None:
+        return city.registry.new_id()
+    return next(_loose_agent_ids)
+
+def format_agent_id(agent_id: Optional[int]) -> str:
+    """Display form of an agent id for the UI"""
+    return "-" if agent_id is None else f"#{agent_id:06d}"
+
+def age_on(birthday: date, today: date) -> int:
+    """Whole years from birthday to today (a Feb 29 birthday comes on Mar 1 in common years)"""
+    return today.year - birthday.year - ((today.month, today.day) < (birthday.month, birthday.day))
+
+def birthday_for_age(age: int, month: int, day: int, today: date) -> date:
+    """The birthday on month/day that makes someone `age` years old today
+    
+    When that year has no Feb 29, a leap-day birthday falls on Feb 28 instead
+    (the month/day key changes, the age does not).
+    """
+    year = today.year - age - ((today.month, today.day) < (month, day))
+    if month == 2 and day == 29 and not calendar.isleap(year):
+        day = 28
+        year = today.year - age - ((today.month, today.day) < (month, day))
+    return date(year, month, day)
 
 class PersonalityTrait(Enum):
     """Big Five personality traits (OCEAN model)"""
@@ -34,6 +81,20 @@ class LifeGoal(Enum):
     FITNESS_FOCUSED = "fitness_focused"
     STABILITY_SEEKER = "stability_seeker"
 
+# Goal pairs that make a relationship very unlikely to work
+MAJOR_GOAL_CONFLICTS = [
+    (LifeGoal.WANTS_CHILDREN, LifeGoal.NO_CHILDREN),
+    (LifeGoal.MARRIAGE_FOCUSED, LifeGoal.INDEPENDENCE),
+    (LifeGoal.FAMILY_ORIENTED, LifeGoal.CAREER_FOCUSED),
+    (LifeGoal.STABILITY_SEEKER, LifeGoal.TRAVEL_ENTHUSIAST)
+]
+
+# (my goal, their goal, bonus): different but compatible goals
+COMPLEMENTARY_GOALS = [
+    (LifeGoal.CAREER_FOCUSED, LifeGoal.FAMILY_ORIENTED, 10),
+    (LifeGoal.SOCIAL_BUTTERFLY, LifeGoal.KNOWLEDGE_SEEKER, 5)
+]
+
 class EducationLevel(Enum):
     HIGH_SCHOOL = "high_school"
     SOME_COLLEGE = "some_college"
@@ -67,7 +128,7 @@ class SexualOrientation(Enum):
     LESBIAN = "lesbian"
     BISEXUAL = "bisexual"
 
-@dataclass
+@dataclass(slots=True)
 class Personality:
     """Personality traits scored 0-100"""
     openness: int = 50
@@ -75,6 +136,12 @@ class Personality:
     extraversion: int = 50
     agreeableness: int = 50
     neuroticism: int = 50
+    _version: int = field(default=0, init=False, repr=False, compare=False)  # Bumped on every change
+    
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        # Any trait change invalidates cached compatibility scores
+        object.__setattr__(self, "_version", next(_trait_versions))
     
     def compatibility_score(self, other: 'Personality') -> float:
         """Calculate compatibility between two personalities (0-100)"""
@@ -93,21 +160,25 @@ class Personality:
         
         return sum(scores) / len(scores)
 
-@dataclass
+@dataclass(slots=True)
 class Agent:
     """A simulated person in the city"""
     
     # Identity
-    id: str = field(default_factory=lambda: str(uuid.uuid4())[:8])
+    id: int = field(default_factory=new_agent_id)
     name: str = ""
-    age: int = 18
+    age: InitVar[int] = 18  # Initial age; in a city, age is derived from birthday (see the age property)
     birthday: date = field(default_factory=lambda: date(2000, 1, 1))  # Will be set properly in generation
+    _age: int = field(default=18, init=False, repr=False)  # Age on _age_date, or the age itself outside a city
+    _age_date: Optional[date] = field(default=None, init=False, repr=False, compare=False)
     gender: str = "male"  # male, female, non binary
     
     # Personality and Goals
-    personality: Personality = field(default_factory=Personality)
-    life_goals: List[LifeGoal] = field(default_factory=list)
-    hobbies: List[str] = field(default_factory=list)
+    personality: Personality = field(default_factory=Personality)  # Stamped by its own _version
+    life_goals: InitVar[Optional[List[LifeGoal]]] = None  # See the life_goals and hobbies properties
+    hobbies: InitVar[Optional[List[str]]] = None
+    _life_goals: List[LifeGoal] = field(default_factory=list, init=False, repr=False)
+    _hobbies: List[str] = field(default_factory=list, init=False, repr=False)
     
     # Education and Career
     education_level: EducationLevel = EducationLevel.HIGH_SCHOOL
@@ -118,24 +189,30 @@ class Agent:
     # Relationships
     relationship_status: RelationshipStatus = RelationshipStatus.SINGLE
     sexual_orientation: SexualOrientation = SexualOrientation.STRAIGHT
-    partner_id: Optional[str] = None
-    friend_ids: List[str] = field(default_factory=list)
-    children_ids: List[str] = field(default_factory=list)
+    partner_id: InitVar[Optional[int]] = None  # See the partner_id property
+    _partner_id: Optional[int] = field(default=None, init=False, repr=False)
+    friend_ids: InitVar[Optional[List[int]]] = None  # Initial friends; afterwards a read-only view (see the property)
+    _friends: Dict[int, None] = field(default_factory=dict, init=False, repr=False)  # Ordered set, shared with City.social
+    children_ids: List[int] = field(default_factory=list)
     
     # Family
-    mother_id: Optional[str] = None
-    father_id: Optional[str] = None
+    mother_id: Optional[int] = None
+    father_id: Optional[int] = None
     mother_name: str = ""  # For deceased parents not in simulation
     father_name: str = ""  # For deceased parents not in simulation
     
     # Pregnancy and Family
-    pregnancy_status: PregnancyStatus = PregnancyStatus.NOT_PREGNANT
-    pregnancy_days: int = 0  # Days into pregnancy (270 days equals 9 months equals full term)
-    days_since_birth: int = 0  # Recovery period after birth
+    pregnancy_status: InitVar[PregnancyStatus] = PregnancyStatus.NOT_PREGNANT  # See the pregnancy properties
+    pregnancy_days: InitVar[Optional[int]] = None
+    days_since_birth: InitVar[Optional[int]] = None
+    _pregnancy_status: PregnancyStatus = field(default=PregnancyStatus.NOT_PREGNANT, init=False, repr=False)
+    _conceived_day: Optional[int] = field(default=None, init=False, repr=False)  # Day (city clock) of conception
+    _gave_birth_day: Optional[int] = field(default=None, init=False, repr=False)  # Day of the last birth, until recovered
+    pregnancy_father_id: Optional[int] = None  # Father of the current pregnancy
     
     # Relationship tracking
     relationship_start_date: Optional[date] = None  # When current relationship started
-    days_in_relationship: int = 0  # Days with current partner
+    _detached_date: date = field(default=DEFAULT_START_DATE, init=False, repr=False)  # Today outside a city: the day it left one
     
     # Life Stats
     happiness: int = 50  # 0 to 100
@@ -154,6 +231,183 @@ class Agent:
     relationship_history: List[Dict] = field(default_factory=list)
     job_history: List[Dict] = field(default_factory=list)
     
+    # City this agent lives in (set by City.add_agent)
+    city: Optional['City'] = field(default=None, repr=False, compare=False)
+    
+    # Compatibility stamp (see invalidate_compatibility) and population store row (see population.py)
+    _traits_version: int = field(default_factory=lambda: next(_trait_versions), init=False, repr=False, compare=False)
+    _store: Optional['PopulationStore'] = field(default=None, init=False, repr=False, compare=False)
+    _row: int = field(default=-1, init=False, repr=False, compare=False)
+    
+    def __post_init__(self, age: int, life_goals: Optional[List[LifeGoal]], hobbies: Optional[List[str]],
+                      partner_id: Optional[int], friend_ids: Optional[List[int]], pregnancy_status: PregnancyStatus,
+                      pregnancy_days: Optional[int], days_since_birth: Optional[int]):
+        self._age = age
+        self._partner_id = partner_id
+        self._pregnancy_status = pregnancy_status
+        if pregnancy_days is not None:
+            self._conceived_day = self._today() - pregnancy_days
+        if days_since_birth is not None:
+            self._gave_birth_day = self._today() - days_since_birth
+        if friend_ids:
+            self._friends.update(dict.fromkeys(friend_ids))  # One-sided, as given
+        if life_goals is not None:
+            self._life_goals = life_goals
+        if hobbies is not None:
+            self._hobbies = hobbies
+    
+    def _get_life_goals(self) -> List[LifeGoal]:
+        return self._life_goals
+    
+    def _set_life_goals(self, life_goals: List[LifeGoal]):
+        self._life_goals = life_goals
+        self.invalidate_compatibility()
+    
+    def _get_hobbies(self) -> List[str]:
+        return self._hobbies
+    
+    def _set_hobbies(self, hobbies: List[str]):
+        self._hobbies = hobbies
+        self.invalidate_compatibility()
+    
+    def _get_age(self) -> int:
+        # Computed at most once per simulated day
+        city = self.city
+        if city is None:
+            return self._age
+        today = city.current_date
+        if self._age_date != today:
+            self._age = age_on(self.birthday, today)
+            self._age_date = today
+        return self._age
+    
+    def _set_age(self, age: int):
+        # In a city, moves the birthday to the year that gives this age today
+        city = self.city
+        if city is not None:
+            old, birthday = self.birthday, birthday_for_age(age, self.birthday.month, self.birthday.day, city.current_date)
+            self.birthday = birthday
+            if (birthday.month, birthday.day) != (old.month, old.day):  # A leap day moved to Feb 28
+                city.birthdays.get((old.month, old.day), {}).pop(self.id, None)
+                city.birthdays.setdefault((birthday.month, birthday.day), {})[self.id] = None
+            self._age_date = city.current_date
+        self._age = age
+        if city is not None:
+            city.demographics.update(self)
+    
+    def _today(self) -> int:
+        """Day the pregnancy clocks run on: the city's day counter, frozen at 0 outside a city"""
+        return self.city.current_day if self.city is not None else 0
+    
+    def _today_date(self) -> date:
+        """Date relationships are measured against: the city's date, frozen on the day it left one outside a city"""
+        return self.city.current_date if self.city is not None else self._detached_date
+    
+    def set_city(self, city: Optional['City']):
+        """Join (or, with None, leave) a city, keeping the pregnancy clocks' readings
+        
+        Joining schedules the city's timer for a pregnancy or recovery under way.
+        An agent set up outside any city also keeps its age: the birthday moves
+        to the year that gives that age on the city's date. One leaving a city
+        keeps the age it had on the day it left, and its days_in_relationship
+        are counted up to that day. Relationship start dates are never moved.
+        """
+        offset = (city.current_day if city is not None else 0) - self._today()
+        if self.city is None and city is not None:
+            if age_on(self.birthday, city.current_date) != self._age:
+                self.birthday = birthday_for_age(self._age, self.birthday.month, self.birthday.day, city.current_date)
+        elif city is None and self.city is not None:
+            self._age = self.age
+            self._detached_date = self.city.current_date
+        self._age_date = None
+        self.city = city
+        if self._conceived_day is not None:
+            self._conceived_day += offset
+        if self._gave_birth_day is not None:
+            self._gave_birth_day += offset
+        if city is not None:
+            self._schedule_timer(city)
+    
+    def _schedule_timer(self, city: 'City'):
+        """Queue the city's timer for the pregnancy or recovery under way (one starting today if unset)"""
+        if self._pregnancy_status == PregnancyStatus.PREGNANT:
+            if self._conceived_day is None:
+                self._conceived_day = city.current_day
+            city.timers.schedule(self._conceived_day + PREGNANCY_TERM_DAYS, "birth", self.id)
+        elif self._pregnancy_status == PregnancyStatus.RECENTLY_GAVE_BIRTH:
+            if self._gave_birth_day is None:
+                self._gave_birth_day = city.current_day
+            city.timers.schedule(self._gave_birth_day + POSTPARTUM_DAYS, "recovery", self.id)
+    
+    def _get_pregnancy_status(self) -> PregnancyStatus:
+        return self._pregnancy_status
+    
+    def _set_pregnancy_status(self, status: PregnancyStatus):
+        # Leaving a state stops its clock; entering one in a city queues its timer
+        old = self._pregnancy_status
+        self._pregnancy_status = status
+        if status == old:
+            return
+        if old == PregnancyStatus.PREGNANT:
+            self._conceived_day = None
+        elif old == PregnancyStatus.RECENTLY_GAVE_BIRTH:
+            self._gave_birth_day = None
+        if self.city is not None:
+            self._schedule_timer(self.city)
+    
+    def _get_pregnancy_days(self) -> int:
+        return 0 if self._conceived_day is None else self._today() - self._conceived_day
+    
+    def _set_pregnancy_days(self, days: int):
+        self._conceived_day = self._today() - days
+        if self.city is not None and self._pregnancy_status == PregnancyStatus.PREGNANT:
+            self.city.timers.schedule(self._conceived_day + PREGNANCY_TERM_DAYS, "birth", self.id)
+    
+    def _get_days_since_birth(self) -> int:
+        return 0 if self._gave_birth_day is None else self._today() - self._gave_birth_day
+    
+    def _set_days_since_birth(self, days: int):
+        self._gave_birth_day = self._today() - days
+        if self.city is not None and self._pregnancy_status == PregnancyStatus.RECENTLY_GAVE_BIRTH:
+            self.city.timers.schedule(self._gave_birth_day + POSTPARTUM_DAYS, "recovery", self.id)
+    
+    @property
+    def days_in_relationship(self) -> int:
+        """Days with the current partner, counted from relationship_start_date (0 when single)"""
+        if self.relationship_start_date is None:
+            return 0
+        return (self._today_date() - self.relationship_start_date).days
+    
+    @days_in_relationship.setter
+    def days_in_relationship(self, days: int):
+        self.relationship_start_date = self._today_date() - timedelta(days=days)
+    
+    def _get_partner_id(self) -> Optional[int]:
+        return self._partner_id
+    
+    def _set_partner_id(self, partner_id: Optional[int]):
+        # In a city, a couple is registered once both point at each other and dropped when either lets go
+        old = self._partner_id
+        self._partner_id = partner_id
+        city = self.city
+        if city is None or old == partner_id:
+            return
+        if old is not None:
+            city.couples.discard(self.id, old)
+        partner = city.agents.get(partner_id)
+        if partner is not None and partner._partner_id == self.id:
+            city.couples.add(partner, self)
+    
+    def _get_friend_ids(self) -> FriendIdsView:
+        return FriendIdsView(self._friends)
+    
+    def invalidate_compatibility(self):
+        """Mark cached compatibility scores stale after editing hobbies/life_goals in place
+
+        Assigning either list, or changing the personality, does this by itself.
+        """
+        self._traits_version = next(_trait_versions)
+    
     def __str__(self):
         return (f"{self.name} ({self.age}y, {self.gender})\n"
                 f"  Job: {self.job_title or 'Unemployed'} - ${self.annual_income:,}/yr\n"
@@ -161,7 +415,7 @@ class Agent:
                 f"  Status: {self.relationship_status.value}\n"
                 f"  Happiness: {self.happiness}/100, Health: {self.health}/100")
     
-    def decide_action(self, current_time: int) -> str:
+    def decide_action(self, current_time: int, rng=random) -> str:
         """Decide what to do based on time of day and personality"""
         hour = current_time % 24
         
@@ -193,7 +447,7 @@ class Agent:
         
         # Morning routine
         if 6 <= hour < 9:
-            if random.random() < 0.7:
+            if rng.random() < 0.7:
                 return "at_home"
             else:
                 return "getting_coffee"
@@ -206,10 +460,10 @@ class Agent:
         if hour >= 17:
             if self.energy < 30:
                 return "resting"
-            elif self.personality.extraversion > 60 and random.random() < 0.4:
+            elif self.personality.extraversion > 60 and rng.random() < 0.4:
                 return "socializing"
-            elif random.random() < 0.3:
-                return f"hobby: {random.choice(self.hobbies)}" if self.hobbies else "relaxing"
+            elif rng.random() < 0.3:
+                return f"hobby: {rng.choice(self.hobbies)}" if self.hobbies else "relaxing"
             else:
                 return "relaxing"
         
@@ -236,16 +490,8 @@ class Agent:
         my_goals = set(self.life_goals)
         their_goals = set(other_agent.life_goals)
         
-        # Check for major incompatibilities
-        major_conflicts = [
-            (LifeGoal.WANTS_CHILDREN, LifeGoal.NO_CHILDREN),
-            (LifeGoal.MARRIAGE_FOCUSED, LifeGoal.INDEPENDENCE),
-            (LifeGoal.FAMILY_ORIENTED, LifeGoal.CAREER_FOCUSED),
-            (LifeGoal.STABILITY_SEEKER, LifeGoal.TRAVEL_ENTHUSIAST)
-        ]
-        
         # Severe penalty for conflicting goals
-        for goal_a, goal_b in major_conflicts:
+        for goal_a, goal_b in MAJOR_GOAL_CONFLICTS:
             if (goal_a in my_goals and goal_b in their_goals) or (goal_b in my_goals and goal_a in their_goals):
                 return 10  # Very low compatibility
         
@@ -258,21 +504,28 @@ class Agent:
         
         # Complementary goals (different but compatible)
         complementary_bonus = 0
-        if LifeGoal.CAREER_FOCUSED in my_goals and LifeGoal.FAMILY_ORIENTED in their_goals:
-            complementary_bonus += 10
-        if LifeGoal.SOCIAL_BUTTERFLY in my_goals and LifeGoal.KNOWLEDGE_SEEKER in their_goals:
-            complementary_bonus += 5
+        for my_goal, their_goal, bonus in COMPLEMENTARY_GOALS:
+            if my_goal in my_goals and their_goal in their_goals:
+                complementary_bonus += bonus
             
         return min(100, base_score + shared_bonus + complementary_bonus)
     
     def overall_compatibility(self, other_agent: 'Agent') -> float:
         """Calculate overall compatibility including personality, hobbies, and goals"""
+        if self.city is not None:
+            return self.city.compatibility_cache.get(self, other_agent)
+        return self.compatibility_pair(other_agent)[0]
+    
+    def compatibility_pair(self, other_agent: 'Agent'):
+        """Overall compatibility in both directions: (self to other, other to self)"""
+        # Personality and hobbies are symmetric; only the goal bonuses depend on direction
         personality_comp = self.personality.compatibility_score(other_agent.personality)
         hobby_comp = self.hobby_compatibility(other_agent)
-        goal_comp = self.goal_compatibility(other_agent)
+        shared = (personality_comp * 0.5) + (hobby_comp * 0.25)
         
         # Weight: 50% personality, 25% hobbies, 25% goals
-        return (personality_comp * 0.5) + (hobby_comp * 0.25) + (goal_comp * 0.25)
+        return (shared + (self.goal_compatibility(other_agent) * 0.25),
+                shared + (other_agent.goal_compatibility(self) * 0.25))
     
     def is_sexually_compatible_with(self, other_agent: 'Agent') -> bool:
         """Check if two agents are sexually compatible based on orientation and gender"""
@@ -327,26 +580,22 @@ class Agent:
     
     def develop_friendship(self, other_agent: 'Agent'):
         """Develop friendship with another agent"""
-        if other_agent.id not in self.friend_ids:
-            self.friend_ids.append(other_agent.id)
-        if self.id not in other_agent.friend_ids:
-            other_agent.friend_ids.append(self.id)
+        self._friends[other_agent.id] = None
+        other_agent._friends[self.id] = None
     
     def start_relationship(self, other_agent: 'Agent', current_date: date = None):
         """Start dating relationship with another agent"""
         if self.can_develop_relationship_with(other_agent):
             if current_date is None:
-                current_date = date.today()
+                current_date = self._today_date()
                 
             self.relationship_status = RelationshipStatus.DATING
             self.partner_id = other_agent.id
             self.relationship_start_date = current_date
-            self.days_in_relationship = 0
             
             other_agent.relationship_status = RelationshipStatus.DATING
             other_agent.partner_id = self.id
             other_agent.relationship_start_date = current_date
-            other_agent.days_in_relationship = 0
             
             # Record relationship start
             self.relationship_history.append({
@@ -371,7 +620,7 @@ class Agent:
         
         return compatibility > 60 and wants_marriage
     
-    def propose_to(self, other_agent: 'Agent') -> bool:
+    def propose_to(self, other_agent: 'Agent', rng=random) -> bool:
         """Propose marriage to partner"""
         if not self.can_propose_to(other_agent):
             return False
@@ -391,7 +640,7 @@ class Agent:
         
         acceptance_chance = min(0.95, base_chance + compatibility_bonus + goal_bonus + goal_compatibility_bonus)
         
-        if random.random() < acceptance_chance:
+        if rng.random() < acceptance_chance:
             # Engagement!
             self.relationship_status = RelationshipStatus.ENGAGED
             other_agent.relationship_status = RelationshipStatus.ENGAGED
@@ -425,17 +674,13 @@ class Agent:
             # Woman takes husband's last name
             husband_last_name = other_agent.name.split()[-1]
             wife_first_name = self.name.split()[0]
-            old_name = self.name
             self.name = f"{wife_first_name} {husband_last_name}"
-            print(f"💒 {old_name} is now {self.name}")
             
         elif self.gender == "male" and other_agent.gender == "female":
             # Woman takes husband's last name
             husband_last_name = self.name.split()[-1]
             wife_first_name = other_agent.name.split()[0]
-            old_name = other_agent.name
             other_agent.name = f"{wife_first_name} {husband_last_name}"
-            print(f"💒 {old_name} is now {other_agent.name}")
             
         self.relationship_status = RelationshipStatus.MARRIED
         other_agent.relationship_status = RelationshipStatus.MARRIED
@@ -483,15 +728,13 @@ class Agent:
             self.relationship_status = RelationshipStatus.SINGLE if self.relationship_status == RelationshipStatus.DATING else RelationshipStatus.DIVORCED
             other_agent.relationship_status = RelationshipStatus.SINGLE if other_agent.relationship_status == RelationshipStatus.DATING else RelationshipStatus.DIVORCED
             
-            # Clear partner references
+            # Clear partner references (which also drops the couple from the city's registry)
             self.partner_id = None
             other_agent.partner_id = None
             
             # Reset relationship tracking
             self.relationship_start_date = None
-            self.days_in_relationship = 0
             other_agent.relationship_start_date = None
-            other_agent.days_in_relationship = 0
             
             # Happiness hit from breakup
             self.happiness = max(0, self.happiness - 15)
@@ -500,26 +743,25 @@ class Agent:
             return True
         return False
     
-    def update_relationship_duration(self, days_passed: int = 1):
-        """Update how long agent has been in current relationship"""
-        if self.partner_id and self.relationship_start_date:
-            self.days_in_relationship += days_passed
-    
     def celebrate_birthday(self, current_date: date):
-        """Age the agent if it's their birthday"""
+        """Whether it's the agent's birthday (age itself follows from the birthday)"""
         if (current_date.month == self.birthday.month and 
             current_date.day == self.birthday.day):
-            self.age += 1
             return True
-        return False
+        # Leap day birthdays are celebrated on Mar 1 in common years, when the age goes up
+        return (self.birthday.month, self.birthday.day) == (2, 29) and (current_date.month, current_date.day) == (3, 1) \
+            and not calendar.isleap(current_date.year)
     
     def can_get_pregnant(self, partner_agent: 'Agent') -> bool:
         """Check if this agent can get pregnant"""
-        # Must be female, not already pregnant, and have a male partner
-        if (self.gender != "female" or 
-            self.pregnancy_status != PregnancyStatus.NOT_PREGNANT or
-            not partner_agent or 
-            partner_agent.gender != "male"):
+        # Must have a male partner
+        if not partner_agent or partner_agent.gender != "male":
+            return False
+        return self.is_fertile()
+    
+    def is_fertile(self) -> bool:
+        """Female, not pregnant, of childbearing age and past postpartum recovery"""
+        if self.gender != "female" or self.pregnancy_status != PregnancyStatus.NOT_PREGNANT:
             return False
         
         # Age factor (harder to get pregnant when older)
@@ -527,12 +769,12 @@ class Agent:
             return False
             
         # Recovery period after previous birth (180 days = ~6 months)
-        if self.days_since_birth > 0 and self.days_since_birth < 180:
+        if self.days_since_birth > 0 and self.days_since_birth < POSTPARTUM_DAYS:
             return False
             
         return True
     
-    def try_to_conceive(self, partner_agent: 'Agent', is_planned: bool = True) -> bool:
+    def try_to_conceive(self, partner_agent: 'Agent', is_planned: bool = True, rng=random) -> bool:
         """Attempt to get pregnant (planned or unplanned)"""
         if not self.can_get_pregnant(partner_agent):
             return False
@@ -553,6 +795,14 @@ class Agent:
             if not (wants_children and partner_wants_children):
                 return False
         
+        if rng.random() < self.conception_chance(is_planned):
+            self.become_pregnant(partner_agent.id)
+            return True
+        
+        return False
+    
+    def conception_chance(self, is_planned: bool = True) -> float:
+        """Chance that one attempt to conceive succeeds, given it is possible at all"""
         # Age based fertility (peak fertility in 20s to early 30s): MUCH higher daily rates
         if self.age <= 25:
             base_chance = 0.15 if is_planned else 0.03  # 15% planned, 3% unplanned
@@ -578,40 +828,42 @@ class Agent:
         health_factor = self.health / 100
         happiness_factor = min(1.0, self.happiness / 80) if is_planned else 1.0  # Happiness doesn't affect accidents
         
-        conception_chance = base_chance * health_factor * happiness_factor
-        
-        if random.random() < conception_chance:
+        return base_chance * health_factor * happiness_factor
+    
+    def become_pregnant(self, father_id: Optional[int] = None):
+        self.pregnancy_father_id = father_id
+        if self.pregnancy_status == PregnancyStatus.PREGNANT:
+            self.pregnancy_days = 0  # Starts over
+        else:
+            self._conceived_day = None  # Conceived today: the status change starts the clock
             self.pregnancy_status = PregnancyStatus.PREGNANT
-            self.pregnancy_days = 0
-            return True
-        
-        return False
     
     def progress_pregnancy(self, days_passed: int = 1):
-        """Progress pregnancy by specified days"""
+        """Progress pregnancy by specified days (in a city the clock also runs by itself; 0 only checks for term)"""
         if self.pregnancy_status != PregnancyStatus.PREGNANT:
             return False
         
-        self.pregnancy_days += days_passed
+        if days_passed:
+            self.pregnancy_days += days_passed
         
         # Full term pregnancy is 270 days (9 months)
-        if self.pregnancy_days >= 270:
+        if self.pregnancy_days >= PREGNANCY_TERM_DAYS:
             return self.give_birth()
         
         return False
     
-    def give_birth(self) -> Optional[str]:
+    def give_birth(self) -> Optional[int]:
         """Give birth to a child"""
         if self.pregnancy_status != PregnancyStatus.PREGNANT:
             return None
         
         # Create child agent
-        child_id = str(uuid.uuid4())[:8]
+        child_id = new_agent_id(self.city)
         
         # Reset pregnancy status
-        self.pregnancy_status = PregnancyStatus.RECENTLY_GAVE_BIRTH
-        self.pregnancy_days = 0
-        self.days_since_birth = 0
+        self._gave_birth_day = None
+        self.pregnancy_status = PregnancyStatus.RECENTLY_GAVE_BIRTH  # Starts the recovery clock
+        self.pregnancy_father_id = None
         
         # Add child to parent's children list
         self.children_ids.append(child_id)
@@ -624,7 +876,7 @@ class Agent:
         
         return child_id
     
-    def try_accidental_pregnancy(self, male_agent: 'Agent') -> bool:
+    def try_accidental_pregnancy(self, male_agent: 'Agent', rng=random) -> bool:
         """Attempt accidental pregnancy during any interaction between male/female"""
         # Must be female interacting with male
         if self.gender != "female" or male_agent.gender != "male":
@@ -636,16 +888,16 @@ class Agent:
             
         # Much higher chance of accidental pregnancy per interaction 
         # Higher chance if they know each other (friends or dating)
-        base_chance = 0.001  # 0.1% base chance per interaction
+        base_chance = ACCIDENTAL_ENCOUNTER_CHANCE
         
         # Increase chance if they're friends or dating
         if (male_agent.id in self.friend_ids or 
             self.relationship_status == RelationshipStatus.DATING and self.partner_id == male_agent.id):
-            base_chance *= 10  # 10x higher if they know each other (1.0%)
+            base_chance *= ACCIDENTAL_KNOWN_MULTIPLIER
         
         # Use regular conception mechanics
-        if random.random() < base_chance:
-            return self.try_to_conceive(male_agent, is_planned=False)
+        if rng.random() < base_chance:
+            return self.try_to_conceive(male_agent, is_planned=False, rng=rng)
             
         return False
     
@@ -675,16 +927,16 @@ class Agent:
         
         return True
     
-    def adopt_child(self, partner_agent: 'Agent', current_date: date) -> Optional[str]:
+    def adopt_child(self, partner_agent: 'Agent', current_date: date, rng=random) -> Optional[Tuple[int, 'Agent']]:
         """Adopt a child together"""
         if not self.can_adopt(partner_agent):
             return None
         
         # Create adopted child
-        child_id = str(uuid.uuid4())[:8]
+        child_id = new_agent_id(self.city)
         
         # Create child using adoption logic
-        child_agent = create_adopted_child(self, partner_agent, child_id, current_date)
+        child_agent = create_adopted_child(self, partner_agent, child_id, current_date, rng)
         
         # Add child to both partners
         self.children_ids.append(child_id)
@@ -697,14 +949,14 @@ class Agent:
         return child_id, child_agent
     
     def update_postpartum(self, days_passed: int = 1):
-        """Update postpartum recovery status"""
+        """Update postpartum recovery status (0 days only checks whether recovery is over)"""
         if self.pregnancy_status == PregnancyStatus.RECENTLY_GAVE_BIRTH:
-            self.days_since_birth += days_passed
+            if days_passed:
+                self.days_since_birth += days_passed
             
             # Recovery period lasts 180 days (6 months)
-            if self.days_since_birth >= 180:
+            if self.days_since_birth >= POSTPARTUM_DAYS:
                 self.pregnancy_status = PregnancyStatus.NOT_PREGNANT
-                self.days_since_birth = 0
     
     def calculate_death_probability(self) -> float:
         """Calculate the daily probability of death based on age and health"""
@@ -732,14 +984,14 @@ class Agent:
         
         return min(0.05, base_rate * health_multiplier)  # Cap at 5% daily probability
     
-    def check_for_death(self, current_date: date) -> bool:
+    def check_for_death(self, current_date: date, rng=random) -> bool:
         """Check if agent dies today, returns True if they die"""
         if self.is_deceased:
             return False  # Already dead
             
         death_probability = self.calculate_death_probability()
         
-        if random.random() < death_probability:
+        if rng.random() < death_probability:
             self.die(current_date)
             return True
         return False
@@ -755,7 +1007,21 @@ class Agent:
         self.health = 0
 
 
-def get_job_for_workplace(workplace_name: str, education_level: EducationLevel) -> str:
+# Set after the class: in its body a property would become the default of the InitVar of the same name
+Agent.age = property(Agent._get_age, Agent._set_age, doc="Age in whole years: from the birthday on the city's date, stored outside a city")
+Agent.life_goals = property(Agent._get_life_goals, Agent._set_life_goals, doc="Life goals (assigning them invalidates cached compatibility)")
+Agent.hobbies = property(Agent._get_hobbies, Agent._set_hobbies, doc="Hobbies (assigning them invalidates cached compatibility)")
+Agent.partner_id = property(Agent._get_partner_id, Agent._set_partner_id, doc="Id of the current partner (keeps City.couples up to date)")
+Agent.pregnancy_status = property(Agent._get_pregnancy_status, Agent._set_pregnancy_status,
+                                  doc="Pregnancy status (in a city, becoming pregnant or giving birth queues a timer)")
+Agent.pregnancy_days = property(Agent._get_pregnancy_days, Agent._set_pregnancy_days,
+                                doc="Days into the current pregnancy (PREGNANCY_TERM_DAYS is full term)")
+Agent.days_since_birth = property(Agent._get_days_since_birth, Agent._set_days_since_birth,
+                                  doc="Days into postpartum recovery (0 when not recovering)")
+Agent.friend_ids = property(Agent._get_friend_ids, doc="Read-only view of friend ids (befriend through develop_friendship)")
+
+
+def get_job_for_workplace(workplace_name: str, education_level: EducationLevel, rng=random) -> str:
     """Get appropriate job title based on workplace and education"""
     workplace_lower = workplace_name.lower()
     
@@ -837,7 +1103,7 @@ def get_job_for_workplace(workplace_name: str, education_level: EducationLevel)
     for workplace_key in job_mappings:
         if workplace_key in workplace_lower:
             jobs = job_mappings[workplace_key].get(education_level, ["General Employee"])
-            return random.choice(jobs)
+            return rng.choice(jobs)
     
     # Default jobs if no specific workplace match  
     default_jobs = {
@@ -848,22 +1114,22 @@ def get_job_for_workplace(workplace_name: str, education_level: EducationLevel)
         EducationLevel.DOCTORATE: ["Executive", "Senior Director", "Principal Consultant", "Child Psychology Expert"]
     }
     
-    return random.choice(default_jobs[education_level])
+    return rng.choice(default_jobs[education_level])
 
 
-def create_child_agent(parent1: 'Agent', parent2: 'Agent', child_id: str, current_date: date) -> 'Agent':
+def create_child_agent(parent1: 'Agent', parent2: 'Agent', child_id: int, current_date: date, rng=random) -> 'Agent':
     """Create a child agent from two parents"""
     # Determine child's gender
-    gender = random.choice(["male", "female"])
+    gender = rng.choice(["male", "female"])
     
     # Generate name based on gender
     first_names_male = ["James", "John", "Michael", "William", "David", "Richard", "Joseph", "Daniel"]
     first_names_female = ["Mary", "Patricia", "Jennifer", "Linda", "Elizabeth", "Barbara", "Susan", "Jessica"]
     
-    first_name = random.choice(first_names_male if gender == "male" else first_names_female)
+    first_name = rng.choice(first_names_male if gender == "male" else first_names_female)
     
     # Child takes one parent's last name (random choice)
-    parent_for_surname = random.choice([parent1, parent2])
+    parent_for_surname = rng.choice([parent1, parent2])
     last_name = parent_for_surname.name.split()[-1]
     name = f"{first_name} {last_name}"
     
@@ -875,11 +1141,11 @@ def create_child_agent(parent1: 'Agent', parent2: 'Agent', child_id: str, curren
     parent2_personality = parent2.personality
     
     personality = Personality(
-        openness=max(0, min(100, int((parent1_personality.openness + parent2_personality.openness) / 2 + random.randint(-20, 20)))),
-        conscientiousness=max(0, min(100, int((parent1_personality.conscientiousness + parent2_personality.conscientiousness) / 2 + random.randint(-20, 20)))),
-        extraversion=max(0, min(100, int((parent1_personality.extraversion + parent2_personality.extraversion) / 2 + random.randint(-20, 20)))),
-        agreeableness=max(0, min(100, int((parent1_personality.agreeableness + parent2_personality.agreeableness) / 2 + random.randint(-20, 20)))),
-        neuroticism=max(0, min(100, int((parent1_personality.neuroticism + parent2_personality.neuroticism) / 2 + random.randint(-20, 20))))
+        openness=max(0, min(100, int((parent1_personality.openness + parent2_personality.openness) / 2 + rng.randint(-20, 20)))),
+        conscientiousness=max(0, min(100, int((parent1_personality.conscientiousness + parent2_personality.conscientiousness) / 2 + rng.randint(-20, 20)))),
+        extraversion=max(0, min(100, int((parent1_personality.extraversion + parent2_personality.extraversion) / 2 + rng.randint(-20, 20)))),
+        agreeableness=max(0, min(100, int((parent1_personality.agreeableness + parent2_personality.agreeableness) / 2 + rng.randint(-20, 20)))),
+        neuroticism=max(0, min(100, int((parent1_personality.neuroticism + parent2_personality.neuroticism) / 2 + rng.randint(-20, 20))))
     )
     
     # Children start with basic goals, will develop more as they age
@@ -887,7 +1153,7 @@ def create_child_agent(parent1: 'Agent', parent2: 'Agent', child_id: str, curren
     
     # Basic hobbies appropriate for children
     child_hobbies = ["reading", "art", "music", "sports"]
-    hobbies = random.sample(child_hobbies, 2)
+    hobbies = rng.sample(child_hobbies, 2)
     
     # Sexual orientation will be determined when they reach adolescence
     orientation = SexualOrientation.STRAIGHT  # Placeholder, will change later
@@ -913,40 +1179,39 @@ def create_child_agent(parent1: 'Agent', parent2: 'Agent', child_id: str, curren
         sexual_orientation=orientation,
         mother_id=mother_id,
         father_id=father_id,
-        happiness=random.randint(70, 90),  # Children generally happier
-        health=random.randint(90, 100),    # Children generally healthier
-        energy=random.randint(80, 100)
+        happiness=rng.randint(70, 90),  # Children generally happier
+        health=rng.randint(90, 100),    # Children generally healthier
+        energy=rng.randint(80, 100)
     )
 
 
-def create_adopted_child(parent1: 'Agent', parent2: 'Agent', child_id: str, current_date: date) -> 'Agent':
+def create_adopted_child(parent1: 'Agent', parent2: 'Agent', child_id: int, current_date: date, rng=random) -> 'Agent':
     """Create an adopted child agent for a couple"""
     # Determine child's gender
-    gender = random.choice(["male", "female"])
+    gender = rng.choice(["male", "female"])
     
     # Generate name based on gender
     first_names_male = ["James", "John", "Michael", "William", "David", "Richard", "Joseph", "Daniel", "Luke", "Noah"]
     first_names_female = ["Mary", "Patricia", "Jennifer", "Linda", "Elizabeth", "Barbara", "Susan", "Jessica", "Emma", "Grace"]
     
-    first_name = random.choice(first_names_male if gender == "male" else first_names_female)
+    first_name = rng.choice(first_names_male if gender == "male" else first_names_female)
     
     # Child takes one parent's last name (random choice)
-    parent_for_surname = random.choice([parent1, parent2])
+    parent_for_surname = rng.choice([parent1, parent2])
     last_name = parent_for_surname.name.split()[-1]
     name = f"{first_name} {last_name}"
     
     # Adopted children can be various ages (0 to 10 years old)
-    child_age = random.randint(0, 10)
-    birth_year = current_date.year - child_age
-    birthday = date(birth_year, random.randint(1, 12), random.randint(1, 28))
+    child_age = rng.randint(0, 10)
+    birthday = birthday_for_age(child_age, rng.randint(1, 12), rng.randint(1, 28), current_date)
     
     # Random personality (not inherited since adopted)
     personality = Personality(
-        openness=random.randint(20, 80),
-        conscientiousness=random.randint(20, 80),
-        extraversion=random.randint(20, 80),
-        agreeableness=random.randint(40, 90),  # Generally well adjusted
-        neuroticism=random.randint(10, 60)  # Less neurotic on average
+        openness=rng.randint(20, 80),
+        conscientiousness=rng.randint(20, 80),
+        extraversion=rng.randint(20, 80),
+        agreeableness=rng.randint(40, 90),  # Generally well adjusted
+        neuroticism=rng.randint(10, 60)  # Less neurotic on average
     )
     
     # Children start with basic goals
@@ -957,7 +1222,7 @@ def create_adopted_child(parent1: 'Agent', parent2: 'Agent', child_id: str, curr
         child_hobbies = ["art", "music", "reading"]
     else:
         child_hobbies = ["reading", "art", "music", "sports", "gaming"]
-    hobbies = random.sample(child_hobbies, random.randint(1, 3))
+    hobbies = rng.sample(child_hobbies, rng.randint(1, 3))
     
     # Sexual orientation placeholder
     orientation = SexualOrientation.STRAIGHT
@@ -993,33 +1258,33 @@ def create_adopted_child(parent1: 'Agent', parent2: 'Agent', child_id: str, curr
         sexual_orientation=orientation,
         mother_id=mother_id,
         father_id=father_id,
-        happiness=random.randint(60, 85),  # Adopted children may have some adjustment issues
-        health=random.randint(85, 100),
-        energy=random.randint(70, 100)
+        happiness=rng.randint(60, 85),  # Adopted children may have some adjustment issues
+        health=rng.randint(85, 100),
+        energy=rng.randint(70, 100)
     )
 
 
 def generate_random_agent(age_range=(18, 65), city=None) -> Agent:
-    """Generate an agent with realistic statistics"""
+    """Generate an agent with realistic statistics (drawn from the city's generation stream if given)"""
+    rng = city.rng.generation if city is not None else random
     
     first_names_male = ["James", "John", "Robert", "Michael", "William", "David", "Richard", "Joseph"]
     first_names_female = ["Mary", "Patricia", "Jennifer", "Linda", "Elizabeth", "Barbara", "Susan", "Jessica"]
     last_names = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez"]
     
-    gender = random.choice(["male", "female"])
-    first_name = random.choice(first_names_male if gender == "male" else first_names_female)
-    last_name = random.choice(last_names)
+    gender = rng.choice(["male", "female"])
+    first_name = rng.choice(first_names_male if gender == "male" else first_names_female)
+    last_name = rng.choice(last_names)
     name = f"{first_name} {last_name}"
     
-    age = random.randint(*age_range)
+    age = rng.randint(*age_range)
     
-    # Generate birthday (assume current year is 2024)
-    current_year = 2024
-    birth_year = current_year - age
-    birthday = date(birth_year, random.randint(1, 12), random.randint(1, 28))  # Use day 1 to 28 to avoid month issues
+    # Birthday that makes them `age` on the city's date (day 1 to 28 to avoid month issues)
+    today = city.current_date if city is not None else DEFAULT_START_DATE
+    birthday = birthday_for_age(age, rng.randint(1, 12), rng.randint(1, 28), today)
     
     # Education distribution (US stats)
-    edu_roll = random.random()
+    edu_roll = rng.random()
     if edu_roll < 0.12:
         education = EducationLevel.HIGH_SCHOOL
     elif edu_roll < 0.30:
@@ -1040,7 +1305,7 @@ def generate_random_agent(age_range=(18, 65), city=None) -> Agent:
         EducationLevel.DOCTORATE: (80000, 180000)
     }
     
-    income = random.randint(*income_ranges[education])
+    income = rng.randint(*income_ranges[education])
     
     # Income class
     if income < 30000:
@@ -1056,11 +1321,11 @@ def generate_random_agent(age_range=(18, 65), city=None) -> Agent:
     
     # Personality (normal distribution around 50)
     personality = Personality(
-        openness=max(0, min(100, int(random.gauss(50, 20)))),
-        conscientiousness=max(0, min(100, int(random.gauss(50, 20)))),
-        extraversion=max(0, min(100, int(random.gauss(50, 20)))),
-        agreeableness=max(0, min(100, int(random.gauss(50, 20)))),
-        neuroticism=max(0, min(100, int(random.gauss(50, 20))))
+        openness=max(0, min(100, int(rng.gauss(50, 20)))),
+        conscientiousness=max(0, min(100, int(rng.gauss(50, 20)))),
+        extraversion=max(0, min(100, int(rng.gauss(50, 20)))),
+        agreeableness=max(0, min(100, int(rng.gauss(50, 20)))),
+        neuroticism=max(0, min(100, int(rng.gauss(50, 20))))
     )
     
     # Life goals (pick 2 to 4 based on age and personality)
@@ -1070,34 +1335,34 @@ def generate_random_agent(age_range=(18, 65), city=None) -> Agent:
     # Age based goal tendencies
     if age < 25:
         # Young people more likely to have career and education goals
-        if random.random() < 0.6:
+        if rng.random() < 0.6:
             life_goals.append(LifeGoal.CAREER_FOCUSED)
-        if random.random() < 0.3:
+        if rng.random() < 0.3:
             life_goals.append(LifeGoal.TRAVEL_ENTHUSIAST)
     elif age < 35:
         # Mid age more family and relationship focused
-        if random.random() < 0.4:
-            life_goals.append(LifeGoal.WANTS_CHILDREN if random.random() < 0.7 else LifeGoal.NO_CHILDREN)
-        if random.random() < 0.5:
+        if rng.random() < 0.4:
+            life_goals.append(LifeGoal.WANTS_CHILDREN if rng.random() < 0.7 else LifeGoal.NO_CHILDREN)
+        if rng.random() < 0.5:
             life_goals.append(LifeGoal.MARRIAGE_FOCUSED)
-        if random.random() < 0.4:
+        if rng.random() < 0.4:
             life_goals.append(LifeGoal.WEALTH_ACCUMULATION)
     else:
         # Older people more stability and family focused
-        if random.random() < 0.6:
+        if rng.random() < 0.6:
             life_goals.append(LifeGoal.STABILITY_SEEKER)
-        if random.random() < 0.3:
+        if rng.random() < 0.3:
             life_goals.append(LifeGoal.FAMILY_ORIENTED)
     
     # Add random additional goals
     remaining_goals = [g for g in available_goals if g not in life_goals]
-    additional_goals = random.randint(1, 3)
-    life_goals.extend(random.sample(remaining_goals, min(additional_goals, len(remaining_goals))))
+    additional_goals = rng.randint(1, 3)
+    life_goals.extend(rng.sample(remaining_goals, min(additional_goals, len(remaining_goals))))
     
     # Hobbies based on personality
     all_hobbies = ["reading", "gaming", "sports", "cooking", "music", "art", "hiking", "photography", "gardening"]
-    num_hobbies = random.randint(2, 5)
-    hobbies = random.sample(all_hobbies, num_hobbies)
+    num_hobbies = rng.randint(2, 5)
+    hobbies = rng.sample(all_hobbies, num_hobbies)
     
     # All agents start single: relationships develop through simulation
     status = RelationshipStatus.SINGLE
@@ -1110,12 +1375,12 @@ def generate_random_agent(age_range=(18, 65), city=None) -> Agent:
     agent_last_name = last_name
     mother_maiden_names = ["Miller", "Wilson", "Moore", "Taylor", "Anderson", "Thomas", "Jackson", "White"]
     
-    father_name = f"{random.choice(father_first_names)} {agent_last_name}"
-    mother_maiden = random.choice(mother_maiden_names)
-    mother_name = f"{random.choice(mother_first_names)} {mother_maiden} {agent_last_name}"
+    father_name = f"{rng.choice(father_first_names)} {agent_last_name}"
+    mother_maiden = rng.choice(mother_maiden_names)
+    mother_name = f"{rng.choice(mother_first_names)} {mother_maiden} {agent_last_name}"
     
     # Assign sexual orientation (realistic distribution)
-    orientation_roll = random.random()
+    orientation_roll = rng.random()
     if orientation_roll < 0.80:  # ~80% straight
         orientation = SexualOrientation.STRAIGHT
     elif orientation_roll < 0.90:  # ~10% gay/lesbian
@@ -1127,6 +1392,7 @@ def generate_random_agent(age_range=(18, 65), city=None) -> Agent:
         orientation = SexualOrientation.BISEXUAL
     
     return Agent(
+        id=new_agent_id(city),
         name=name,
         age=age,
         birthday=birthday,
@@ -1142,9 +1408,9 @@ def generate_random_agent(age_range=(18, 65), city=None) -> Agent:
         sexual_orientation=orientation,
         mother_name=mother_name,
         father_name=father_name,
-        happiness=random.randint(40, 80),
-        health=random.randint(70, 100),
-        energy=random.randint(50, 100)
+        happiness=rng.randint(40, 80),
+        health=rng.randint(70, 100),
+        energy=rng.randint(50, 100)
     )
 
 
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""Benchmark suite for City.simulate_hour
+
+Builds cities of increasing size, runs them headlessly and measures
+simulated hours per second, the time spent in each phase of an hour, build
+time and memory. Results are written as JSON so runs can be compared across
+commits.
+
+Examples:
+    python benchmark.py
+    python benchmark.py --sizes 100 1000 --hours 72 --output before.json
+    python benchmark.py --sizes 100 1000 --hours 72 --output after.json --compare before.json
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+from city import create_default_city, create_generated_city
+from agent import generate_random_agent
+from compatibility import HAS_NUMPY
+from profiling import SimulationProfiler
+
+DEFAULT_SIZES = (100, 1_000, 10_000, 100_000)
+
+# Benchmark phase -> profiler phases that make it up (see profiling.PHASES)
+PHASES = {
+    "daily": ("birthdays", "mortality", "agent_death"),
+    "movement": ("movement",),
+    "social": ("social",),
+    "pregnancies": ("pregnancies", "accidental_pregnancies"),
+    "monthly": ("relationship_health", "family_planning"),
+}
+
+try:
+    import resource
+except ImportError:  # Not available on Windows: peak RSS is left out
+    resource = None
+
+
+def build_city(size: int, seed: int, columnar: bool = False):
+    """A populated city: the default layout while it has room, a generated one beyond that"""
+    if size <= 100:
+        city = create_default_city(f"Bench{size}", seed=seed)
+    else:
+        city = create_generated_city(f"Bench{size}", population=size, seed=seed)
+    city.events.clear()  # Measure the simulation, not the console
+    if columnar:
+        city.enable_population_store()
+    for _ in range(size):
+        city.add_agent(generate_random_agent(age_range=(0, 80), city=city))
+    return city
+
+
+def peak_rss_bytes():
+    """Process high-water mark (ru_maxrss is KiB on Linux, bytes on macOS)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def bench_size(size: int, hours: int, seed: int, columnar: bool = False) -> dict:
+    """Build, run and measure one city size"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    city = build_city(size, seed, columnar)
+    build_seconds = time.perf_counter() - start
+    population_bytes, build_peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()  # Tracing would slow the timed run down
+
+    profiler = city.enable_profiling(SimulationProfiler(window_hours=hours))
+    start = time.perf_counter()
+    city.run(hours=hours)
+    seconds = time.perf_counter() - start
+    totals = profiler.totals()
+    phase_seconds = {phase: sum(totals["phases"][part]["seconds"] for part in parts)
+                     for phase, parts in PHASES.items()}
+
+    return {
+        "agents": size,
+        "locations": len(city.locations),
+        "hours": hours,
+        "seconds": seconds,
+        "hours_per_second": hours / seconds if seconds > 0 else None,
+        "build_seconds": build_seconds,
+        "phases": {
+            phase: {"seconds": spent, "share": spent / seconds if seconds > 0 else 0.0}
+            for phase, spent in phase_seconds.items()
+        },
+        "profile": totals,
+        "memory": {
+            "population_bytes": population_bytes,
+            "build_peak_bytes": build_peak_bytes,
+            "peak_rss_bytes": peak_rss_bytes(),
+        },
+        "final_population": len(city.agents),
+        "deceased": len(city.graveyard),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, hours: int = 48, seed: int = 1234, report=None,
+                   columnar: bool = False) -> dict:
+    """Benchmark every size; `report(result)` is called after each one"""
+    results = []
+    for size in sizes:
+        result = bench_size(size, hours, seed, columnar)
+        results.append(result)
+        if report:
+            report(result)
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": HAS_NUMPY,
+            "seed": seed,
+            "hours": hours,
+            "columnar": columnar,
+        },
+        "results": results,
+    }
+
+
+def print_result(result: dict):
+    phases = "  ".join(f"{name}={info['share']:.0%}" for name, info in result["phases"].items())
+    peak = result["memory"]["build_peak_bytes"] / 2**20
+    print(f"{result['agents']:>7,} agents: {result['hours_per_second']:>9,.1f} hours/s  "
+          f"(build {result['build_seconds']:.1f}s, {peak:,.1f} MiB)  {phases}")
+
+
+def compare(current: dict, baseline: dict):
+    """Print hours/s of `current` relative to a saved `baseline` run"""
+    before = {r["agents"]: r for r in baseline["results"]}
+    print(f"\nCompared with {baseline['meta'].get('commit') or 'baseline'}:")
+    for result in current["results"]:
+        old = before.get(result["agents"])
+        if old and old["hours_per_second"] and result["hours_per_second"]:
+            ratio = result["hours_per_second"] / old["hours_per_second"]
+            print(f"{result['agents']:>7,} agents: {ratio:.2f}x hours/s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark City.simulate_hour across population sizes")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="Agent counts to run")
+    parser.add_argument("--hours", type=int, default=48, help="Simulated hours per size")
+    parser.add_argument("--seed", type=int, default=1234, help="City seed (same seed, same workload)")
+    parser.add_argument("--output", default="benchmark_results.json", help="Where to write the JSON results")
+    parser.add_argument("--compare", metavar="PATH", help="Earlier results to compare against")
+    parser.add_argument("--columnar", action="store_true", help="Keep agents' hot fields in the population store")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.sizes, args.hours, args.seed, report=print_result, columnar=args.columnar)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
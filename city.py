@@ -1,8 +1,26 @@
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Tuple, Callable
 from enum import Enum
+import bisect
+import calendar
+import math
 import random
 from datetime import datetime, date, timedelta
+from compatibility import CompatibilityCache, compatibility_matrix, HAS_NUMPY
+from agent import RelationshipStatus, DEFAULT_START_DATE
+from profiling import SimulationProfiler
+from mortality import MortalityEngine
+from fertility import AccidentalPregnancyEngine
+from scheduler import DayScheduler
+from graveyard import Graveyard
+from registry import AgentRegistry
+from social_graph import SocialGraph
+from events import (EventBus, ConsoleSink, FriendshipFormed, StartedDating, Engaged, ProposalRejected,
+                    Married, NameChanged, BrokeUp, RelationshipStrain, Pregnancy, Birth, Adoption,
+                    Death, Grieving, Birthday)
+
+# Locations at least this crowded score all occupant pairs in one NumPy batch
+COMPATIBILITY_MATRIX_MIN_OCCUPANTS = 24
 
 class LocationType(Enum):
     RESIDENTIAL = "residential"
@@ -15,7 +33,65 @@ class LocationType(Enum):
     ENTERTAINMENT = "entertainment"
     HOSPITAL = "hospital"
 
-@dataclass
+# Where agents go when they head out to socialize
+SOCIAL_LOCATION_TYPES = (LocationType.RESTAURANT, LocationType.PARK, LocationType.ENTERTAINMENT)
+
+class Occupancy:
+    """The agent IDs at a location, with a stable slot number per occupant
+
+    Membership, add and remove are O(1). An occupant keeps the slot it got on
+    arrival until it leaves (freed slots are reused), which the renderer uses
+    to offset agents drawn at the same spot. Iterates in arrival order.
+    """
+    
+    __slots__ = ("_slots", "_free_slots")
+    
+    def __init__(self, agent_ids=()):
+        self._slots: Dict[int, int] = {}
+        self._free_slots: List[int] = []
+        for agent_id in agent_ids:
+            self.add(agent_id)
+    
+    def add(self, agent_id: int) -> bool:
+        """Add an occupant; returns False if already present"""
+        if agent_id in self._slots:
+            return False
+        self._slots[agent_id] = self._free_slots.pop() if self._free_slots else len(self._slots)
+        return True
+    
+    def discard(self, agent_id: int) -> bool:
+        """Remove an occupant if present"""
+        slot = self._slots.pop(agent_id, None)
+        if slot is None:
+            return False
+        if self._slots:
+            self._free_slots.append(slot)
+        else:
+            self._free_slots.clear()
+        return True
+    
+    def slot(self, agent_id: int) -> Optional[int]:
+        """Stable slot index of an occupant, or None if not here"""
+        return self._slots.get(agent_id)
+    
+    def __contains__(self, agent_id) -> bool:
+        return agent_id in self._slots
+    
+    def __len__(self) -> int:
+        return len(self._slots)
+    
+    def __iter__(self):
+        return iter(self._slots)
+    
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Occupancy):
+            return self._slots == other._slots
+        return NotImplemented
+    
+    def __repr__(self) -> str:
+        return f"Occupancy({list(self._slots)!r})"
+
+@dataclass(slots=True)
 class Location:
     """A place in the city"""
     id: str
@@ -23,22 +99,41 @@ class Location:
     location_type: LocationType
     position: Tuple[int, int]  # (x, y) coordinates
     capacity: int = 50
-    current_occupants: List[str] = field(default_factory=list)  # Agent IDs
+    current_occupants: Occupancy = field(default_factory=Occupancy)  # Agent IDs
+    _index: Optional['LocationIndex'] = field(default=None, init=False, repr=False, compare=False)  # Set by City.add_location
+    
+    def __post_init__(self):
+        if not isinstance(self.current_occupants, Occupancy):
+            self.current_occupants = Occupancy(self.current_occupants)
+    
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name == "capacity" and getattr(self, "_index", None) is not None:
+            self._index.update_availability(self)
     
     def can_accommodate(self) -> bool:
         return len(self.current_occupants) < self.capacity
     
-    def add_occupant(self, agent_id: str) -> bool:
+    def add_occupant(self, agent_id: int) -> bool:
+        if agent_id in self.current_occupants:
+            return True
         if self.can_accommodate():
-            self.current_occupants.append(agent_id)
+            self.current_occupants.add(agent_id)
+            if self._index is not None and len(self.current_occupants) == self.capacity:
+                self._index.update_availability(self)  # Just filled up
             return True
         return False
     
-    def remove_occupant(self, agent_id: str):
-        if agent_id in self.current_occupants:
-            self.current_occupants.remove(agent_id)
+    def remove_occupant(self, agent_id: int):
+        if self.current_occupants.discard(agent_id):
+            if self._index is not None and len(self.current_occupants) == self.capacity - 1:
+                self._index.update_availability(self)  # Room again
+    
+    def slot_of(self, agent_id: int) -> Optional[int]:
+        """Stable position of an occupant, used to spread agents out when drawing"""
+        return self.current_occupants.slot(agent_id)
 
-@dataclass
+@dataclass(slots=True)
 class Job:
     """Job opening in the city"""
     id: str
@@ -47,25 +142,266 @@ class Job:
     required_education: str
     salary_range: Tuple[int, int]
     openings: int = 1
-    filled_by: List[str] = field(default_factory=list)  # Agent IDs
+    filled_by: List[int] = field(default_factory=list)  # Agent IDs
+
+_COMMITTED = (RelationshipStatus.ENGAGED, RelationshipStatus.MARRIED)
+
+class Couples:
+    """Current couples (dating, engaged or married), each pair stored once
+
+    A couple is two agents whose partner_id point at each other. Setting
+    partner_id keeps this up to date (see Agent._set_partner_id), as do
+    City.add_agent and death cleanup, so the monthly routines visit each
+    couple exactly once without scanning every agent. Iterates in the
+    order couples formed.
+    """
+    
+    def __init__(self):
+        self._pairs: Dict[Tuple[int, int], Tuple['Agent', 'Agent']] = {}  # (low id, high id) -> (agent1, agent2)
+    
+    @staticmethod
+    def _key(id1: int, id2: int) -> Tuple[int, int]:
+        return (id1, id2) if id1 < id2 else (id2, id1)
+    
+    def add(self, agent1, agent2):
+        """Register a couple (no-op if already registered)"""
+        self._pairs.setdefault(self._key(agent1.id, agent2.id), (agent1, agent2))
+    
+    def discard(self, id1: int, id2: int):
+        self._pairs.pop(self._key(id1, id2), None)
+    
+    def committed(self):
+        """Engaged and married couples"""
+        return [(a, b) for a, b in self._pairs.values()
+                if a.relationship_status in _COMMITTED and b.relationship_status in _COMMITTED]
+    
+    def __contains__(self, ids) -> bool:
+        return self._key(*ids) in self._pairs
+    
+    def __len__(self) -> int:
+        return len(self._pairs)
+    
+    def __iter__(self):
+        # Snapshot, so couples can break up while a routine walks them
+        return iter(list(self._pairs.values()))
+
+class IndexedSet:
+    """Set with O(1) add, remove and uniform random choice"""
+    
+    def __init__(self, items=()):
+        self._items: List = []
+        self._positions: Dict = {}
+        for item in items:
+            self.add(item)
+    
+    def add(self, item):
+        if item not in self._positions:
+            self._positions[item] = len(self._items)
+            self._items.append(item)
+    
+    def discard(self, item):
+        position = self._positions.pop(item, None)
+        if position is None:
+            return
+        last = self._items.pop()
+        if position < len(self._items):
+            # Fill the hole with the last item
+            self._items[position] = last
+            self._positions[last] = position
+    
+    def choice(self, rng=random):
+        """Random member (the set must not be empty)"""
+        return rng.choice(self._items)
+    
+    def __contains__(self, item) -> bool:
+        return item in self._positions
+    
+    def __len__(self) -> int:
+        return len(self._items)
+    
+    def __iter__(self):
+        return iter(self._items)
+
+# Lower edges of the age bands after the first: under 16, 16-45, 46-64, 65+
+AGE_BANDS = (16, 46, 65)
+
+class Demographics:
+    """Ids of living agents bucketed by gender and age band, for O(1) random picks"""
+    
+    def __init__(self):
+        self.buckets: Dict[Tuple[str, int], IndexedSet] = {}
+        self._keys: Dict[int, Tuple[str, int]] = {}  # Agent id -> its bucket
+    
+    @staticmethod
+    def band(age: int) -> int:
+        return bisect.bisect_right(AGE_BANDS, age)
+    
+    def add(self, agent):
+        key = (agent.gender, self.band(agent.age))
+        self._keys[agent.id] = key
+        self.buckets.setdefault(key, IndexedSet()).add(agent.id)
+    
+    def discard(self, agent_id: int):
+        key = self._keys.pop(agent_id, None)
+        if key is not None:
+            self.buckets[key].discard(agent_id)
+    
+    def update(self, agent):
+        """Move an agent whose age (or gender) changed to the right bucket"""
+        if self._keys.get(agent.id) != (agent.gender, self.band(agent.age)):
+            self.discard(agent.id)
+            self.add(agent)
+    
+    def count(self, gender: str, min_age: int = 0) -> int:
+        return sum(len(bucket) for bucket in self._bands(gender, min_age))
+    
+    def sample(self, gender: str, min_age: int = 0, rng=random) -> Optional[int]:
+        """Uniformly random id among agents of `gender` aged `min_age` or more (a band edge), or None"""
+        bands = self._bands(gender, min_age)
+        pick = rng.randrange(sum(len(bucket) for bucket in bands) or 1)
+        for bucket in bands:
+            if pick < len(bucket):
+                return bucket.choice(rng)
+            pick -= len(bucket)
+        return None
+    
+    def _bands(self, gender: str, min_age: int) -> List[IndexedSet]:
+        first = self.band(min_age)
+        if min_age not in (0,) + AGE_BANDS:
+            raise ValueError(f"min_age must be 0 or a band edge {AGE_BANDS}, got {min_age}")
+        return [self.buckets[(gender, band)] for band in range(first, len(AGE_BANDS) + 1)
+                if (gender, band) in self.buckets]
+
+class LocationIndex:
+    """Location IDs grouped by type, plus the ones with room for more occupants
+
+    Kept up to date by City.add_location and by Location itself when it fills
+    up, frees up, or has its capacity changed.
+    """
+    
+    def __init__(self):
+        self.ids: List[str] = []
+        self.by_type: Dict[LocationType, List[str]] = {loc_type: [] for loc_type in LocationType}
+        self.available: Dict[LocationType, IndexedSet] = {loc_type: IndexedSet() for loc_type in LocationType}
+        self._groups: Dict[Tuple[LocationType, ...], List[str]] = {}
+    
+    def add(self, location: 'Location'):
+        self.ids.append(location.id)
+        self.by_type[location.location_type].append(location.id)
+        self._groups.clear()
+        location._index = self
+        self.update_availability(location)
+    
+    def remove(self, location: 'Location'):
+        self.ids.remove(location.id)
+        self.by_type[location.location_type].remove(location.id)
+        self.available[location.location_type].discard(location.id)
+        self._groups.clear()
+        location._index = None
+    
+    def update_availability(self, location: 'Location'):
+        if location.can_accommodate():
+            self.available[location.location_type].add(location.id)
+        else:
+            self.available[location.location_type].discard(location.id)
+    
+    def of_types(self, location_types: Tuple[LocationType, ...]) -> List[str]:
+        """IDs of all locations of any of the given types"""
+        group = self._groups.get(location_types)
+        if group is None:
+            group = [loc_id for loc_type in location_types for loc_id in self.by_type[loc_type]]
+            self._groups[location_types] = group
+        return group
+
+def sample_pairs(count: int, probability: float, rng=random):
+    """Yield index pairs (i, j), i < j, each of the count*(count-1)/2 pairs chosen independently with `probability`
+
+    Instead of rolling once per pair, jumps straight to the next chosen pair with a
+    geometric skip, so the number of pairs yielded is Binomial(pairs, probability)
+    and the work is O(count + pairs yielded). Pairs come out in the same (i, j)
+    order as a nested loop.
+    """
+    total = count * (count - 1) // 2
+    if total == 0 or probability <= 0:
+        return
+    if probability >= 1:
+        for i in range(count):
+            for j in range(i + 1, count):
+                yield i, j
+        return
+    
+    log_miss = math.log(1.0 - probability)
+    index = -1
+    i, row_start, row_end = 0, 0, count - 1  # Row i holds pair indices [row_start, row_end)
+    while True:
+        index += 1 + int(math.log(1.0 - rng.random()) / log_miss)
+        if index >= total:
+            return
+        while index >= row_end:
+            i += 1
+            row_start = row_end
+            row_end += count - 1 - i
+        yield i, i + 1 + (index - row_start)
+
+# Named random substreams each city owns (see RandomStreams)
+RNG_STREAMS = ("movement", "social", "fertility", "mortality", "generation")
+
+class RandomStreams:
+    """Independent random.Random substreams, one per subsystem, derived from one seed
+
+    Each stream is seeded from "<seed>:<name>", so extra draws in one
+    subsystem never shift the draws of another.
+    """
+
+    def __init__(self, seed: int = None):
+        if seed is None:
+            seed = random.getrandbits(64)  # Unseeded cities still follow random.seed()
+        self.seed = seed
+        self._streams: Dict[str, random.Random] = {}
+        for name in RNG_STREAMS:
+            setattr(self, name, self.stream(name))
+
+    def stream(self, name: str) -> random.Random:
+        """The substream called `name` (created on first use)"""
+        if name not in self._streams:
+            self._streams[name] = random.Random(f"{self.seed}:{name}")
+        return self._streams[name]
 
 class City:
     """The simulated city containing all locations and infrastructure"""
     
-    def __init__(self, name: str, grid_size: int = 50, start_date: date = None):
+    def __init__(self, name: str, grid_size: int = 50, start_date: date = None, seed: int = None):
         self.name = name
+        self.rng = RandomStreams(seed)  # Every random draw in the simulation goes through these streams
+        self.mortality = MortalityEngine(self.rng.mortality)  # Daily death rolls for everyone at once
+        self.fertility = AccidentalPregnancyEngine(self.rng.fertility)  # Daily accidental conceptions
         self.grid_size = grid_size
         self.locations: Dict[str, Location] = {}
+        self.location_index = LocationIndex()
         self.jobs: Dict[str, Job] = {}
-        self.agents: Dict[str, 'Agent'] = {}  # Will store all agents
-        self.graveyard: Dict[str, 'Agent'] = {}  # Deceased agents
+        self.agents: Dict[int, 'Agent'] = {}  # Will store all agents
+        self.registry = AgentRegistry()  # Issues agent ids and retires those of the dead
+        self.social = SocialGraph()  # Friendships between living agents
+        self.couples = Couples()  # Dating, engaged and married pairs
+        self.demographics = Demographics()  # Living agents by gender and age band
+        self.timers = DayScheduler()  # Due dates and ends of postpartum recovery
+        self.graveyard = Graveyard()  # Deceased agents, archived to disk
+        self.birthdays: Dict[Tuple[int, int], Dict[int, None]] = {}  # (month, day) -> living agent ids, in arrival order
         self.current_time: int = 0  # Hour of simulation (0 to 23)
         self.current_day: int = 0
-        self.current_date: date = start_date or date(2024, 1, 1)  # Start date of simulation
+        self.current_date: date = start_date or DEFAULT_START_DATE  # Start date of simulation
+        self.compatibility_cache = CompatibilityCache()  # Shared by all agents in the city
+        self.events = EventBus()  # Friendships, births, deaths... (see events.py)
+        self.events.subscribe(ConsoleSink())  # Print events to the console by default
+        self.profiler: Optional[SimulationProfiler] = None  # Per-phase timings, see enable_profiling()
+        self.population = None  # Columnar store for agents' hot fields, see enable_population_store()
         
     def add_location(self, location: Location):
         """Add a location to the city"""
+        if location.id in self.locations:
+            self.location_index.remove(self.locations[location.id])
         self.locations[location.id] = location
+        self.location_index.add(location)
     
     def add_job(self, job: Job):
         """Add a job opening to the city"""
@@ -73,31 +409,39 @@ class City:
     
     def add_agent(self, agent):
         """Add an agent to the city"""
+        self.registry.register(agent.id)
         self.agents[agent.id] = agent
+        self.social.add_vertex(agent.id, agent._friends)
+        self.demographics.add(agent)
+        agent.set_city(self)  # Also schedules a birth or recovery under way
+        partner = self.agents.get(agent.partner_id)
+        if partner is not None and partner.partner_id == agent.id:
+            self.couples.add(partner, agent)
+        if self.population is not None:
+            self.population.attach(agent)
+        self.birthdays.setdefault((agent.birthday.month, agent.birthday.day), {})[agent.id] = None
         
         # Assign home if not set
         if not agent.home_location:
-            residential = [loc for loc in self.locations.values() 
-                          if loc.location_type == LocationType.RESIDENTIAL and loc.can_accommodate()]
+            residential = self.location_index.available[LocationType.RESIDENTIAL]
             if residential:
-                home = random.choice(residential)
+                home = self.locations[residential.choice(self.rng.generation)]
                 agent.home_location = home.id
                 agent.current_location = home.id
                 home.add_occupant(agent.id)
         
         # Assign work if not unemployed and no work location
         if agent.age >= 18 and not agent.work_location:
-            workplaces = [loc for loc in self.locations.values() 
-                         if loc.location_type == LocationType.WORKPLACE and loc.can_accommodate()]
+            workplaces = self.location_index.available[LocationType.WORKPLACE]
             if workplaces:
-                work = random.choice(workplaces)
+                work = self.locations[workplaces.choice(self.rng.generation)]
                 agent.work_location = work.id
                 
                 # Assign job title based on workplace and education
                 from agent import get_job_for_workplace
-                agent.job_title = get_job_for_workplace(work.name, agent.education_level)
+                agent.job_title = get_job_for_workplace(work.name, agent.education_level, self.rng.generation)
     
-    def move_agent(self, agent_id: str, target_location_id: str):
+    def move_agent(self, agent_id: int, target_location_id: str):
         """Move an agent from their current location to a new one"""
         if agent_id not in self.agents:
             return False
@@ -113,12 +457,16 @@ class City:
             location = self.locations[target_location_id]
             if location.add_occupant(agent_id):
                 agent.current_location = target_location_id
+                if self.profiler is not None:
+                    self.profiler.count("moves_made")
                 return True
         
         return False
     
     def simulate_hour(self):
         """Simulate one hour passing"""
+        if self.profiler is not None:
+            self.profiler.start_hour()
         self.current_time = (self.current_time + 1) % 24
         
         # New day
@@ -128,52 +476,110 @@ class City:
             
             # Create a list copy to avoid "dictionary changed size during iteration" error
             agents_list = list(self.agents.values())
-            
-            # Update relationship durations for all agents (once per day)
-            for agent in agents_list:
-                agent.update_relationship_duration(1)
-            
-            # Check for birthdays and age agents
-            for agent in agents_list:
-                if agent.celebrate_birthday(self.current_date):
-                    print(f"🎂 {agent.name} turned {agent.age} today!")
-            
-            # Check for deaths (daily)
-            agents_to_remove = []
-            for agent in agents_list:
-                if not agent.is_deceased and agent.check_for_death(self.current_date):
-                    print(f"💀 {agent.name} (age {agent.age}) has passed away.")
-                    agents_to_remove.append(agent.id)
-            
-            # Move deceased agents to graveyard and handle cleanup
-            for agent_id in agents_to_remove:
-                self._handle_agent_death(agent_id)
+            self._run_phase("birthdays", self._celebrate_birthdays)
+            self._check_deaths(agents_list)
         
-        # Each agent decides what to do
-        # Create a list copy to avoid "dictionary changed size during iteration" error
-        agents_list = list(self.agents.values())
-        for agent in agents_list:
-            # Update agent's current action
-            agent.current_action = agent.decide_action(self.current_time)
-            self._update_agent_location(agent)
+        # Each agent decides what to do and goes there
+        self._run_phase("movement", self._move_agents)
         
         # Handle social interactions at each location
-        self._handle_social_interactions()
+        self._run_phase("social", self._handle_social_interactions)
         
         # Daily pregnancy progression and accidental pregnancies
         if self.current_time == 12:  # Check daily at noon
-            self._handle_pregnancies()
-            self._handle_accidental_pregnancies()
+            self._run_phase("pregnancies", self._handle_pregnancies)
+            self._run_phase("accidental_pregnancies", self._handle_accidental_pregnancies)
         
         # Monthly checks
         if self.current_day % 30 == 0 and self.current_time == 12:  # Check at noon every 30 days
-            self._check_relationship_health()
-            self._handle_family_planning()
+            self._run_phase("relationship_health", self._check_relationship_health)
+            self._run_phase("family_planning", self._handle_family_planning)
+        
+        if self.profiler is not None:
+            self.profiler.end_hour()
+    
+    def _run_phase(self, phase: str, method, *args):
+        """Run one phase of simulate_hour, timed when a profiler is attached"""
+        if self.profiler is None:
+            return method(*args)
+        return self.profiler.time_phase(phase, method, *args)
+    
+    def enable_profiling(self, profiler: SimulationProfiler = None) -> SimulationProfiler:
+        """Attach a profiler (a new one unless given) and return it"""
+        self.profiler = profiler or SimulationProfiler()
+        return self.profiler
+    
+    def enable_population_store(self):
+        """Keep living agents' hot fields in NumPy columns (see population.py); returns the store"""
+        if self.population is None:
+            from population import PopulationStore
+            self.population = PopulationStore(capacity=max(1024, 2 * len(self.agents)))
+            for agent in self.agents.values():
+                self.population.attach(agent)
+        return self.population
+    
+    def disable_profiling(self) -> Optional[SimulationProfiler]:
+        """Detach the profiler, returning it with its totals"""
+        profiler, self.profiler = self.profiler, None
+        return profiler
+    
+    def _celebrate_birthdays(self):
+        """Birthdays today: move the agents to their new age band and publish the events
+        
+        Ages follow from the birthdays by themselves; Feb 29 birthdays come on Mar 1 in common years.
+        """
+        today = self.current_date
+        birthday_ids = list(self.birthdays.get((today.month, today.day), ()))
+        if (today.month, today.day) == (3, 1) and not calendar.isleap(today.year):
+            birthday_ids.extend(self.birthdays.get((2, 29), ()))
+        for agent_id in birthday_ids:
+            agent = self.agents[agent_id]
+            if agent.celebrate_birthday(self.current_date):
+                self.demographics.update(agent)
+                if self.events.active:
+                    self.events.publish(Birthday(self.current_date, agent.id, agent.name, agent.age))
+    
+    def _check_deaths(self, agents_list):
+        """Daily mortality roll, then move the deceased to the graveyard"""
+        agents_to_remove = self._run_phase("mortality", self._roll_deaths, agents_list)
+        if agents_to_remove:
+            self._run_phase("agent_death", self._remove_deceased, agents_to_remove)
+    
+    def _roll_deaths(self, agents_list) -> List[int]:
+        """Ids of the agents who die today"""
+        agents_to_remove = []
+        living = [agent for agent in agents_list if not agent.is_deceased]
+        for agent in self.mortality.daily_deaths(living, self.population, self.current_date):
+            # Leave the current location first: die() clears it
+            location = self.locations.get(agent.current_location)
+            if location is not None:
+                location.remove_occupant(agent.id)
+            agent.die(self.current_date)
+            if self.events.active:
+                self.events.publish(Death(self.current_date, agent.id, agent.name, agent.age))
+            agents_to_remove.append(agent.id)
+        return agents_to_remove
+    
+    def _remove_deceased(self, agent_ids: List[int]):
+        """Move deceased agents to graveyard and handle cleanup"""
+        for agent_id in agent_ids:
+            self._handle_agent_death(agent_id)
+    
+    def _move_agents(self):
+        """Every agent picks an action for this hour and moves to match it"""
+        # Create a list copy to avoid "dictionary changed size during iteration" error
+        agents_list = list(self.agents.values())
+        movement_rng = self.rng.movement
+        for agent in agents_list:
+            # Update agent's current action
+            agent.current_action = agent.decide_action(self.current_time, movement_rng)
+            self._update_agent_location(agent)
     
     def _update_agent_location(self, agent):
         """Update agent location based on their decision"""
         action = agent.current_action
         target_location = None
+        rng = self.rng.movement
         
         if action == "sleeping":
             target_location = agent.home_location
@@ -181,49 +587,71 @@ class City:
             target_location = agent.home_location
         elif action == "at_school":
             # Find a school appropriate for age
-            schools = [loc for loc in self.locations.values() 
-                      if loc.location_type == LocationType.SCHOOL]
+            schools = self.location_index.by_type[LocationType.SCHOOL]
             if schools:
-                target_location = random.choice(schools).id
+                target_location = rng.choice(schools)
             else:
                 target_location = agent.home_location  # Stay home if no school
         elif action == "working":
             target_location = agent.work_location
         elif action == "studying":
             # Find a school
-            schools = [loc for loc in self.locations.values() 
-                      if loc.location_type == LocationType.SCHOOL]
+            schools = self.location_index.by_type[LocationType.SCHOOL]
             if schools:
-                target_location = random.choice(schools).id
+                target_location = rng.choice(schools)
         elif action == "socializing":
             # Go to restaurant, park, or entertainment
-            social_places = [loc for loc in self.locations.values() 
-                           if loc.location_type in [LocationType.RESTAURANT, 
-                                                    LocationType.PARK, 
-                                                    LocationType.ENTERTAINMENT]]
+            social_places = self.location_index.of_types(SOCIAL_LOCATION_TYPES)
             if social_places:
-                target_location = random.choice(social_places).id
+                target_location = rng.choice(social_places)
         elif "hobby" in action:
             # Go to relevant location or stay home
-            if random.random() < 0.5:
+            if rng.random() < 0.5:
                 target_location = agent.home_location
             else:
-                target_location = random.choice(list(self.locations.keys()))
+                target_location = rng.choice(self.location_index.ids)
         else:
             # Default to home
             target_location = agent.home_location
         
         if target_location and target_location != agent.current_location:
             self.move_agent(agent.id, target_location)
-    
+
+    def run(self, hours: int = None, until_date: date = None,
+            progress_callback: Optional[Callable[['City', int], None]] = None,
+            progress_interval: int = 24) -> int:
+        """Advance the simulation headlessly (no rendering, no frame clock)
+
+        Runs for `hours` simulated hours, or until `current_date` reaches
+        `until_date`, whichever comes first. `progress_callback(city, hours_done)`
+        is called every `progress_interval` hours. Returns the number of hours simulated.
+        """
+        if hours is None and until_date is None:
+            raise ValueError("run() needs hours or until_date")
+        if hours is not None and hours < 0:
+            raise ValueError("hours must be non-negative")
+        if progress_interval < 1:
+            raise ValueError("progress_interval must be at least 1")
+
+        step = self.simulate_hour
+        hours_done = 0
+        while hours is None or hours_done < hours:
+            if until_date is not None and self.current_date >= until_date:
+                break
+            step()
+            hours_done += 1
+            if progress_callback and hours_done % progress_interval == 0:
+                progress_callback(self, hours_done)
+
+        return hours_done
+
     def _handle_social_interactions(self):
         """Handle social interactions between agents at the same locations"""
-        import random
-        
         # Create a snapshot to avoid iteration issues
         locations_list = list(self.locations.values())
+        pairs_evaluated = 0
         for location in locations_list:
-            occupants = location.current_occupants[:]  # Copy the list
+            occupants = [self.agents[agent_id] for agent_id in location.current_occupants if agent_id in self.agents]
             
             # Need at least 2 people for interactions
             if len(occupants) < 2:
@@ -232,21 +660,19 @@ class City:
             # Check for interactions based on location type
             interaction_chance = self._get_interaction_chance(location.location_type)
             
-            # Try interactions between random pairs
-            for i in range(len(occupants)):
-                for j in range(i + 1, len(occupants)):
-                    agent1_id = occupants[i]
-                    agent2_id = occupants[j]
-                    
-                    if agent1_id not in self.agents or agent2_id not in self.agents:
-                        continue
-                        
-                    agent1 = self.agents[agent1_id]
-                    agent2 = self.agents[agent2_id]
-                    
-                    # Check if they should interact
-                    if random.random() < interaction_chance:
-                        self._process_interaction(agent1, agent2, location)
+            # Crowded places: score every pair at once instead of one Python call per pair
+            matrix = None
+            if HAS_NUMPY and len(occupants) >= COMPATIBILITY_MATRIX_MIN_OCCUPANTS:
+                matrix = compatibility_matrix(occupants)
+            
+            # Only visit the pairs that actually interact (same odds as rolling for every pair)
+            for i, j in sample_pairs(len(occupants), interaction_chance, self.rng.social):
+                compatibility = float(matrix[i, j]) if matrix is not None else None
+                self._process_interaction(occupants[i], occupants[j], location, compatibility)
+                pairs_evaluated += 1
+        
+        if self.profiler is not None:
+            self.profiler.count("pairs_evaluated", pairs_evaluated)
     
     def _get_interaction_chance(self, location_type: LocationType) -> float:
         """Get the chance of interaction based on location type"""
@@ -263,53 +689,58 @@ class City:
         }
         return interaction_chances.get(location_type, 0.1)
     
-    def _process_interaction(self, agent1, agent2, location):
+    def _process_interaction(self, agent1, agent2, location, compatibility: float = None):
         """Process interaction between two agents"""
-        import random
-        
-        # Calculate overall compatibility (personality + hobbies)
-        compatibility = agent1.overall_compatibility(agent2)
+        # Calculate overall compatibility (personality + hobbies) unless it was batch-scored
+        if compatibility is None:
+            compatibility = agent1.overall_compatibility(agent2)
+        rng = self.rng.social
         
         # Higher compatibility = better chance of positive interaction
-        interaction_success = compatibility > 30 and random.random() < 0.6
+        interaction_success = compatibility > 30 and rng.random() < 0.6
         
         if interaction_success:
             # Develop friendship if not already friends and compatible
-            if agent2.id not in agent1.friend_ids and compatibility > 35:
+            already_friends = self.social.has_edge(agent1.id, agent2.id)
+            if not already_friends and compatibility > 35:
                 # Higher compatibility equals better chance of friendship
                 friendship_chance = min(0.15, (compatibility - 30) / 300)  # 0% to 15% chance
-                if random.random() < friendship_chance:
+                if rng.random() < friendship_chance:
                     agent1.develop_friendship(agent2)
-                    # Debug: Print when friendship forms (remove this in production)
-                    print(f"👥 {agent1.name} and {agent2.name} became friends! (Compatibility: {compatibility:.1f}%)")
+                    if self.events.active:
+                        self.events.publish(FriendshipFormed(self.current_date, agent1.id, agent1.name,
+                                                             agent2.id, agent2.name, compatibility))
             
             # If both single and already friends, chance to start dating
-            elif (agent2.id in agent1.friend_ids and 
+            elif (already_friends and 
                   agent1.can_develop_relationship_with(agent2)):
                 # High compatibility required for dating
                 dating_chance = min(0.20, max(0, (compatibility - 40) / 300))  # 0% to 20% based on compatibility
-                if random.random() < dating_chance:
+                if rng.random() < dating_chance:
                     success = agent1.start_relationship(agent2, self.current_date)
-                    # Debug: Print when dating starts (remove this in production)
-                    if success:
-                        print(f"🥰 {agent1.name} and {agent2.name} started dating! (Compatibility: {compatibility:.1f}%)")
+                    if success and self.events.active:
+                        self.events.publish(StartedDating(self.current_date, agent1.id, agent1.name,
+                                                          agent2.id, agent2.name, compatibility))
             
             # If dating, chance to propose (high compatibility + marriage goals needed)
             elif (agent1.partner_id == agent2.id and 
                   agent1.relationship_status.value == 'dating'):
-                if agent1.can_propose_to(agent2) and random.random() < 0.03:  # 3% chance per interaction
-                    success = agent1.propose_to(agent2)
-                    if success:
-                        print(f"💍 {agent1.name} proposed to {agent2.name} and they said YES!")
-                    else:
-                        print(f"💔 {agent1.name} proposed to {agent2.name} but they said no...")
+                if agent1.can_propose_to(agent2) and rng.random() < 0.03:  # 3% chance per interaction
+                    success = agent1.propose_to(agent2, rng)
+                    if self.events.active:
+                        event_type = Engaged if success else ProposalRejected
+                        self.events.publish(event_type(self.current_date, agent1.id, agent1.name, agent2.id, agent2.name))
                         
             # If engaged, chance to get married
             elif (agent1.partner_id == agent2.id and 
                   agent1.relationship_status.value == 'engaged'):
-                if random.random() < 0.05:  # 5% chance per interaction to get married
-                    agent1.get_married(agent2)
-                    print(f"👰🤵 {agent1.name} and {agent2.name} got married!")
+                if rng.random() < 0.05:  # 5% chance per interaction to get married
+                    old_names = (agent1.name, agent2.name)
+                    if agent1.get_married(agent2) and self.events.active:
+                        for agent, old_name in zip((agent1, agent2), old_names):
+                            if agent.name != old_name:
+                                self.events.publish(NameChanged(self.current_date, agent.id, old_name, agent.name))
+                        self.events.publish(Married(self.current_date, agent1.id, agent1.name, agent2.id, agent2.name))
             
             # Small happiness boost from positive social interaction
             happiness_boost = int(compatibility / 50)  # 1 to 2 points based on compatibility
@@ -318,138 +749,120 @@ class City:
         
         # Check for relationship problems (even if no interaction this time)
         if agent1.partner_id == agent2.id:
-            if agent1.should_breakup(agent2) and random.random() < 0.05:  # 5% chance to break up per interaction
+            if agent1.should_breakup(agent2) and rng.random() < 0.05:  # 5% chance to break up per interaction
                 agent1.breakup(agent2)
-                print(f"💔 {agent1.name} and {agent2.name} broke up due to incompatibility...")
+                if self.events.active:
+                    self.events.publish(BrokeUp(self.current_date, agent1.id, agent1.name, agent2.id, agent2.name,
+                                                "incompatibility"))
     
     def _check_relationship_health(self):
         """Monthly check for relationship problems based on goal compatibility"""
         from agent import LifeGoal
         
-        couples = []
-        # Create a list copy to avoid "dictionary changed size during iteration" error
-        agents_list = list(self.agents.values())
-        for agent in agents_list:
-            if agent.partner_id and agent.partner_id in self.agents:
-                partner = self.agents[agent.partner_id]
-                # Avoid checking the same couple twice
-                if (agent.id, partner.id) not in [(p[1].id, p[0].id) for p in couples]:
-                    couples.append((agent, partner))
-        
-        for agent1, agent2 in couples:
+        for agent1, agent2 in self.couples:
             goal_compatibility = agent1.goal_compatibility(agent2)
             overall_compatibility = agent1.overall_compatibility(agent2)
             
             # Major goal conflicts cause relationship stress
             if goal_compatibility < 20:
                 # High chance of breakup for major goal conflicts
-                if random.random() < 0.3:  # 30% chance per month for severely incompatible goals
+                if self.rng.social.random() < 0.3:  # 30% chance per month for severely incompatible goals
                     agent1.breakup(agent2)
-                    print(f"💔 {agent1.name} and {agent2.name} broke up due to incompatible life goals...")
+                    if self.events.active:
+                        self.events.publish(BrokeUp(self.current_date, agent1.id, agent1.name, agent2.id, agent2.name,
+                                                    "incompatible life goals"))
                 else:
                     # Happiness decreases due to ongoing conflicts
                     agent1.happiness = max(0, agent1.happiness - 5)
                     agent2.happiness = max(0, agent2.happiness - 5)
-                    print(f"😔 {agent1.name} and {agent2.name} are having relationship difficulties...")
+                    if self.events.active:
+                        self.events.publish(RelationshipStrain(self.current_date, agent1.id, agent1.name,
+                                                               agent2.id, agent2.name))
             
             elif overall_compatibility < 25:
                 # General incompatibility 
-                if random.random() < 0.15:  # 15% chance per month
+                if self.rng.social.random() < 0.15:  # 15% chance per month
                     agent1.breakup(agent2)
-                    print(f"💔 {agent1.name} and {agent2.name} broke up due to overall incompatibility...")
+                    if self.events.active:
+                        self.events.publish(BrokeUp(self.current_date, agent1.id, agent1.name, agent2.id, agent2.name,
+                                                    "overall incompatibility"))
     
     def _handle_pregnancies(self):
-        """Handle pregnancy progression and births"""
-        from agent import PregnancyStatus, create_child_agent
+        """Births and postpartum recoveries due today (timers set at conception and birth)"""
+        from agent import create_child_agent
         
-        # Create a list copy to avoid "dictionary changed size during iteration" error
-        agents_list = list(self.agents.values())
-        for agent in agents_list:
-            if agent.pregnancy_status == PregnancyStatus.PREGNANT:
-                # Progress pregnancy by 1 day
-                gave_birth = agent.progress_pregnancy(1)
+        for kind, agent_id in self.timers.pop_due(self.current_day):
+            agent = self.agents.get(agent_id)
+            if agent is None:
+                continue  # Died in the meantime
+            if kind == "birth":
+                # No-op unless she is really at term (the timer may be stale)
+                father_id = agent.pregnancy_father_id  # Cleared by the birth
+                gave_birth = agent.progress_pregnancy(0)
                 
                 if gave_birth:
                     child_id = agent.children_ids[-1]  # Get the newly added child ID
                     
-                    # Find the father (could be partner or someone else for accidental pregnancy)
-                    father = None
-                    if agent.partner_id and agent.partner_id in self.agents:
-                        father = self.agents[agent.partner_id]
+                    # The father recorded at conception; if he has died since, the partner
+                    # or failing that any man 16+ stands in
+                    father = self.agents.get(father_id) or self.agents.get(agent.partner_id)
+                    if father is None:
+                        stand_in = self.demographics.sample("male", 16, self.rng.fertility)
+                        father = self.agents.get(stand_in)
+                    if father is not None:
                         father.children_ids.append(child_id)
-                    else:
-                        # For accidental pregnancies, try to find the father among friends/recent interactions
-                        # For now, just assign a random male agent as father
-                        male_agents = [a for a in self.agents.values() if a.gender == "male" and a.age >= 16]
-                        if male_agents:
-                            father = random.choice(male_agents)
-                            father.children_ids.append(child_id)
                     
                     if father:
                         # Create child agent
-                        child_agent = create_child_agent(agent, father, child_id, self.current_date)
+                        child_agent = create_child_agent(agent, father, child_id, self.current_date, self.rng.generation)
                         self.add_agent(child_agent)
                         
-                        print(f"👶 {agent.name} and {father.name} had a baby: {child_agent.name}!")
-                    else:
-                        print(f"👶 {agent.name} had a baby (father unknown)!")
+                        if self.events.active:
+                            self.events.publish(Birth(self.current_date, agent.id, agent.name, father.id, father.name,
+                                                      child_id, child_agent.name))
+                    elif self.events.active:
+                        self.events.publish(Birth(self.current_date, agent.id, agent.name, None, None, child_id, None))
                         
-            elif agent.pregnancy_status == PregnancyStatus.RECENTLY_GAVE_BIRTH:
-                # Update postpartum recovery daily
-                agent.update_postpartum(1)
+            elif kind == "recovery":
+                agent.update_postpartum(0)
     
     def _handle_accidental_pregnancies(self):
-        """Handle accidental pregnancies during social interactions"""
-        # Create a snapshot of locations to avoid iteration issues
-        locations_list = list(self.locations.values())
-        for location in locations_list:
-            occupants = location.current_occupants[:]  # Copy the list
-            
-            # Check for accidental pregnancies between males and females
-            for i in range(len(occupants)):
-                for j in range(i + 1, len(occupants)):
-                    agent1_id = occupants[i]
-                    agent2_id = occupants[j]
-                    
-                    if agent1_id not in self.agents or agent2_id not in self.agents:
-                        continue
-                        
-                    agent1 = self.agents[agent1_id]
-                    agent2 = self.agents[agent2_id]
-                    
-                    # Check for female and male pairs
-                    if agent1.gender == "female" and agent2.gender == "male":
-                        if agent1.try_accidental_pregnancy(agent2):
-                            print(f"🤰 {agent1.name} accidentally got pregnant!")
-                    elif agent2.gender == "female" and agent1.gender == "male":
-                        if agent2.try_accidental_pregnancy(agent1):
-                            print(f"🤰 {agent2.name} accidentally got pregnant!")
+        """Handle accidental pregnancies among everyone sharing a location (see fertility.py)"""
+        crowds = [location.current_occupants for location in self.locations.values()]
+        for mother, father in self.fertility.daily_conceptions(crowds, self.agents):
+            mother.become_pregnant(father.id)
+            if self.events.active:
+                self.events.publish(Pregnancy(self.current_date, mother.id, mother.name, True))
     
     def _handle_family_planning(self):
         """Handle couples trying to conceive"""
         from agent import LifeGoal
         
-        # Create a list copy to avoid "dictionary changed size during iteration" error
-        agents_list = list(self.agents.values())
-        for agent in agents_list:
-            if (agent.partner_id and 
-                agent.partner_id in self.agents and
-                agent.relationship_status.value in ['married', 'engaged']):
-                
-                partner = self.agents[agent.partner_id]
-                
+        # Each partner gets their own chance, as when this walked every agent
+        for agent1, agent2 in self.couples.committed():
+            for agent, partner in ((agent1, agent2), (agent2, agent1)):
                 # Check for pregnancy (heterosexual couples)
                 if (agent.gender == "female" and partner.gender == "male"):
-                    if agent.try_to_conceive(partner):
-                        print(f"🤰 {agent.name} is pregnant!")
+                    if agent.try_to_conceive(partner, rng=self.rng.fertility) and self.events.active:
+                        self.events.publish(Pregnancy(self.current_date, agent.id, agent.name, False))
                 
                 # Check for adoption (any couple, especially same sex)
-                elif agent.can_adopt(partner) and random.random() < 0.01:  # 1% chance per month
-                    result = agent.adopt_child(partner, self.current_date)
+                elif agent.can_adopt(partner) and self.rng.fertility.random() < 0.01:  # 1% chance per month
+                    result = agent.adopt_child(partner, self.current_date, self.rng.generation)
                     if result:
                         child_id, child_agent = result
                         self.add_agent(child_agent)
-                        print(f"👨‍👩‍👧‍👦 {agent.name} and {partner.name} adopted {child_agent.name}!")
+                        if self.events.active:
+                            self.events.publish(Adoption(self.current_date, agent.id, agent.name, partner.id, partner.name,
+                                                         child_id, child_agent.name))
+    
+    def locations_of_type(self, location_type: LocationType) -> List[Location]:
+        """All locations of a type"""
+        return [self.locations[loc_id] for loc_id in self.location_index.by_type[location_type]]
+    
+    def available_locations(self, location_type: LocationType) -> List[Location]:
+        """Locations of a type that still have room"""
+        return [self.locations[loc_id] for loc_id in self.location_index.available[location_type]]
     
     def get_location_name(self, location_id: str) -> str:
         """Get location name from ID"""
@@ -457,7 +870,7 @@ class City:
             return self.locations[location_id].name
         return "Unknown"
     
-    def get_agent_status(self, agent_id: str) -> Dict:
+    def get_agent_status(self, agent_id: int) -> Dict:
         """Get current status of an agent"""
         if agent_id not in self.agents:
             return {}
@@ -473,46 +886,61 @@ class City:
             "time": f"Day {self.current_day}, {self.current_time:02d}:00"
         }
     
-    def _handle_agent_death(self, agent_id: str):
+    def _handle_agent_death(self, agent_id: int):
         """Handle when an agent dies - move to graveyard and clean up relationships"""
         if agent_id not in self.agents:
             return
         
         deceased_agent = self.agents[agent_id]
         
-        # Move to graveyard
-        self.graveyard[agent_id] = deceased_agent
+        # Detach from the population store: the graveyard archives plain Agents
+        if self.population is not None:
+            self.population.detach(deceased_agent)
         
         # Remove from active agents
         del self.agents[agent_id]
+        self.registry.unregister(agent_id)
+        self.demographics.discard(agent_id)
+        birthday_ids = self.birthdays.get((deceased_agent.birthday.month, deceased_agent.birthday.day))
+        if birthday_ids:
+            birthday_ids.pop(agent_id, None)
         
         # Clean up relationships
         self._cleanup_deceased_relationships(deceased_agent)
         
-        # Remove from all locations
-        for location in self.locations.values():
-            if agent_id in location.current_occupants:
+        # Leave the location the agent was at (occupants are only ever added
+        # where current_location points, or at home when moving in; a death
+        # roll has already cleared current_location after leaving it)
+        for location_id in {deceased_agent.current_location, deceased_agent.home_location}:
+            location = self.locations.get(location_id)
+            if location is not None:
                 location.remove_occupant(agent_id)
+        
+        # Archive last, once nothing else will change
+        self.graveyard.add(deceased_agent)
     
     def _cleanup_deceased_relationships(self, deceased_agent):
         """Clean up relationships when an agent dies"""
         from agent import RelationshipStatus
         
         # Break up with partner if they have one
+        if deceased_agent.partner_id:
+            self.couples.discard(deceased_agent.id, deceased_agent.partner_id)
         if deceased_agent.partner_id and deceased_agent.partner_id in self.agents:
             partner = self.agents[deceased_agent.partner_id]
             partner.relationship_status = RelationshipStatus.SINGLE
             partner.partner_id = None
+            partner.relationship_start_date = None
             partner.happiness = max(0, partner.happiness - 30)  # Grief reduces happiness
-            print(f"💔 {partner.name} is grieving the loss of {deceased_agent.name}")
+            if self.events.active:
+                self.events.publish(Grieving(self.current_date, partner.id, partner.name,
+                                             deceased_agent.id, deceased_agent.name, "partner"))
         
-        # Remove from all friends' lists
-        for friend_id in deceased_agent.friend_ids:
-            if friend_id in self.agents:
-                friend = self.agents[friend_id]
-                if deceased_agent.id in friend.friend_ids:
-                    friend.friend_ids.remove(deceased_agent.id)
-                    friend.happiness = max(0, friend.happiness - 15)  # Grief
+        # Remove from the friendship graph; friends grieve
+        for friend_id in self.social.remove_vertex(deceased_agent.id):
+            friend = self.agents.get(friend_id)
+            if friend is not None:
+                friend.happiness = max(0, friend.happiness - 15)  # Grief
         
         # Handle children: they become orphans or go to other parent
         for child_id in deceased_agent.children_ids:
@@ -529,16 +957,19 @@ class City:
                 
                 # Reduce happiness due to loss of parent
                 child.happiness = max(0, child.happiness - 25)
-                print(f"😢 {child.name} has lost their parent {deceased_agent.name}")
+                if self.events.active:
+                    self.events.publish(Grieving(self.current_date, child.id, child.name,
+                                                 deceased_agent.id, deceased_agent.name, "parent"))
     
     def get_graveyard_count(self) -> int:
         """Get total number of deceased agents"""
         return len(self.graveyard)
 
 
-def create_default_city(name: str = "SimCity") -> City:
-    """Create a city with default locations"""
-    city = City(name)
+def create_default_city(name: str = "SimCity", seed: int = None) -> City:
+    """Create a city with default locations (seeded for reproducible runs)"""
+    city = City(name, seed=seed)
+    rng = city.rng.generation
     
     # Residential areas (houses/apartments)
     residential_names = [
@@ -548,8 +979,8 @@ def create_default_city(name: str = "SimCity") -> City:
     ]
     
     for i, name in enumerate(residential_names):
-        x = (i % 4) * 12 + random.randint(0, 5)
-        y = (i // 4) * 12 + random.randint(0, 5)
+        x = (i % 4) * 12 + rng.randint(0, 5)
+        y = (i // 4) * 12 + rng.randint(0, 5)
         city.add_location(Location(
             id=f"res_{i}",
             name=name,
@@ -566,8 +997,8 @@ def create_default_city(name: str = "SimCity") -> City:
     ]
     
     for i, name in enumerate(workplace_names):
-        x = 20 + (i % 3) * 10 + random.randint(0, 5)
-        y = 5 + (i // 3) * 10 + random.randint(0, 5)
+        x = 20 + (i % 3) * 10 + rng.randint(0, 5)
+        y = 5 + (i // 3) * 10 + rng.randint(0, 5)
         city.add_location(Location(
             id=f"work_{i}",
             name=name,
@@ -599,8 +1030,8 @@ def create_default_city(name: str = "SimCity") -> City:
     ]
     
     for i, (name, loc_type) in enumerate(social_venues):
-        x = 30 + (i % 3) * 8 + random.randint(0, 3)
-        y = 30 + (i // 3) * 8 + random.randint(0, 3)
+        x = 30 + (i % 3) * 8 + rng.randint(0, 3)
+        y = 30 + (i // 3) * 8 + rng.randint(0, 3)
         city.add_location(Location(
             id=f"social_{i}",
             name=name,
@@ -612,6 +1043,49 @@ def create_default_city(name: str = "SimCity") -> City:
     return city
 
 
+def create_generated_city(name: str = "SimCity", population: int = 1000, seed: int = None) -> City:
+    """Create a city whose locations scale with the expected population
+
+    The default layout only has room for about 160 residents. This one has
+    homes for 1.5x `population` (so families can grow), a workplace seat for
+    everyone, and schools and social venues in proportion.
+    """
+    residential = max(8, math.ceil(population * 1.5 / 20))
+    workplaces = max(10, math.ceil(population / 30))
+    schools = max(4, math.ceil(population / 200))
+    venues = max(7, math.ceil(population / 40))
+    grid_size = max(50, math.ceil(math.sqrt(residential + workplaces + schools + venues) * 6))
+
+    city = City(name, grid_size=grid_size, seed=seed)
+    rng = city.rng.generation
+
+    def position():
+        return (rng.randrange(grid_size), rng.randrange(grid_size))
+
+    # Workplace names keep the keywords get_job_for_workplace looks for
+    workplace_names = ["Tech Corp", "City Hospital", "Law Firm", "Marketing Agency", "Finance Center",
+                       "Manufacturing Plant", "Retail Store", "City Hall", "Daycare", "Childcare Center"]
+    school_names = ["Elementary School", "High School", "Community College", "University"]
+    venue_types = [LocationType.PARK, LocationType.GYM, LocationType.ENTERTAINMENT, LocationType.RETAIL,
+                   LocationType.RESTAURANT, LocationType.RESTAURANT, LocationType.RESTAURANT]
+
+    for i in range(residential):
+        city.add_location(Location(id=f"res_{i}", name=f"Residential Block {i + 1}",
+                                   location_type=LocationType.RESIDENTIAL, position=position(), capacity=20))
+    for i in range(workplaces):
+        city.add_location(Location(id=f"work_{i}", name=f"{workplace_names[i % len(workplace_names)]} {i + 1}",
+                                   location_type=LocationType.WORKPLACE, position=position(), capacity=30))
+    for i in range(schools):
+        city.add_location(Location(id=f"school_{i}", name=f"{school_names[i % len(school_names)]} {i + 1}",
+                                   location_type=LocationType.SCHOOL, position=position(), capacity=100))
+    for i in range(venues):
+        loc_type = venue_types[i % len(venue_types)]
+        city.add_location(Location(id=f"social_{i}", name=f"{loc_type.value.title()} {i + 1}",
+                                   location_type=loc_type, position=position(), capacity=50))
+    
+    return city
+
+
 # Test city creation
 if __name__ == "__main__":
     city = create_default_city("TestCity")
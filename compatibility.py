@@ -0,0 +1,138 @@
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+
+from agent import LifeGoal, MAJOR_GOAL_CONFLICTS, COMPLEMENTARY_GOALS
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional: compatibility_matrix falls back to pairwise scoring
+    np = None
+
+HAS_NUMPY = np is not None
+
+DEFAULT_CACHE_SIZE = 100_000  # Pairs kept before the least recently used ones are evicted
+
+class CompatibilityCache:
+    """City-wide cache of pairwise overall compatibility scores
+
+    Each unordered pair is stored once. Goal compatibility has a small
+    directional bonus, so an entry keeps both directions. Entries are
+    stamped with each agent's trait versions and are recomputed when an
+    agent's personality, hobbies or life goals change.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple, Tuple]" = OrderedDict()  # (low id, high id) -> (stamp, low->high, high->low)
+
+    def get(self, agent_a, agent_b) -> float:
+        """Overall compatibility of agent_a towards agent_b"""
+        if agent_a.id <= agent_b.id:
+            low, high, forward = agent_a, agent_b, True
+        else:
+            low, high, forward = agent_b, agent_a, False
+
+        key = (low.id, high.id)
+        stamp = (low._traits_version, low.personality._version,
+                 high._traits_version, high.personality._version)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == stamp:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[1] if forward else entry[2]
+
+        self.misses += 1
+        low_to_high, high_to_low = low.compatibility_pair(high)
+        self._entries[key] = (stamp, low_to_high, high_to_low)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return low_to_high if forward else high_to_low
+
+    def clear(self):
+        """Drop all cached scores (counters are kept)"""
+        self._entries.clear()
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and current size"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+        }
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __getstate__(self):
+        # Scores are cheap to recompute, so checkpoints store an empty cache
+        state = self.__dict__.copy()
+        state["_entries"] = OrderedDict()
+        return state
+
+
+_GOAL_INDEX = {goal: i for i, goal in enumerate(LifeGoal)}
+
+def compatibility_matrix(agents: List) -> "np.ndarray":
+    """Pairwise overall compatibility for a group of agents in one batch
+
+    Entry [i][j] equals agents[i].overall_compatibility(agents[j]) exactly.
+    Personality is a k x 5 array, hobbies and life goals are k x n membership
+    masks, and the goal-conflict table becomes mask operations. Without NumPy
+    this returns a nested list built from the scalar formulas.
+    """
+    k = len(agents)
+    if np is None:
+        matrix = [[0.0] * k for _ in range(k)]
+        for i in range(k):
+            matrix[i][i] = agents[i].compatibility_pair(agents[i])[0]
+            for j in range(i + 1, k):
+                matrix[i][j], matrix[j][i] = agents[i].compatibility_pair(agents[j])
+        return matrix
+
+    # Personality: same five terms, summed in the same order, as Personality.compatibility_score
+    traits = np.array([(a.personality.extraversion, a.personality.neuroticism, a.personality.openness,
+                        a.personality.agreeableness, a.personality.conscientiousness) for a in agents],
+                      dtype=np.int64).reshape(k, 5)
+    e, n, o, ag, c = (traits[:, t] for t in range(5))
+    personality = ((100 - np.abs(e[:, None] - e[None, :]))
+                   + np.abs(n[:, None] - n[None, :])
+                   + (100 - np.abs(o[:, None] - o[None, :]))
+                   + np.minimum(ag[:, None], ag[None, :])
+                   + (100 - np.abs(c[:, None] - c[None, :]))) / 5
+
+    # Hobbies: shared / union of the hobby sets
+    vocabulary = {}
+    rows = [[vocabulary.setdefault(h, len(vocabulary)) for h in set(a.hobbies)] for a in agents]
+    hobby_mask = np.zeros((k, len(vocabulary)), dtype=np.int64)
+    for i, columns in enumerate(rows):
+        hobby_mask[i, columns] = 1
+    shared_hobbies = hobby_mask @ hobby_mask.T
+    hobby_counts = hobby_mask.sum(axis=1)
+    union = hobby_counts[:, None] + hobby_counts[None, :] - shared_hobbies
+    with np.errstate(divide="ignore", invalid="ignore"):
+        hobby = np.minimum(100, 30 + ((shared_hobbies / union) * 70))
+    hobby = np.where(union == 0, 50, hobby)
+    hobby = np.where((hobby_counts[:, None] == 0) | (hobby_counts[None, :] == 0), 40, hobby)
+
+    # Life goals: conflicts override everything, otherwise base + shared + complementary bonuses
+    goal_mask = np.zeros((k, len(_GOAL_INDEX)), dtype=np.int64)
+    for i, a in enumerate(agents):
+        goal_mask[i, [_GOAL_INDEX[g] for g in set(a.life_goals)]] = 1
+    conflict = np.zeros((k, k), dtype=bool)
+    for goal_a, goal_b in MAJOR_GOAL_CONFLICTS:
+        has_a = goal_mask[:, _GOAL_INDEX[goal_a]].astype(bool)
+        has_b = goal_mask[:, _GOAL_INDEX[goal_b]].astype(bool)
+        conflict |= (has_a[:, None] & has_b[None, :]) | (has_b[:, None] & has_a[None, :])
+    complementary = np.zeros((k, k), dtype=np.int64)
+    for my_goal, their_goal, bonus in COMPLEMENTARY_GOALS:
+        complementary += bonus * np.outer(goal_mask[:, _GOAL_INDEX[my_goal]], goal_mask[:, _GOAL_INDEX[their_goal]])
+    goal = np.where(conflict, 10, np.minimum(100, 50 + (goal_mask @ goal_mask.T) * 15 + complementary))
+
+    # Weight: 50% personality, 25% hobbies, 25% goals
+    return (personality * 0.5) + (hobby * 0.25) + (goal * 0.25)
@@ -0,0 +1,271 @@
+import json
+import sys
+from collections import deque
+from dataclasses import dataclass, asdict
+from datetime import date
+from typing import Callable, Dict, List, Optional, Tuple, Type
+
+@dataclass
+class SimulationEvent:
+    """Something that happened in the city (base class for all events)"""
+    when: date  # Simulated date
+
+    def message(self) -> str:
+        """Human readable one-liner, as printed to the console"""
+        return type(self).__name__
+
+    def to_dict(self) -> Dict:
+        data = asdict(self)
+        data["event"] = type(self).__name__
+        return data
+
+@dataclass
+class PairEvent(SimulationEvent):
+    """An event between two agents"""
+    agent1_id: int
+    agent1_name: str
+    agent2_id: int
+    agent2_name: str
+
+@dataclass
+class FriendshipFormed(PairEvent):
+    compatibility: float
+
+    def message(self) -> str:
+        return f"👥 {self.agent1_name} and {self.agent2_name} became friends! (Compatibility: {self.compatibility:.1f}%)"
+
+@dataclass
+class StartedDating(PairEvent):
+    compatibility: float
+
+    def message(self) -> str:
+        return f"🥰 {self.agent1_name} and {self.agent2_name} started dating! (Compatibility: {self.compatibility:.1f}%)"
+
+@dataclass
+class Engaged(PairEvent):
+    def message(self) -> str:
+        return f"💍 {self.agent1_name} proposed to {self.agent2_name} and they said YES!"
+
+@dataclass
+class ProposalRejected(PairEvent):
+    def message(self) -> str:
+        return f"💔 {self.agent1_name} proposed to {self.agent2_name} but they said no..."
+
+@dataclass
+class Married(PairEvent):
+    def message(self) -> str:
+        return f"👰🤵 {self.agent1_name} and {self.agent2_name} got married!"
+
+@dataclass
+class BrokeUp(PairEvent):
+    reason: str  # incompatibility, incompatible life goals, overall incompatibility
+
+    def message(self) -> str:
+        return f"💔 {self.agent1_name} and {self.agent2_name} broke up due to {self.reason}..."
+
+@dataclass
+class RelationshipStrain(PairEvent):
+    def message(self) -> str:
+        return f"😔 {self.agent1_name} and {self.agent2_name} are having relationship difficulties..."
+
+@dataclass
+class NameChanged(SimulationEvent):
+    agent_id: int
+    old_name: str
+    new_name: str
+
+    def message(self) -> str:
+        return f"💒 {self.old_name} is now {self.new_name}"
+
+@dataclass
+class Pregnancy(SimulationEvent):
+    mother_id: int
+    mother_name: str
+    accidental: bool
+
+    def message(self) -> str:
+        if self.accidental:
+            return f"🤰 {self.mother_name} accidentally got pregnant!"
+        return f"🤰 {self.mother_name} is pregnant!"
+
+@dataclass
+class Birth(SimulationEvent):
+    mother_id: int
+    mother_name: str
+    father_id: Optional[int]
+    father_name: Optional[str]
+    child_id: int
+    child_name: Optional[str]
+
+    def message(self) -> str:
+        if self.father_name is None:
+            return f"👶 {self.mother_name} had a baby (father unknown)!"
+        return f"👶 {self.mother_name} and {self.father_name} had a baby: {self.child_name}!"
+
+@dataclass
+class Adoption(PairEvent):
+    child_id: int
+    child_name: str
+
+    def message(self) -> str:
+        return f"👨‍👩‍👧‍👦 {self.agent1_name} and {self.agent2_name} adopted {self.child_name}!"
+
+@dataclass
+class Death(SimulationEvent):
+    agent_id: int
+    name: str
+    age: int
+
+    def message(self) -> str:
+        return f"💀 {self.name} (age {self.age}) has passed away."
+
+@dataclass
+class Grieving(SimulationEvent):
+    agent_id: int
+    name: str
+    deceased_id: int
+    deceased_name: str
+    relation: str  # partner or parent
+
+    def message(self) -> str:
+        if self.relation == "parent":
+            return f"😢 {self.name} has lost their parent {self.deceased_name}"
+        return f"💔 {self.name} is grieving the loss of {self.deceased_name}"
+
+@dataclass
+class Birthday(SimulationEvent):
+    agent_id: int
+    name: str
+    age: int
+
+    def message(self) -> str:
+        return f"🎂 {self.name} turned {self.age} today!"
+
+
+class EventBus:
+    """Publishes simulation events to subscribed sinks
+
+    Publishers check `active` before building an event, so a bus with no
+    subscribers costs one attribute lookup per would-be event.
+    """
+
+    def __init__(self):
+        self._subscriptions: List[Tuple[Callable, Optional[Tuple[Type, ...]], Optional[Callable]]] = []
+        self.active = False
+
+    def subscribe(self, sink: Callable[[SimulationEvent], None],
+                  event_types: Tuple[Type[SimulationEvent], ...] = None,
+                  where: Callable[[SimulationEvent], bool] = None) -> Callable:
+        """Send events to `sink`, optionally only some types and/or those matching `where`"""
+        if event_types is not None:
+            event_types = tuple(event_types)
+        self._subscriptions.append((sink, event_types, where))
+        self.active = True
+        return sink
+
+    def unsubscribe(self, sink: Callable):
+        self._subscriptions = [sub for sub in self._subscriptions if sub[0] is not sink]
+        self.active = bool(self._subscriptions)
+
+    def clear(self):
+        """Drop every subscriber (publishing becomes free)"""
+        self.flush()
+        self._subscriptions = []
+        self.active = False
+
+    def publish(self, event: SimulationEvent):
+        for sink, event_types, where in self._subscriptions:
+            if event_types is not None and not isinstance(event, event_types):
+                continue
+            if where is not None and not where(event):
+                continue
+            sink(event)
+
+    def flush(self):
+        """Flush sinks that buffer output"""
+        for sink, _, _ in self._subscriptions:
+            if hasattr(sink, "flush"):
+                sink.flush()
+
+    def __getstate__(self):
+        # Sinks hold streams and files; a restored bus starts without subscribers
+        return {"_subscriptions": [], "active": False}
+
+
+class ConsoleSink:
+    """Prints event messages, like the simulation always has"""
+
+    def __init__(self, stream=None):
+        self.stream = stream
+
+    def __call__(self, event: SimulationEvent):
+        print(event.message(), file=self.stream or sys.stdout)
+
+    def write_batch(self, events: List[SimulationEvent]):
+        print("\n".join(event.message() for event in events), file=self.stream or sys.stdout)
+
+
+class MemorySink:
+    """Keeps events in memory (the most recent `maxlen` if given)"""
+
+    def __init__(self, maxlen: int = None):
+        self.events = deque(maxlen=maxlen)
+
+    def __call__(self, event: SimulationEvent):
+        self.events.append(event)
+
+    def write_batch(self, events: List[SimulationEvent]):
+        self.events.extend(events)
+
+
+class FileSink:
+    """Appends events to a file, as JSON lines or as plain messages"""
+
+    def __init__(self, path: str, fmt: str = "jsonl"):
+        if fmt not in ("jsonl", "text"):
+            raise ValueError(f"unknown event log format: {fmt}")
+        self.path = path
+        self.fmt = fmt
+        self._file = open(path, "a", encoding="utf-8")
+
+    def _line(self, event: SimulationEvent) -> str:
+        if self.fmt == "text":
+            return f"{event.when} {event.message()}"
+        return json.dumps(event.to_dict(), default=str, ensure_ascii=False)
+
+    def __call__(self, event: SimulationEvent):
+        self._file.write(self._line(event) + "\n")
+
+    def write_batch(self, events: List[SimulationEvent]):
+        self._file.write("".join(self._line(event) + "\n" for event in events))
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class BatchingSink:
+    """Buffers events and hands them to another sink in batches"""
+
+    def __init__(self, target, batch_size: int = 1000):
+        self.target = target
+        self.batch_size = batch_size
+        self._buffer: List[SimulationEvent] = []
+
+    def __call__(self, event: SimulationEvent):
+        self._buffer.append(event)
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self._buffer:
+            if hasattr(self.target, "write_batch"):
+                self.target.write_batch(self._buffer)
+            else:
+                for event in self._buffer:
+                    self.target(event)
+            self._buffer = []
+        if hasattr(self.target, "flush"):
+            self.target.flush()
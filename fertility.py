@@ -0,0 +1,90 @@
+"""Daily accidental-pregnancy pass
+
+The per-pair rule (Agent.try_accidental_pregnancy) gives each female/male
+encounter an independent chance of ACCIDENTAL_ENCOUNTER_CHANCE (times
+ACCIDENTAL_KNOWN_MULTIPLIER if they are friends or dating) followed by the
+woman's unplanned conception_chance, and stops at her first success. So a
+woman meeting `known` acquaintances and `strangers` other men conceives
+with probability
+
+    1 - (1 - p_known) ** known * (1 - p_stranger) ** strangers
+
+This engine buckets each location's occupants once into fertile women and
+men 16+, computes that probability per woman and draws one roll for her,
+instead of walking every pair at every location.
+"""
+
+import random
+from typing import Dict, Iterable, List, Tuple
+
+from agent import ACCIDENTAL_ENCOUNTER_CHANCE, ACCIDENTAL_KNOWN_MULTIPLIER, RelationshipStatus
+
+
+class AccidentalPregnancyEngine:
+    """Accidental conceptions among everyone sharing a location"""
+
+    def __init__(self, rng: random.Random):
+        self.rng = rng
+
+    def daily_conceptions(self, crowds: Iterable[Iterable[int]], agents: Dict[int, 'Agent']) -> List[Tuple['Agent', 'Agent']]:
+        """(mother, father) for each conception today; `crowds` are the agent ids at each location
+
+        Nobody is changed: the caller makes the mothers pregnant.
+        """
+        rng = self.rng
+        conceptions = []
+        for crowd in crowds:
+            women, men = self.bucket(crowd, agents)
+            if not women or not men:
+                continue
+            for woman in women:
+                probability, known, p_known, p_stranger = self.conception_probability(woman, men)
+                if rng.random() < probability:
+                    conceptions.append((woman, self._pick_father(men, known, p_known, p_stranger)))
+        return conceptions
+
+    @staticmethod
+    def bucket(crowd: Iterable[int], agents: Dict[int, 'Agent']) -> Tuple[List['Agent'], Dict[int, 'Agent']]:
+        """Fertile women, and men old enough (id -> agent), among a location's occupants"""
+        women, men = [], {}
+        for agent_id in crowd:
+            agent = agents.get(agent_id)
+            if agent is None:
+                continue
+            if agent.gender == "male":
+                if agent.age >= 16:
+                    men[agent_id] = agent
+            elif agent.is_fertile():
+                women.append(agent)
+        return women, men
+
+    @staticmethod
+    def conception_probability(woman, men: Dict[int, 'Agent']):
+        """Chance that at least one encounter with `men` makes `woman` pregnant
+
+        Also returns the ids of the men she knows and the per-encounter
+        chances, for picking the father.
+        """
+        friends = woman.friend_ids
+        if len(friends) < len(men):
+            known = [friend_id for friend_id in friends if friend_id in men]
+        else:
+            known = [man_id for man_id in men if man_id in friends]
+        if (woman.relationship_status == RelationshipStatus.DATING and woman.partner_id in men
+                and woman.partner_id not in friends):
+            known.append(woman.partner_id)
+
+        chance = woman.conception_chance(is_planned=False)
+        p_stranger = ACCIDENTAL_ENCOUNTER_CHANCE * chance
+        p_known = p_stranger * ACCIDENTAL_KNOWN_MULTIPLIER
+        miss = (1 - p_known) ** len(known) * (1 - p_stranger) ** (len(men) - len(known))
+        return 1 - miss, known, p_known, p_stranger
+
+    def _pick_father(self, men: Dict[int, 'Agent'], known: List[int], p_known: float, p_stranger: float):
+        """A man drawn in proportion to his encounter's chance"""
+        rng = self.rng
+        strangers = len(men) - len(known)
+        if known and rng.random() * (len(known) * p_known + strangers * p_stranger) < len(known) * p_known:
+            return men[rng.choice(known)]
+        known_ids = set(known)
+        return rng.choice([man for man_id, man in men.items() if man_id not in known_ids])
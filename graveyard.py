@@ -0,0 +1,132 @@
+"""On-disk archive of deceased agents
+
+City.graveyard keeps every agent who has ever died. Rather than holding the
+Agent objects, it appends each one as a compressed pickle record to a file
+and keeps only an id -> record number index and the record end offsets in
+memory. Records are loaded back when looked up, with a small cache of the
+most recently loaded ones for the UI, which redraws the same rows every
+frame. Deaths are appended in order, so record order is death order.
+"""
+
+import pickle
+import tempfile
+import zlib
+from array import array
+from collections import OrderedDict
+from collections.abc import Mapping, Sequence
+from typing import Dict, List, Optional
+
+DEFAULT_CACHE_SIZE = 256  # Loaded agents kept around for repeated lookups
+
+
+class Graveyard(Mapping):
+    """Read-only mapping of deceased agent id -> Agent, backed by an append-only record file
+
+    With no `path` the records go to an anonymous temporary file that is
+    removed when the graveyard is closed or garbage collected. Agents
+    loaded back are copies: changing them does not change the archive.
+    """
+
+    def __init__(self, path: Optional[str] = None, cache_size: int = DEFAULT_CACHE_SIZE):
+        self.path = path
+        self.cache_size = cache_size
+        self._index: Dict[int, int] = {}  # Agent id -> record number
+        self._ids: List[int] = []  # Record number -> agent id
+        self._ends = array("Q", [0])  # Record i spans _ends[i]:_ends[i + 1]
+        self._cache: "OrderedDict[int, Agent]" = OrderedDict()
+        self._file = None  # Opened on the first death
+
+    def _open(self):
+        if self._file is None:
+            self._file = open(self.path, "w+b") if self.path else tempfile.TemporaryFile()
+        return self._file
+
+    def add(self, agent):
+        """Archive a deceased agent (its link to the city is dropped)"""
+        if agent.id in self._index:
+            return
+        agent.set_city(None)
+        record = zlib.compress(pickle.dumps(agent, protocol=pickle.HIGHEST_PROTOCOL))
+        f = self._open()
+        f.seek(self._ends[-1])
+        f.write(record)
+        self._index[agent.id] = len(self._ids)
+        self._ids.append(agent.id)
+        self._ends.append(self._ends[-1] + len(record))
+
+    def _load(self, record: int):
+        f = self._open()
+        f.seek(self._ends[record])
+        return pickle.loads(zlib.decompress(f.read(self._ends[record + 1] - self._ends[record])))
+
+    def __getitem__(self, agent_id):
+        agent = self._cache.get(agent_id)
+        if agent is not None:
+            self._cache.move_to_end(agent_id)
+            return agent
+        agent = self._load(self._index[agent_id])
+        self._cache[agent_id] = agent
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return agent
+
+    def __contains__(self, agent_id) -> bool:
+        return agent_id in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __iter__(self):
+        """Ids in the order they died"""
+        return iter(self._index)
+
+    @property
+    def bytes_on_disk(self) -> int:
+        return self._ends[-1]
+
+    def recent(self) -> "RecentDeaths":
+        """Lazy sequence of the deceased, most recent death first"""
+        return RecentDeaths(self)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __getstate__(self):
+        # Checkpoints carry the records themselves, not the file
+        state = self.__dict__.copy()
+        state["_cache"] = OrderedDict()
+        state["_file"] = None
+        if self._file is not None:
+            self._file.flush()
+            self._file.seek(0)
+            state["_records"] = self._file.read(self._ends[-1])
+        return state
+
+    def __setstate__(self, state):
+        records = state.pop("_records", None)
+        self.__dict__.update(state)
+        self.path = None  # Never write over the original archive
+        if records:
+            self._open().write(records)
+
+
+class RecentDeaths(Sequence):
+    """Deceased agents newest first, loaded only when indexed"""
+
+    def __init__(self, graveyard: Graveyard):
+        self._graveyard = graveyard
+        self._count = len(graveyard)  # Deaths after this point are not included
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError("graveyard index out of range")
+        return self._graveyard[self._graveyard._ids[self._count - 1 - i]]
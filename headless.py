@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Headless simulation runner
+
+Steps the city in a tight loop without pygame, for long population runs on
+machines without a display.
+
+Examples:
+    python headless.py --agents 50 --years 100
+    python headless.py --agents 200 --until 2124-01-01 --quiet
+    python headless.py --agents 200 --years 50 --seed 42 --quiet
+    python headless.py --agents 200 --years 50 --quiet --event-log events.jsonl
+    python headless.py --agents 200 --years 50 --checkpoint run.ckpt
+    python headless.py --resume run.ckpt --years 50 --checkpoint run.ckpt
+"""
+
+import argparse
+import sys
+import time
+from datetime import date
+
+from city import create_default_city
+from agent import generate_random_agent
+from events import BatchingSink, ConsoleSink, FileSink
+from checkpoint import save_checkpoint, load_checkpoint
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the city simulation without rendering")
+    parser.add_argument("--name", default="SimCity", help="City name")
+    parser.add_argument("--agents", type=int, default=5, help="Number of starting agents")
+    parser.add_argument("--hours", type=int, help="Simulated hours to run")
+    parser.add_argument("--days", type=int, help="Simulated days to run")
+    parser.add_argument("--years", type=int, help="Simulated years to run (365 days each)")
+    parser.add_argument("--until", type=date.fromisoformat, help="Run until this date (YYYY-MM-DD)")
+    parser.add_argument("--seed", type=int, help="Seed for a reproducible run (new cities only)")
+    parser.add_argument("--progress-every", type=int, default=24 * 365,
+                        help="Report progress every N simulated hours (default: yearly)")
+    parser.add_argument("--quiet", action="store_true", help="Hide per-event output from the simulation")
+    parser.add_argument("--event-log", metavar="PATH", help="Append every event to PATH as JSON lines")
+    parser.add_argument("--resume", metavar="PATH", help="Continue from a checkpoint instead of a new city")
+    parser.add_argument("--checkpoint", metavar="PATH", help="Save a checkpoint to PATH when the run ends")
+    args = parser.parse_args(argv)
+
+    hours = None
+    for value, multiplier in ((args.hours, 1), (args.days, 24), (args.years, 24 * 365)):
+        if value is not None:
+            hours = (hours or 0) + value * multiplier
+    if hours is None and args.until is None:
+        parser.error("give a duration with --hours/--days/--years or an end date with --until")
+    args.total_hours = hours
+    return args
+
+
+def main(argv=None):
+    """Main entry point"""
+    args = parse_args(argv)
+
+    if args.resume:
+        city = load_checkpoint(args.resume)
+        if not args.quiet:
+            city.events.subscribe(ConsoleSink())
+    else:
+        city = create_default_city(args.name, seed=args.seed)
+        for _ in range(args.agents):
+            city.add_agent(generate_random_agent(age_range=(22, 45), city=city))
+        if args.quiet:
+            city.events.clear()  # No sinks: events are never even built
+    event_log = None
+    if args.event_log:
+        event_log = FileSink(args.event_log)
+        city.events.subscribe(BatchingSink(event_log))
+
+    start = time.perf_counter()
+
+    def report(city, hours_done):
+        elapsed = time.perf_counter() - start
+        rate = hours_done / elapsed if elapsed > 0 else 0.0
+        print(f"[{city.current_date}] hours={hours_done:,} alive={len(city.agents)} "
+              f"deceased={len(city.graveyard)} ({rate:,.0f} sim-hours/s)", file=sys.stderr)
+
+    try:
+        hours_done = city.run(hours=args.total_hours, until_date=args.until,
+                              progress_callback=report, progress_interval=max(1, args.progress_every))
+    finally:
+        city.events.flush()
+        if event_log:
+            event_log.close()
+
+    if args.checkpoint:
+        save_checkpoint(city, args.checkpoint)
+
+    elapsed = time.perf_counter() - start
+    rate = hours_done / elapsed if elapsed > 0 else 0.0
+    print(f"\nSimulated {hours_done:,} hours in {elapsed:.1f}s ({rate:,.0f} sim-hours/s)")
+    print(f"Date: {city.current_date}  Day: {city.current_day}")
+    print(f"Population: {len(city.agents)}  Deceased: {len(city.graveyard)}")
+    print(f"Seed: {city.rng.seed}")
+
+
+if __name__ == "__main__":
+    main()
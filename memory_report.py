@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""Memory report: bytes per agent with slotted classes versus per-instance dicts
+
+Agent, Personality, Location and Job are slotted dataclasses. This report
+builds a population, copies every agent into an equivalent dict-backed
+mirror class (what the classes looked like before) and measures both.
+
+Examples:
+    python memory_report.py
+    python memory_report.py --agents 10000 --days 365
+"""
+
+import argparse
+import sys
+from dataclasses import fields, is_dataclass, make_dataclass, field
+from datetime import date
+from enum import Enum
+
+from city import create_generated_city
+from agent import Agent, Personality, generate_random_agent
+
+# Back-references and shared state, not part of an agent's own footprint
+SKIPPED_FIELDS = frozenset({"city", "_store"})
+
+_mirrors = {}
+
+
+def _public_name(cls, name: str) -> str:
+    # A private field behind a property (Agent._hobbies) is mirrored under the property's name
+    if name.startswith("_") and isinstance(getattr(cls, name[1:], None), property):
+        return name[1:]
+    return name
+
+
+def unslotted(cls):
+    """Dict-backed mirror of a slotted dataclass, with the same fields"""
+    if cls not in _mirrors:
+        _mirrors[cls] = make_dataclass(f"Unslotted{cls.__name__}",
+                                       [(_public_name(cls, f.name), f.type, field(default=None)) for f in fields(cls)])
+    return _mirrors[cls]
+
+
+def unslotted_copy(agent: Agent):
+    """The agent as a dict-backed object, sharing its lists, strings and dates"""
+    values = {_public_name(Agent, f.name): getattr(agent, f.name) for f in fields(agent)}
+    personality = agent.personality
+    values["personality"] = unslotted(Personality)(**{f.name: getattr(personality, f.name) for f in fields(personality)})
+    return unslotted(Agent)(**values)
+
+
+def deep_sizeof(obj, seen: set) -> int:
+    """Bytes held by `obj` and everything it references, counting each object once
+
+    Enum members, None and small ints are shared by the whole process and
+    are not charged to anyone.
+    """
+    if obj is None or isinstance(obj, (Enum, bool, type)) or id(obj) in seen:
+        return 0
+    if isinstance(obj, int) and -5 <= obj <= 256:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (str, int, float, date)):
+        return size
+    if isinstance(obj, dict):
+        return size + sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return size + sum(deep_sizeof(item, seen) for item in obj)
+    if is_dataclass(obj):
+        if hasattr(obj, "__dict__"):
+            size += sys.getsizeof(obj.__dict__)
+        return size + sum(deep_sizeof(getattr(obj, f.name), seen)
+                          for f in fields(obj) if f.name not in SKIPPED_FIELDS)
+    return size
+
+
+def bytes_per_agent(agents) -> dict:
+    """Average footprint of the given agents, slotted and dict-backed"""
+    agents = list(agents)
+    if not agents:
+        return {"agents": 0, "slotted": 0, "unslotted": 0, "saved": 0}
+    slotted = deep_sizeof(agents, set()) - sys.getsizeof(agents)
+    mirrors = [unslotted_copy(agent) for agent in agents]
+    dict_backed = deep_sizeof(mirrors, set()) - sys.getsizeof(mirrors)
+    return {
+        "agents": len(agents),
+        "slotted": slotted / len(agents),
+        "unslotted": dict_backed / len(agents),
+        "saved": 1 - slotted / dict_backed,
+    }
+
+
+def memory_report(agents: int = 1000, days: int = 0, seed: int = 1234) -> dict:
+    """Build (and optionally run) a city, then measure its living and deceased agents"""
+    city = create_generated_city("Memory", population=agents, seed=seed)
+    city.events.clear()
+    for _ in range(agents):
+        city.add_agent(generate_random_agent(age_range=(0, 90), city=city))
+    city.run(hours=24 * days)
+    graveyard = bytes_per_agent(city.graveyard.values())  # As loaded back from the archive
+    graveyard["on_disk"] = city.graveyard.bytes_on_disk / len(city.graveyard) if city.graveyard else 0
+    return {
+        "living": bytes_per_agent(city.agents.values()),
+        "graveyard": graveyard,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bytes per agent, slotted versus dict-backed")
+    parser.add_argument("--agents", type=int, default=1000, help="Population to build")
+    parser.add_argument("--days", type=int, default=0, help="Simulated days before measuring")
+    parser.add_argument("--seed", type=int, default=1234, help="City seed")
+    args = parser.parse_args(argv)
+
+    report = memory_report(args.agents, args.days, args.seed)
+    print(f"📏 Bytes per agent ({args.agents:,} agents, {args.days:,} days)")
+    for group, info in report.items():
+        if info["agents"]:
+            print(f"  {group:<10}{info['agents']:>8,} agents: {info['unslotted']:>8,.0f} -> "
+                  f"{info['slotted']:>8,.0f} bytes ({info['saved']:.0%} saved)"
+                  + (f", {info['on_disk']:,.0f} on disk" if "on_disk" in info else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+import random
+from typing import List
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional: MortalityEngine falls back to one roll per agent
+    np = None
+
+HAS_NUMPY = np is not None
+
+# Daily hazard by age band, same bands as Agent.calculate_death_probability:
+# ages below MORTALITY_AGE_LIMITS[i] get MORTALITY_BASE_RATES[i], 85+ gets the last rate
+MORTALITY_AGE_LIMITS = (1, 18, 30, 50, 65, 75, 85)
+MORTALITY_BASE_RATES = (0.00001, 0.000005, 0.00001, 0.00003, 0.0001, 0.0005, 0.002, 0.01)
+MAX_DAILY_DEATH_PROBABILITY = 0.05
+
+def death_probabilities(ages, health) -> "np.ndarray":
+    """Daily death probability for arrays of ages and health, equal to calculate_death_probability"""
+    base_rates = np.asarray(MORTALITY_BASE_RATES)[np.searchsorted(MORTALITY_AGE_LIMITS, ages, side="right")]
+    health_multiplier = 1 + (((100 - np.asarray(health)) / 100.0) * 2)  # 1.0x to 3.0x
+    return np.minimum(MAX_DAILY_DEATH_PROBABILITY, base_rates * health_multiplier)
+
+def reference_daily_deaths(agents: List, generator) -> List:
+    """Scalar reference for MortalityEngine: same draws, one calculate_death_probability per agent"""
+    draws = generator.random(len(agents))
+    return [agent for agent, draw in zip(agents, draws) if draw < agent.calculate_death_probability()]
+
+
+class MortalityEngine:
+    """Daily mortality pass for a whole population
+
+    With NumPy, ages and health are gathered into arrays, the hazard comes
+    from the age-band table, and every agent's roll is drawn in one call
+    from a Generator seeded off the city's mortality stream. Without NumPy
+    each agent rolls against `rng` like Agent.check_for_death does.
+    """
+
+    def __init__(self, rng: random.Random, vectorized: bool = None):
+        self.rng = rng
+        vectorized = HAS_NUMPY if vectorized is None else (vectorized and HAS_NUMPY)
+        self.generator = np.random.Generator(np.random.PCG64(rng.getrandbits(128))) if vectorized else None
+
+    def daily_deaths(self, agents: List, store=None, today=None) -> List:
+        """The agents (all living) who die today, in their original order
+
+        Pass the city's PopulationStore, if it has one, and today's date to
+        compute ages and read health straight from its columns.
+        """
+        if self.generator is None:
+            rng = self.rng
+            return [agent for agent in agents if rng.random() < agent.calculate_death_probability()]
+
+        count = len(agents)
+        if store is not None and today is not None:
+            from population import ages_on  # Only with a store, so NumPy is there
+            rows = store.rows_of(agents)
+            ages = ages_on(store.columns["birthday"][rows], today)
+            health = store.columns["health"][rows]
+        else:
+            ages = np.fromiter((agent.age for agent in agents), dtype=np.int64, count=count)
+            health = np.fromiter((agent.health for agent in agents), dtype=np.int64, count=count)
+        dies = self.generator.random(count) < death_probabilities(ages, health)
+        return [agents[i] for i in np.flatnonzero(dies)]
@@ -0,0 +1,208 @@
+"""Columnar (struct-of-arrays) storage for the agents' hot fields
+
+    city.enable_population_store()
+
+moves birthday, gender, health, happiness, energy, relationship and
+pregnancy status and the home/work/current location of every living agent
+into NumPy arrays, one row per agent. The Agent objects stay in
+city.agents and keep working everywhere: they become StoredAgent views whose
+hot fields are properties reading and writing their row. Vectorized passes
+(see MortalityEngine) read the columns directly; ages() computes everyone's
+age from the birthday column in one go.
+
+Reading one field through a view is slower than on a plain Agent; the store
+pays off in passes that work on whole columns. Deceased agents are
+detached, so the graveyard holds ordinary Agents. Requires NumPy.
+"""
+
+from dataclasses import fields
+from datetime import date
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from agent import Agent, RelationshipStatus, PregnancyStatus
+
+# Field -> (dtype, kind). "int" columns hold the value, "date" columns the
+# date's ordinal, "enum" columns the member's position, "code" columns an
+# index into a shared string table (-1 for None).
+STORED_FIELDS = {
+    "birthday": (np.int32, "date"),
+    "health": (np.int16, "int"),
+    "happiness": (np.int16, "int"),
+    "energy": (np.int16, "int"),
+    "relationship_status": (np.int8, "enum"),
+    "_pregnancy_status": (np.int8, "enum"),  # Behind Agent.pregnancy_status, which queues timers
+    "gender": (np.int8, "code"),
+    "home_location": (np.int32, "code"),
+    "work_location": (np.int32, "code"),
+    "current_location": (np.int32, "code"),
+}
+
+ENUM_MEMBERS = {
+    "relationship_status": list(RelationshipStatus),
+    "_pregnancy_status": list(PregnancyStatus),
+}
+
+# Code columns sharing one string table
+CODE_TABLES = {
+    "gender": "gender",
+    "home_location": "location",
+    "work_location": "location",
+    "current_location": "location",
+}
+
+
+class PopulationStore:
+    """NumPy columns for the hot fields of every attached agent, one row each"""
+
+    def __init__(self, capacity: int = 1024):
+        self.capacity = 0
+        self.columns: Dict[str, np.ndarray] = {}
+        self.alive = np.zeros(0, dtype=bool)  # Rows currently attached to an agent
+        self.agents: List[Optional[Agent]] = []  # Row -> agent
+        self._free_rows: List[int] = []
+        self._enum_codes = {name: {member: i for i, member in enumerate(members)}
+                            for name, members in ENUM_MEMBERS.items()}
+        self._codes: Dict[str, Dict[str, int]] = {table: {} for table in set(CODE_TABLES.values())}
+        self._strings: Dict[str, List[str]] = {table: [] for table in set(CODE_TABLES.values())}
+        self._grow(capacity)
+
+    def _grow(self, capacity: int):
+        for name, (dtype, _) in STORED_FIELDS.items():
+            column = np.zeros(capacity, dtype=dtype)
+            if name in self.columns:
+                column[:self.capacity] = self.columns[name]
+            self.columns[name] = column
+        alive = np.zeros(capacity, dtype=bool)
+        alive[:self.capacity] = self.alive
+        self.alive = alive
+        self._free_rows.extend(reversed(range(self.capacity, capacity)))
+        self.agents.extend([None] * (capacity - self.capacity))
+        self.capacity = capacity
+
+    def __len__(self) -> int:
+        return self.capacity - len(self._free_rows)
+
+    # Encoding between Python values and column contents
+
+    def encode(self, name: str, value) -> int:
+        kind = STORED_FIELDS[name][1]
+        if kind == "int":
+            return value
+        if kind == "date":
+            return value.toordinal()
+        if kind == "enum":
+            return self._enum_codes[name][value]
+        if value is None:
+            return -1
+        table = CODE_TABLES[name]
+        code = self._codes[table].get(value)
+        if code is None:
+            code = self._codes[table][value] = len(self._strings[table])
+            self._strings[table].append(value)
+        return code
+
+    def decode(self, name: str, stored):
+        kind = STORED_FIELDS[name][1]
+        if kind == "int":
+            return int(stored)
+        if kind == "date":
+            return date.fromordinal(int(stored))
+        if kind == "enum":
+            return ENUM_MEMBERS[name][stored]
+        return None if stored < 0 else self._strings[CODE_TABLES[name]][stored]
+
+    # Attaching agents
+
+    def attach(self, agent: Agent):
+        """Move the agent's hot fields into a row and turn it into a StoredAgent view"""
+        if isinstance(agent, StoredAgent):
+            return
+        if not self._free_rows:
+            self._grow(self.capacity * 2)
+        row = self._free_rows.pop()
+        for name in STORED_FIELDS:
+            self.columns[name][row] = self.encode(name, getattr(agent, name))
+            object.__delattr__(agent, name)  # The row is the only copy from now on
+        agent._store = self
+        agent._row = row
+        agent.__class__ = StoredAgent  # Same slots; the views' properties shadow the hot ones
+        self.alive[row] = True
+        self.agents[row] = agent
+
+    def detach(self, agent: Agent):
+        """Copy the agent's row back into the object's (emptied) slots and free the row"""
+        if not isinstance(agent, StoredAgent) or agent._store is not self:
+            return
+        row = agent._row
+        values = {name: self.decode(name, self.columns[name][row]) for name in STORED_FIELDS}
+        agent.__class__ = Agent
+        for name, value in values.items():
+            setattr(agent, name, value)
+        agent._store = None
+        agent._row = -1
+        self.alive[row] = False
+        self.agents[row] = None
+        self._free_rows.append(row)
+
+    def rows_of(self, agents: List[Agent]) -> np.ndarray:
+        """Row numbers of attached agents, in the given order"""
+        return np.fromiter((agent._row for agent in agents), dtype=np.intp, count=len(agents))
+
+    def column(self, name: str, agents: List[Agent] = None) -> np.ndarray:
+        """Raw column values for `agents` (a copy), or the whole column (a live view, dead rows included)"""
+        if agents is None:
+            return self.columns[name]
+        return self.columns[name][self.rows_of(agents)]
+
+    def ages(self, today: date, agents: List[Agent] = None) -> np.ndarray:
+        """Ages on `today` of `agents`, or of every row (dead rows included), from the birthday column"""
+        return ages_on(self.column("birthday", agents), today)
+
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+def ages_on(ordinals: np.ndarray, today: date) -> np.ndarray:
+    """Vectorized agent.age_on: ages on `today` for an array of birthday ordinals"""
+    days = (np.asarray(ordinals, dtype=np.int64) - _EPOCH_ORDINAL).astype("datetime64[D]")
+    months = days.astype("datetime64[M]")
+    years = days.astype("datetime64[Y]")
+    # Birthdays as month * 100 + day, to compare with today's
+    month_days = (months - years).astype(np.int64) * 100 + (days - months).astype(np.int64) + 101
+    return (today.year - 1970 - years.astype(np.int64)) - (month_days > today.month * 100 + today.day)
+
+
+def _stored_field(name: str) -> property:
+    kind = STORED_FIELDS[name][1]
+
+    if kind == "int":
+        def fget(self):
+            return int(self._store.columns[name][self._row])
+    else:
+        def fget(self):
+            return self._store.decode(name, self._store.columns[name][self._row])
+
+    def fset(self, value):
+        self._store.columns[name][self._row] = self._store.encode(name, value)
+
+    return property(fget, fset, doc=f"{name} (stored in the population store)")
+
+
+class StoredAgent(Agent):
+    """An Agent whose hot fields live in a PopulationStore row (see PopulationStore.attach)"""
+    
+    __slots__ = ()  # Must match Agent's layout for the __class__ swap
+    
+    def __getstate__(self):
+        # The hot fields are pickled with the store's columns
+        return {name: getattr(self, name) for name in _VIEW_FIELDS}
+    
+    def __setstate__(self, state):
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+
+_VIEW_FIELDS = tuple(f.name for f in fields(Agent) if f.name not in STORED_FIELDS)
+
+for _name in STORED_FIELDS:
+    setattr(StoredAgent, _name, _stored_field(_name))
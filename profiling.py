@@ -0,0 +1,129 @@
+"""Optional per-phase profiling of City.simulate_hour
+
+    profiler = city.enable_profiling()
+    city.run(hours=24 * 365)
+    print(profiler.report())
+
+While no profiler is attached the simulation only pays one `is None`
+check per phase.
+"""
+
+import time
+from typing import Dict, List
+
+# Phases of City.simulate_hour, in the order they run
+PHASES = (
+    "birthdays",               # celebrate_birthday (daily)
+    "mortality",               # check_for_death rolls (daily)
+    "agent_death",             # _handle_agent_death for the day's deceased
+    "movement",                # decide_action + _update_agent_location loop
+    "social",                  # _handle_social_interactions
+    "pregnancies",             # _handle_pregnancies (daily)
+    "accidental_pregnancies",  # _handle_accidental_pregnancies (daily)
+    "relationship_health",     # _check_relationship_health (monthly)
+    "family_planning",         # _handle_family_planning (monthly)
+)
+
+COUNTERS = ("hours", "pairs_evaluated", "moves_made")
+
+
+class PhaseStats:
+    """Seconds, calls and counters accumulated over some stretch of hours"""
+
+    def __init__(self):
+        self.wall_seconds = 0.0  # Whole simulate_hour calls, untimed work between phases included
+        self.seconds: Dict[str, float] = dict.fromkeys(PHASES, 0.0)
+        self.calls: Dict[str, int] = dict.fromkeys(PHASES, 0)
+        self.counters: Dict[str, int] = dict.fromkeys(COUNTERS, 0)
+
+    def as_dict(self) -> Dict:
+        total = sum(self.seconds.values())
+        return {
+            "seconds": total,
+            "wall_seconds": self.wall_seconds,
+            "phases": {
+                phase: {
+                    "seconds": self.seconds[phase],
+                    "calls": self.calls[phase],
+                    "ms_per_call": 1000 * self.seconds[phase] / self.calls[phase] if self.calls[phase] else 0.0,
+                    "share": self.seconds[phase] / total if total else 0.0,
+                }
+                for phase in PHASES
+            },
+            "counters": dict(self.counters),
+        }
+
+
+class SimulationProfiler:
+    """Times each simulate_hour phase and counts calls, pairs evaluated and moves made
+
+    Keeps running totals plus the last complete window of `window_hours`
+    simulated hours, so a slowdown late in a long run shows up without
+    being averaged away by the early years.
+    """
+
+    def __init__(self, window_hours: int = 24 * 30):
+        self.window_hours = window_hours
+        self.reset()
+
+    def reset(self):
+        self.total = PhaseStats()
+        self.window = PhaseStats()
+        self.last_window = None
+        self._hour_started = None
+
+    def start_hour(self):
+        """Called at the start of each simulated hour"""
+        self._hour_started = time.perf_counter()
+
+    def time_phase(self, phase: str, method, *args):
+        """Run `method(*args)` and charge its wall time to `phase`"""
+        start = time.perf_counter()
+        try:
+            return method(*args)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.total.seconds[phase] += elapsed
+            self.total.calls[phase] += 1
+            self.window.seconds[phase] += elapsed
+            self.window.calls[phase] += 1
+
+    def count(self, counter: str, amount: int = 1):
+        self.total.counters[counter] += amount
+        self.window.counters[counter] += amount
+
+    def end_hour(self):
+        """Called once per simulated hour; rolls the window over when it is full"""
+        if self._hour_started is not None:
+            elapsed = time.perf_counter() - self._hour_started
+            self.total.wall_seconds += elapsed
+            self.window.wall_seconds += elapsed
+            self._hour_started = None
+        self.count("hours")
+        if self.window.counters["hours"] >= self.window_hours:
+            self.last_window = self.window
+            self.window = PhaseStats()
+
+    def totals(self) -> Dict:
+        """Everything since the profiler was attached (or reset)"""
+        return self.total.as_dict()
+
+    def recent(self) -> Dict:
+        """The last complete window, or the current partial one early in a run"""
+        return (self.last_window or self.window).as_dict()
+
+    def report(self, recent: bool = False) -> str:
+        """Plain-text table, slowest phases first"""
+        return "\n".join(self.summary_lines(recent=recent))
+
+    def summary_lines(self, recent: bool = False, top: int = None) -> List[str]:
+        stats = self.recent() if recent else self.totals()
+        counters = stats["counters"]
+        hours, wall = counters["hours"], stats["wall_seconds"]
+        lines = [f"{hours:,} hours, {wall:.2f}s" + (f", {hours / wall:,.0f} hours/s" if wall else "")
+                 + f" ({stats['seconds']:.2f}s in phases)"]
+        phases = sorted(stats["phases"].items(), key=lambda item: item[1]["seconds"], reverse=True)
+        for phase, info in phases[:top]:
+            lines.append(f"{phase:<24}{info['share']:>6.1%}{info['ms_per_call']:>9.3f} ms x {info['calls']:,}")
+        lines.append(f"pairs evaluated: {counters['pairs_evaluated']:,}  moves made: {counters['moves_made']:,}")
+        return lines
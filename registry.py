@@ -0,0 +1,71 @@
+"""City-issued agent ids
+
+Agent ids are dense positive integers (0 is never issued, so an id is
+always truthy, like the string ids that came before). Each City owns an
+AgentRegistry that mints them and remembers, per id, whether it was issued,
+belongs to a living agent or was retired; the agents themselves live in
+City.agents. An id is never issued twice: agents created outside a city get
+ids from a process-wide counter starting at LOOSE_ID_BASE, a range no city
+issues from, and the registry keeps those in a dict rather than padding its
+array up to them.
+"""
+
+from typing import Dict
+
+LOOSE_ID_BASE = 10 ** 9  # Ids of agents created outside any city start here
+
+# State of an id, one byte each
+_UNUSED = 0  # Never issued or registered
+_ISSUED = 1  # Handed out by new_id, its agent not added yet
+_LIVING = 2  # Registered to an agent in the city
+_RETIRED = 3  # Its agent died or left: the id is never reused
+
+
+class AgentRegistry:
+    """Id allocation for one city: which ids are taken and which are living"""
+
+    def __init__(self):
+        self._states = bytearray([_RETIRED])  # Id -> state in the dense range (0 is never issued)
+        self._loose: Dict[int, int] = {}  # Loose-range id -> state
+
+    def new_id(self) -> int:
+        """Issue the next unused id (reserved until its agent is registered)"""
+        self._states.append(_ISSUED)
+        return len(self._states) - 1
+
+    def _state(self, agent_id: int) -> int:
+        if agent_id >= LOOSE_ID_BASE:
+            return self._loose.get(agent_id, _UNUSED)
+        return self._states[agent_id] if 0 <= agent_id < len(self._states) else _UNUSED
+
+    def _set_state(self, agent_id: int, state: int):
+        if agent_id >= LOOSE_ID_BASE:
+            self._loose[agent_id] = state
+        else:
+            if agent_id >= len(self._states):
+                self._states.extend(bytes(agent_id + 1 - len(self._states)))
+            self._states[agent_id] = state
+
+    def register(self, agent_id: int):
+        """Mark an id as a living agent's, reserving ids issued elsewhere"""
+        if not isinstance(agent_id, int) or agent_id < 1:
+            raise TypeError(f"agent ids are positive integers, got {agent_id!r}")
+        state = self._state(agent_id)
+        if state == _RETIRED:
+            raise ValueError(f"agent id {agent_id} belonged to an agent who is gone")
+        if state == _LIVING:
+            raise ValueError(f"agent id {agent_id} is already in use")
+        self._set_state(agent_id, _LIVING)
+
+    def unregister(self, agent_id: int):
+        """Retire the id of an agent who died or left the city"""
+        if self._state(agent_id) != _UNUSED:
+            self._set_state(agent_id, _RETIRED)
+
+    def __contains__(self, agent_id) -> bool:
+        """Whether the id belongs to a living agent"""
+        return isinstance(agent_id, int) and self._state(agent_id) == _LIVING
+
+    def __len__(self) -> int:
+        """Ids issued or reserved in the dense range so far (living, dead and pending)"""
+        return len(self._states) - 1
@@ -0,0 +1,43 @@
+"""Day-granularity timers for the city
+
+Pregnancies and postpartum recoveries only need attention on the day they
+end, so instead of advancing a counter on every agent every day the city
+schedules a timer when one starts and pops only the timers that are due.
+"""
+
+import heapq
+from typing import List, Tuple
+
+
+class DayScheduler:
+    """Min-heap of (day, sequence, kind, agent id) timers
+
+    Timers are never cancelled: the handler checks the agent's state when a
+    timer fires and ignores it if it no longer applies (the agent died, or
+    the timer was rescheduled). Timers due the same day fire in the order
+    they were scheduled.
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[int, int, str, int]] = []
+        self._sequence = 0
+
+    def schedule(self, day: int, kind: str, agent_id: int):
+        heapq.heappush(self._heap, (day, self._sequence, kind, agent_id))
+        self._sequence += 1
+
+    def pop_due(self, day: int) -> List[Tuple[str, int]]:
+        """(kind, agent id) of every timer due on or before `day`, removing them"""
+        due = []
+        heap = self._heap
+        while heap and heap[0][0] <= day:
+            _, _, kind, agent_id = heapq.heappop(heap)
+            due.append((kind, agent_id))
+        return due
+
+    def next_day(self):
+        """Day of the earliest pending timer, or None"""
+        return self._heap[0][0] if self._heap else None
+
+    def __len__(self) -> int:
+        return len(self._heap)
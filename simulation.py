@@ -1,9 +1,9 @@
 import pygame
 import sys
+import time
 from typing import Dict, Tuple
-from datetime import date
 from city import City, Location, LocationType, create_default_city
-from agent import Agent, generate_random_agent
+from agent import Agent, generate_random_agent, format_agent_id
 
 # Colors
 WHITE = (255, 255, 255)
@@ -56,6 +56,12 @@ class CitySimulation:
         self.selected_agent = None
         self.paused = False
         self.speed = 1  # Simulation speed multiplier
+        self.frames_per_hour = 30  # At 1x speed, one hour passes every 30 frames
+        self.frame_budget = 0.012  # Seconds of CPU per frame spent catching up on simulated hours
+        self.pending_hours = 0.0  # Simulated hours owed, carried over between frames
+        self.sim_rate = 0.0  # Achieved simulated hours per wall second
+        self.rate_window_start = time.perf_counter()
+        self.rate_window_hours = 0
         self.show_names = True
         self.info_scroll_offset = 0  # For scrolling in info panel
         self.show_family_tree = False  # Toggle family tree view
@@ -65,6 +71,7 @@ class CitySimulation:
         self.agent_list_filter = "all"  # Current age filter: all, babies, toddlers, children, preteens, teens, young_adults, adults, elders
         self.agent_list_scroll_offset = 0  # Scroll offset for agent list
         self.agent_list_clickable_areas = []  # Store clickable areas for agent list
+        self.show_profiler = False  # Toggle per-phase profiler overlay (profiling only runs while shown)
         
     def grid_to_screen(self, grid_pos: Tuple[int, int]) -> Tuple[int, int]:
         """Convert grid coordinates to screen coordinates"""
@@ -102,9 +109,8 @@ class CitySimulation:
         pos = self.grid_to_screen(location.position)
         
         # Offset agents within same location slightly
-        occupants = location.current_occupants
-        if agent.id in occupants:
-            index = occupants.index(agent.id)
+        index = location.slot_of(agent.id)
+        if index is not None:
             offset_x = (index % 3 - 1) * 8
             offset_y = (index // 3 - 1) * 8
             pos = (pos[0] + offset_x, pos[1] + offset_y)
@@ -150,6 +156,11 @@ class CitySimulation:
         
         status_text = self.small_font.render(f"{'PAUSED' if self.paused else 'RUNNING'} (Speed: {speed_display}x)", True, RED if self.paused else GREEN)
         self.screen.blit(status_text, (panel_x + 10, y_offset))
+        y_offset += 20
+        
+        # Achieved speed (the requested speed may be more than one frame's CPU budget allows)
+        rate_text = self.small_font.render(f"Sim rate: {self.sim_rate:,.1f} hours/s", True, BLACK)
+        self.screen.blit(rate_text, (panel_x + 10, y_offset))
         y_offset += 30
         
         # Agent count
@@ -217,7 +228,7 @@ class CitySimulation:
             relationship_duration = ""
             if agent.partner_id and agent.partner_id in self.city.agents:
                 partner = self.city.agents[agent.partner_id]
-                partner_info = f"{partner.name} (ID: {partner.id})"
+                partner_info = f"{partner.name} (ID: {format_agent_id(partner.id)})"
                 if agent.days_in_relationship > 0:
                     days = agent.days_in_relationship
                     if days < 30:
@@ -246,10 +257,10 @@ class CitySimulation:
             for friend_id in agent.friend_ids:
                 if friend_id in self.city.agents:
                     friend = self.city.agents[friend_id]
-                    friends_info.append(f"{friend.name} (ID: {friend.id})")
+                    friends_info.append(f"{friend.name} (ID: {format_agent_id(friend.id)})")
             
             info_lines = [
-                f"ID: {agent.id}",
+                f"ID: {format_agent_id(agent.id)}",
                 f"Name: {agent.name}",
                 f"Age: {agent.age} years old",
                 f"Birthday: {agent.birthday.strftime('%m-%d')}",
@@ -297,7 +308,7 @@ class CitySimulation:
                         child = self.city.agents[child_id]
                         info_lines.append(f"  • {child.name} (Age {child.age})")
                     else:
-                        info_lines.append(f"  • Child ID: {child_id}")
+                        info_lines.append(f"  • Child ID: {format_agent_id(child_id)}")
             
             info_lines.extend([
                 f"",
@@ -385,7 +396,7 @@ class CitySimulation:
         
         # Help menu box
         menu_width = 400
-        menu_height = 300
+        menu_height = 440
         menu_x = (self.width - menu_width) // 2
         menu_y = (self.height - menu_height) // 2
         
@@ -408,6 +419,7 @@ class CitySimulation:
             "    Q=1M, W=10M, E=100M (MEGA SPEEDS!)",
             "  N - Toggle location names",
             "  A - Add random agent",
+            "  P - Toggle profiler overlay",
             "",
             "AGENT INTERACTION:",
             "  Click agent - Select and view info",
@@ -425,6 +437,28 @@ class CitySimulation:
             self.screen.blit(text, (menu_x + 20, y_offset))
             y_offset += 18
     
+    def draw_profiler_overlay(self):
+        """Draw per-phase timings of the most recent simulated month over the map"""
+        if not self.city.profiler:
+            return
+        lines = ["Profiler (last 30 days)"] + self.city.profiler.summary_lines(recent=True)
+        
+        box_width = 430
+        box_height = 10 + len(lines) * 18
+        box_x = self.grid_margin
+        box_y = self.grid_margin
+        overlay = pygame.Surface((box_width, box_height))
+        overlay.set_alpha(220)
+        overlay.fill(WHITE)
+        self.screen.blit(overlay, (box_x, box_y))
+        pygame.draw.rect(self.screen, BLACK, (box_x, box_y, box_width, box_height), 2)
+        
+        y_offset = box_y + 6
+        for line in lines:
+            text = self.small_font.render(line, True, BLACK)
+            self.screen.blit(text, (box_x + 8, y_offset))
+            y_offset += 18
+    
     def draw_help_button(self):
         """Draw help button in top left corner"""
         button_text = self.small_font.render("❓ Help", True, WHITE)
@@ -465,10 +499,9 @@ class CitySimulation:
             base_pos = self.grid_to_screen(location.position)
             
             # Calculate agent position with offset (same logic as in draw_agent)
-            occupants = location.current_occupants
             agent_pos = base_pos
-            if agent.id in occupants:
-                index = occupants.index(agent.id)
+            index = location.slot_of(agent.id)
+            if index is not None:
                 offset_x = (index % 3 - 1) * 8
                 offset_y = (index // 3 - 1) * 8
                 agent_pos = (base_pos[0] + offset_x, base_pos[1] + offset_y)
@@ -504,17 +537,17 @@ class CitySimulation:
         partner_info = "None"
         if agent.partner_id and agent.partner_id in self.city.agents:
             partner = self.city.agents[agent.partner_id]
-            partner_info = f"{partner.name} (ID: {partner.id})"
+            partner_info = f"{partner.name} (ID: {format_agent_id(partner.id)})"
         
         # Build detailed friends list
         friends_info = []
         for friend_id in agent.friend_ids:
             if friend_id in self.city.agents:
                 friend = self.city.agents[friend_id]
-                friends_info.append(f"{friend.name} (ID: {friend.id})")
+                friends_info.append(f"{friend.name} (ID: {format_agent_id(friend.id)})")
         
         info_lines = [
-            f"ID: {agent.id}",
+            f"ID: {format_agent_id(agent.id)}",
             f"Name: {agent.name}",
             f"Age: {agent.age} years old",
             f"Birthday: {agent.birthday.strftime('%m-%d')}",
@@ -549,7 +582,7 @@ class CitySimulation:
                     child = self.city.agents[child_id]
                     info_lines.append(f"  • {child.name} (Age {child.age})")
                 else:
-                    info_lines.append(f"  • Child ID: {child_id}")
+                    info_lines.append(f"  • Child ID: {format_agent_id(child_id)}")
         
         info_lines.extend([
             f"",
@@ -621,7 +654,7 @@ class CitySimulation:
         # Check if parent is alive in the simulation
         if parent_id and parent_id in self.city.agents:
             parent = self.city.agents[parent_id]
-            return f"{parent.name} (ID: {parent.id})"
+            return f"{parent.name} (ID: {format_agent_id(parent.id)})"
         elif deceased_name:
             return f"{deceased_name} (deceased)"
         else:
@@ -649,9 +682,8 @@ class CitySimulation:
     def get_filtered_agents(self):
         """Get agents filtered by current age category"""
         if self.agent_list_filter == "graveyard":
-            # Show deceased agents from graveyard
-            deceased_agents = list(self.city.graveyard.values())
-            return sorted(deceased_agents, key=lambda a: a.date_of_death if a.date_of_death else date(1900, 1, 1), reverse=True)
+            # Deceased agents, most recent first (loaded from the archive as rows are drawn)
+            return self.city.graveyard.recent()
         
         # Show living agents
         agents = list(self.city.agents.values())
@@ -793,7 +825,7 @@ class CitySimulation:
                     self.agent_list_scroll_offset = 0  # Reset scroll
                     return
                 elif area_type.startswith("agent_"):
-                    agent_id = area_type[6:]  # Remove "agent_" prefix
+                    agent_id = int(area_type[6:])  # Remove "agent_" prefix
                     if agent_id in self.city.agents:
                         self.selected_agent = agent_id
                         self.show_agent_list = False
@@ -905,11 +937,37 @@ class CitySimulation:
                     self.show_family_tree = False
                     return
     
+    def advance_simulation(self):
+        """Step as many simulated hours as the speed asks for and the frame budget allows"""
+        self.pending_hours += self.speed / self.frames_per_hour
+        
+        deadline = time.perf_counter() + self.frame_budget
+        stepped = 0
+        while self.pending_hours >= 1:
+            self.city.simulate_hour()
+            self.pending_hours -= 1
+            stepped += 1
+            if time.perf_counter() >= deadline:
+                break
+        
+        # Couldn't keep up: drop the whole-hour backlog so it doesn't snowball, keep the fraction
+        if self.pending_hours >= 1:
+            self.pending_hours -= int(self.pending_hours)
+        
+        self.rate_window_hours += stepped
+    
+    def update_sim_rate(self):
+        """Refresh the achieved simulated-hours-per-second reading about once a second"""
+        now = time.perf_counter()
+        elapsed = now - self.rate_window_start
+        if elapsed >= 1.0:
+            self.sim_rate = self.rate_window_hours / elapsed
+            self.rate_window_start = now
+            self.rate_window_hours = 0
+    
     def run(self):
         """Main simulation loop"""
         running = True
-        frames_per_hour = 30  # Simulate one hour every 30 frames
-        frame_count = 0
         
         while running:
             for event in pygame.event.get():
@@ -999,7 +1057,7 @@ class CitySimulation:
                         self.show_names = not self.show_names
                     elif event.key == pygame.K_a:
                         # Add a new random agent
-                        new_agent = generate_random_agent()
+                        new_agent = generate_random_agent(city=self.city)
                         self.city.add_agent(new_agent)
                         self.selected_agent = new_agent.id
                     elif event.key == pygame.K_f:
@@ -1018,6 +1076,13 @@ class CitySimulation:
                     elif event.key == pygame.K_h:
                         # Toggle help menu
                         self.show_help_menu = not self.show_help_menu
+                    elif event.key == pygame.K_p:
+                        # Toggle profiler overlay (and the profiling itself)
+                        self.show_profiler = not self.show_profiler
+                        if self.show_profiler:
+                            self.city.enable_profiling()
+                        else:
+                            self.city.disable_profiling()
                     elif event.key == pygame.K_l:
                         # Toggle agent list
                         self.show_agent_list = not self.show_agent_list
@@ -1064,10 +1129,8 @@ class CitySimulation:
             
             # Update simulation
             if not self.paused:
-                frame_count += self.speed
-                if frame_count >= frames_per_hour:
-                    frame_count = 0
-                    self.city.simulate_hour()
+                self.advance_simulation()
+            self.update_sim_rate()
             
             # Draw everything
             self.screen.fill(WHITE)
@@ -1098,6 +1161,9 @@ class CitySimulation:
                 self.draw_info_panel()
             self.draw_legend()
             
+            if self.show_profiler:
+                self.draw_profiler_overlay()
+            
             # Draw help button
             self.draw_help_button()
             
@@ -1118,7 +1184,7 @@ def main():
     
     print("Generating initial agents...")
     for i in range(5):  # Start with 5 agents
-        agent = generate_random_agent(age_range=(22, 45))
+        agent = generate_random_agent(age_range=(22, 45), city=city)
         city.add_agent(agent)
         print(f"  Added: {agent.name} ({agent.age}y, {agent.job_title})")
     
@@ -1131,6 +1197,7 @@ def main():
     print("  N - Toggle location names")
     print("  A - Add random agent")
     print("  L - Agent browser")
+    print("  P - Profiler overlay")
     print("  H - Help menu")
     print("  Click on an agent to view details")
     print("\nTIP: Use speed 1000x+ to quickly see generations develop!")
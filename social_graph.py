@@ -0,0 +1,144 @@
+"""City-owned friendship graph
+
+Every agent keeps its friends as an insertion-ordered set (a dict with None
+values), so edge tests, adding a friend and dropping one are O(1). The
+city's SocialGraph maps each living agent's id to that same dict, which
+makes it the adjacency of the whole friendship graph without a second copy
+to keep in sync. Agent.friend_ids is a read-only FriendIdsView over it.
+"""
+
+from collections import deque
+from collections.abc import Sequence
+from itertools import islice
+from typing import Dict, List, Optional
+
+
+class FriendIdsView(Sequence):
+    """Read-only, list-like view of an agent's friend ids (in the order they became friends)
+
+    Membership, len and iteration are as cheap as on the dict. Indexing
+    walks it from the nearer end, so view[0] and view[-1] are O(1) but
+    view[i] is O(min(i, len - i)); iterate rather than index in loops.
+    """
+
+    __slots__ = ("_friends",)
+
+    def __init__(self, friends: Dict[int, None]):
+        self._friends = friends
+
+    def __contains__(self, agent_id) -> bool:
+        return agent_id in self._friends
+
+    def __iter__(self):
+        return iter(self._friends)
+
+    def __len__(self) -> int:
+        return len(self._friends)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return list(self._friends)[i]
+        count = len(self._friends)
+        if i < 0:
+            i += count
+        if not 0 <= i < count:
+            raise IndexError("friend index out of range")
+        if i >= count // 2:
+            return next(islice(reversed(self._friends), count - 1 - i, None))
+        return next(islice(self._friends, i, None))
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (FriendIdsView, list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"FriendIdsView({list(self._friends)!r})"
+
+
+class SocialGraph:
+    """Undirected friendship graph over the city's living agents"""
+
+    def __init__(self):
+        self._adjacency: Dict[int, Dict[int, None]] = {}  # Agent id -> that agent's friend set
+
+    def add_vertex(self, agent_id: int, friends: Optional[Dict[int, None]] = None):
+        """Add an agent, adopting its existing friend set (friendships it already has are kept)"""
+        self._adjacency[agent_id] = friends if friends is not None else {}
+
+    def remove_vertex(self, agent_id: int) -> List[int]:
+        """Drop an agent and every edge to it; returns the former friends still in the graph
+
+        The agent's own friend set is left as it was, as a record of who
+        its friends were.
+        """
+        friends = self._adjacency.pop(agent_id, None)
+        if friends is None:
+            return []
+        former = []
+        for friend_id in friends:
+            neighbors = self._adjacency.get(friend_id)
+            if neighbors is not None:
+                neighbors.pop(agent_id, None)
+                former.append(friend_id)
+        return former
+
+    def add_edge(self, a: int, b: int) -> bool:
+        """Make two agents friends; returns False if they already were"""
+        friends_a, friends_b = self._adjacency[a], self._adjacency[b]
+        if b in friends_a:
+            return False
+        friends_a[b] = None
+        friends_b[a] = None
+        return True
+
+    def remove_edge(self, a: int, b: int) -> bool:
+        friends_a, friends_b = self._adjacency.get(a, {}), self._adjacency.get(b, {})
+        if b not in friends_a:
+            return False
+        del friends_a[b]
+        friends_b.pop(a, None)
+        return True
+
+    def has_edge(self, a: int, b: int) -> bool:
+        friends = self._adjacency.get(a)
+        return friends is not None and b in friends
+
+    def neighbors(self, agent_id: int) -> FriendIdsView:
+        return FriendIdsView(self._adjacency[agent_id])
+
+    def degree(self, agent_id: int) -> int:
+        return len(self._adjacency[agent_id])
+
+    def degrees(self) -> Dict[int, int]:
+        """Friend count of every agent"""
+        return {agent_id: len(friends) for agent_id, friends in self._adjacency.items()}
+
+    def edge_count(self) -> int:
+        return sum(len(friends) for friends in self._adjacency.values()) // 2
+
+    def components(self) -> List[List[int]]:
+        """Connected friend circles, largest first (loners are circles of one)"""
+        seen = set()
+        components = []
+        for start in self._adjacency:
+            if start in seen:
+                continue
+            seen.add(start)
+            component = [start]
+            queue = deque(component)
+            while queue:
+                for friend_id in self._adjacency[queue.popleft()]:
+                    if friend_id not in seen and friend_id in self._adjacency:
+                        seen.add(friend_id)
+                        component.append(friend_id)
+                        queue.append(friend_id)
+            components.append(component)
+        components.sort(key=len, reverse=True)
+        return components
+
+    def __contains__(self, agent_id) -> bool:
+        return agent_id in self._adjacency
+
+    def __len__(self) -> int:
+        return len(self._adjacency)
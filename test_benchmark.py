@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+"""Smoke test for the benchmark suite"""
+
+import json
+
+import benchmark
+
+
+def test_benchmark_writes_comparable_results(tmp_path):
+    output = tmp_path / "results.json"
+    benchmark.main(["--sizes", "50", "300", "--hours", "30", "--output", str(output)])
+
+    results = json.loads(output.read_text())
+    assert [r["agents"] for r in results["results"]] == [50, 300]
+    for result in results["results"]:
+        assert result["hours"] == 30
+        assert result["hours_per_second"] > 0
+        assert set(result["phases"]) == set(benchmark.PHASES)
+        assert sum(p["seconds"] for p in result["phases"].values()) <= result["seconds"]
+        assert result["memory"]["build_peak_bytes"] > 0
+
+    benchmark.main(["--sizes", "50", "--hours", "5", "--output", str(tmp_path / "again.json"),
+                    "--compare", str(output)])
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Tests for city checkpoints"""
+
+import random
+
+from city import create_default_city
+from agent import generate_random_agent
+from checkpoint import save_checkpoint, load_checkpoint, MAGIC, FORMAT_VERSION, _HEADER
+
+
+def make_city(num_agents=25, seed=9):
+    random.seed(seed)
+    city = create_default_city("TestCity")
+    city.events.clear()
+    for _ in range(num_agents):
+        city.add_agent(generate_random_agent(age_range=(22, 45)))
+    return city
+
+
+def snapshot(city):
+    """Comparable state"""
+    agents = sorted((a.id, a.name, a.age, a.happiness, a.energy, a.relationship_status.value,
+                     a.pregnancy_status.value, len(a.friend_ids), city.get_location_name(a.current_location))
+                    for a in city.agents.values())
+    return (city.current_date, city.current_day, city.current_time, agents,
+            sorted((a.id, a.name) for a in city.graveyard.values()),
+            sorted((loc.name, len(loc.current_occupants)) for loc in city.locations.values()))
+
+
+def test_restore_continues_the_same_trajectory(tmp_path):
+    path = str(tmp_path / "city.ckpt")
+    city = make_city()
+    city.run(hours=24 * 20 + 5)
+    save_checkpoint(city, path)
+
+    city.run(hours=24 * 40)
+    expected = snapshot(city)
+
+    random.seed(12345)  # Restoring must bring the RNG back too
+    restored = load_checkpoint(path)
+    restored.run(hours=24 * 40)
+    assert snapshot(restored) == expected
+
+
+def test_restored_city_is_complete(tmp_path):
+    path = str(tmp_path / "city.ckpt")
+    city = make_city()
+    city.run(hours=30)
+    save_checkpoint(city, path)
+    restored = load_checkpoint(path)
+
+    assert snapshot(restored) == snapshot(city)
+    assert set(restored.jobs) == set(city.jobs)
+    for agent in restored.agents.values():
+        assert agent.city is restored
+    for location in restored.locations.values():
+        assert list(location.current_occupants) == list(city.locations[location.id].current_occupants)
+    assert not restored.events.active
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "not_a_checkpoint"
+    path.write_bytes(b"hello world, this is not a checkpoint")
+    try:
+        load_checkpoint(str(path))
+    except ValueError:
+        pass
+    else:
+        assert False, "loading a non-checkpoint should fail"
+
+
+def test_rejects_other_format_versions(tmp_path):
+    path = str(tmp_path / "city.ckpt")
+    save_checkpoint(make_city(num_agents=3), path)
+    with open(path, "rb") as f:
+        body = f.read()[_HEADER.size:]
+    for version in (FORMAT_VERSION - 1, FORMAT_VERSION + 1):
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, version) + body)
+        try:
+            load_checkpoint(path)
+        except ValueError as e:
+            assert f"format {version}" in str(e)
+        else:
+            assert False, f"loading a format {version} checkpoint should fail"
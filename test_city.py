@@ -0,0 +1,440 @@
+#!/usr/bin/env python3
+"""Tests for the city simulation engine"""
+
+from datetime import date, timedelta
+
+from city import create_default_city
+from agent import generate_random_agent
+
+
+def make_city(num_agents=10):
+    city = create_default_city("TestCity")
+    for _ in range(num_agents):
+        city.add_agent(generate_random_agent(age_range=(22, 45)))
+    return city
+
+
+def test_run_for_hours():
+    city = make_city()
+    progress = []
+    hours_done = city.run(hours=50, progress_callback=lambda c, h: progress.append(h), progress_interval=24)
+
+    assert hours_done == 50
+    assert city.current_day == 2
+    assert city.current_time == 50 % 24
+    assert progress == [24, 48]
+
+
+def test_run_until_date():
+    city = make_city()
+    hours_done = city.run(until_date=date(2024, 1, 3))
+
+    assert city.current_date == date(2024, 1, 3)
+    assert hours_done == 48
+
+
+def test_run_requires_a_limit():
+    city = make_city()
+    try:
+        city.run()
+    except ValueError:
+        pass
+    else:
+        assert False, "run() without limits should fail"
+
+
+def test_run_rejects_a_zero_progress_interval():
+    city = make_city(num_agents=2)
+    try:
+        city.run(hours=5, progress_callback=lambda c, h: None, progress_interval=0)
+    except ValueError:
+        pass
+    else:
+        assert False, "run() with progress_interval=0 should fail"
+
+
+def test_sample_pairs_matches_pairwise_odds():
+    import random
+    from city import sample_pairs
+
+    rng = random.Random(7)
+    count, probability, rounds = 12, 0.3, 3000
+    hits = {}
+    total_drawn = 0
+    for _ in range(rounds):
+        pairs = list(sample_pairs(count, probability, rng))
+        assert pairs == sorted(pairs)
+        assert len(set(pairs)) == len(pairs)
+        for i, j in pairs:
+            assert 0 <= i < j < count
+            hits[(i, j)] = hits.get((i, j), 0) + 1
+        total_drawn += len(pairs)
+
+    num_pairs = count * (count - 1) // 2
+    assert len(hits) == num_pairs
+    assert abs(total_drawn / (rounds * num_pairs) - probability) < 0.01
+    assert all(abs(n / rounds - probability) < 0.05 for n in hits.values())
+
+
+def test_sample_pairs_edge_cases():
+    from city import sample_pairs
+
+    assert list(sample_pairs(1, 0.5)) == []
+    assert list(sample_pairs(5, 0.0)) == []
+    assert len(list(sample_pairs(5, 1.0))) == 10
+
+
+def test_location_occupancy_slots_and_capacity():
+    from city import Location, LocationType
+
+    location = Location(id="loc", name="Cafe", location_type=LocationType.RESTAURANT, position=(0, 0), capacity=3)
+    assert location.add_occupant(1)
+    assert location.add_occupant(2)
+    assert location.add_occupant(3)
+    assert not location.add_occupant(4)  # Full
+    assert location.add_occupant(2)  # Already here
+    assert len(location.current_occupants) == 3
+
+    location.remove_occupant(2)
+    assert 2 not in location.current_occupants
+    assert location.slot_of(1) == 0 and location.slot_of(3) == 2
+    assert location.add_occupant(4)
+    assert location.slot_of(4) == 1  # Reuses the freed slot
+    assert list(location.current_occupants) == [1, 3, 4]
+    assert location.slot_of(2) is None
+
+
+def test_occupants_stay_consistent_during_run():
+    city = make_city(30)
+    city.run(hours=72)
+
+    for location in city.locations.values():
+        slots = [location.slot_of(agent_id) for agent_id in location.current_occupants]
+        assert len(set(slots)) == len(slots)
+        assert len(location.current_occupants) <= location.capacity
+    for agent in city.agents.values():
+        if agent.current_location:
+            assert agent.id in city.locations[agent.current_location].current_occupants
+
+
+
+def test_the_dead_leave_every_location():
+    city = make_city(30)
+    for agent in list(city.agents.values())[:15]:
+        agent.age, agent.health = 90, 0
+    city.run(hours=24 * 60)
+    assert city.graveyard
+    occupants = {agent_id for location in city.locations.values() for agent_id in location.current_occupants}
+    assert occupants <= set(city.agents) and not occupants & set(city.graveyard)
+
+
+def test_the_dead_leave_work_and_school(monkeypatch):
+    from city import LocationType
+
+    city = make_city(10)
+    worker, pupil = [agent for agent in city.agents.values() if agent.work_location][:2]
+    school = city.locations_of_type(LocationType.SCHOOL)[0]
+    assert city.move_agent(worker.id, worker.work_location) and city.move_agent(pupil.id, school.id)
+    monkeypatch.setattr(city.mortality, "daily_deaths", lambda agents, *args: [worker, pupil])
+    city._check_deaths(list(city.agents.values()))
+    assert worker.id in city.graveyard and pupil.id in city.graveyard
+    assert worker.id not in city.locations[worker.work_location].current_occupants
+    assert pupil.id not in school.current_occupants
+
+
+def test_location_index_tracks_free_capacity():
+    from city import LocationType
+
+    city = make_city(40)
+    city.run(hours=60)
+
+    def check():
+        for loc_type in LocationType:
+            expected = {loc.id for loc in city.locations.values()
+                        if loc.location_type == loc_type and loc.can_accommodate()}
+            assert set(city.location_index.available[loc_type]) == expected
+            assert {loc.id for loc in city.locations_of_type(loc_type)} == {
+                loc.id for loc in city.locations.values() if loc.location_type == loc_type}
+
+    check()
+    home = city.locations_of_type(LocationType.RESIDENTIAL)[0]
+    home.capacity = len(home.current_occupants)
+    check()
+    home.capacity += 1
+    check()
+    city.run(hours=30)
+    check()
+
+
+def make_seeded_city(seed, num_agents=30):
+    city = create_default_city("TestCity", seed=seed)
+    city.events.clear()
+    for _ in range(num_agents):
+        city.add_agent(generate_random_agent(age_range=(22, 45), city=city))
+    return city
+
+
+def seeded_snapshot(city):
+    return ([(a.id, a.name, a.age, a.happiness, a.current_location, a.relationship_status.value,
+              list(a.friend_ids), list(a.children_ids)) for a in city.agents.values()],
+            list(city.graveyard), [loc.position for loc in city.locations.values()])
+
+
+def test_seeded_runs_are_reproducible():
+    import random
+
+    first = make_seeded_city(42)
+    first.run(hours=24 * 90)
+    random.seed(0)  # The module-level generator must not matter
+    second = make_seeded_city(42)
+    second.run(hours=24 * 90)
+    assert seeded_snapshot(first) == seeded_snapshot(second)
+
+    other = make_seeded_city(43)
+    other.run(hours=24 * 90)
+    assert seeded_snapshot(other) != seeded_snapshot(first)
+
+
+def test_rng_streams_are_independent():
+    from city import RandomStreams
+
+    plain, busy = RandomStreams(7), RandomStreams(7)
+    for _ in range(1000):
+        busy.movement.random()
+        busy.social.random()
+    assert [plain.mortality.random() for _ in range(5)] == [busy.mortality.random() for _ in range(5)]
+    assert plain.fertility.random() == busy.fertility.random()
+    assert RandomStreams(7).movement.random() != RandomStreams(7).social.random()
+
+
+def test_generated_city_scales_with_population():
+    from city import create_generated_city, LocationType
+
+    city = create_generated_city("Big", population=2000, seed=1)
+    homes = sum(loc.capacity for loc in city.locations_of_type(LocationType.RESIDENTIAL))
+    seats = sum(loc.capacity for loc in city.locations_of_type(LocationType.WORKPLACE))
+    assert homes >= 3000 and seats >= 2000
+    assert all(0 <= c < city.grid_size for loc in city.locations.values() for c in loc.position)
+
+    for _ in range(2000):
+        city.add_agent(generate_random_agent(city=city))
+    assert all(agent.home_location for agent in city.agents.values())
+
+
+def test_birthday_index_matches_full_scan():
+    city = make_seeded_city(8, num_agents=60)
+    for agent in list(city.agents.values())[:40]:
+        agent.age = 70 + agent.age  # Elderly, so some die during the run
+        agent.health = 40
+    city.run(hours=24 * 400)
+    assert city.graveyard  # Deaths were removed from the index
+
+    indexed = sorted(agent_id for ids in city.birthdays.values() for agent_id in ids)
+    assert indexed == sorted(city.agents)
+    for (month, day), ids in city.birthdays.items():
+        for agent_id in ids:
+            assert (city.agents[agent_id].birthday.month, city.agents[agent_id].birthday.day) == (month, day)
+
+
+def test_leap_day_birthdays_fall_on_march_first_in_common_years():
+    from events import MemorySink, Birthday
+
+    city = make_seeded_city(2, num_agents=5)
+    leapling = generate_random_agent(city=city)
+    leapling.birthday = date(2000, 2, 29)
+    leapling.age = 23
+    city.add_agent(leapling)
+    sink = city.events.subscribe(MemorySink(), event_types=(Birthday,))
+
+    city.run(until_date=date(2026, 1, 1))  # 2024 is the only leap year
+    assert leapling.age == 25
+    assert [(e.when, e.age) for e in sink.events if e.agent_id == leapling.id] == [
+        (date(2024, 2, 29), 24), (date(2025, 3, 1), 25)]
+
+
+def test_couples_registry_matches_partner_links():
+    city = make_seeded_city(4, num_agents=60)
+    for agent in list(city.agents.values())[:20]:
+        agent.health = 5  # Some partners die along the way
+    city.run(hours=24 * 365 * 3)
+
+    linked = {tuple(sorted((agent.id, agent.partner_id))) for agent in city.agents.values() if agent.partner_id}
+    assert linked and {tuple(sorted((a.id, b.id))) for a, b in city.couples} == linked
+    assert len(city.couples) == len(linked)
+    assert all(a.relationship_status.value in ("engaged", "married") for a, _ in city.couples.committed())
+
+
+def test_linking_partner_ids_directly_registers_the_couple():
+    city = make_seeded_city(7, num_agents=3)
+    a, b, c = city.agents.values()
+    a.partner_id = b.id
+    assert (a.id, b.id) not in city.couples  # Not mutual yet
+    b.partner_id = a.id
+    assert (a.id, b.id) in city.couples and len(city.couples) == 1
+
+    b.partner_id = c.id  # Moving on breaks the couple
+    assert len(city.couples) == 0
+    c.partner_id = b.id
+    assert list(city.couples) == [(b, c)]
+
+
+def test_demographic_buckets_track_births_birthdays_and_deaths():
+    city = make_seeded_city(5, num_agents=60)
+    for agent in list(city.agents.values())[:15]:
+        agent.health = 5
+    city.run(hours=24 * 365 * 2)
+
+    by_bucket = {}
+    for agent in city.agents.values():
+        by_bucket.setdefault((agent.gender, city.demographics.band(agent.age)), set()).add(agent.id)
+    assert {key: set(bucket) for key, bucket in city.demographics.buckets.items() if len(bucket)} == by_bucket
+    men = {agent.id for agent in city.agents.values() if agent.gender == "male" and agent.age >= 16}
+    assert city.demographics.count("male", 16) == len(men)
+    assert {city.demographics.sample("male", 16, city.rng.fertility) for _ in range(200)} <= men
+
+
+def test_birth_credits_the_father_recorded_at_conception():
+    from agent import PregnancyStatus
+
+    city = make_seeded_city(3, num_agents=0)
+    mother = generate_random_agent(age_range=(25, 25), city=city)
+    partner, lover = (generate_random_agent(age_range=(30, 30), city=city) for _ in range(2))
+    mother.gender, partner.gender, lover.gender = "female", "male", "male"
+    for agent in (mother, partner, lover):
+        city.add_agent(agent)
+    mother.partner_id, partner.partner_id = partner.id, mother.id
+
+    mother.become_pregnant(lover.id)
+    mother.pregnancy_days = 270  # Due today
+    city._handle_pregnancies()
+    assert mother.pregnancy_status == PregnancyStatus.RECENTLY_GAVE_BIRTH and mother.pregnancy_father_id is None
+    child = city.agents[mother.children_ids[-1]]
+    assert child.father_id == lover.id and child.id in lover.children_ids and child.id not in partner.children_ids
+
+
+def test_pregnancy_and_recovery_run_on_the_city_clock():
+    from agent import PregnancyStatus, PREGNANCY_TERM_DAYS, POSTPARTUM_DAYS
+
+    city = make_seeded_city(4, num_agents=0)
+    mother = generate_random_agent(age_range=(25, 25), city=city)
+    mother.gender = "female"
+    mother.pregnancy_status = PregnancyStatus.PREGNANT
+    mother.pregnancy_days = 100  # Joins the city a hundred days in
+    city.add_agent(mother)
+    assert mother.pregnancy_days == 100 and city.timers.next_day() == PREGNANCY_TERM_DAYS - 100
+
+    city.current_day += 50
+    assert mother.pregnancy_days == 150  # No per-day bookkeeping
+    city._handle_pregnancies()
+    assert mother.pregnancy_status == PregnancyStatus.PREGNANT
+
+    city.current_day = PREGNANCY_TERM_DAYS - 100
+    city._handle_pregnancies()
+    assert mother.pregnancy_status == PregnancyStatus.RECENTLY_GAVE_BIRTH and mother.days_since_birth == 0
+    assert city.timers.next_day() == city.current_day + POSTPARTUM_DAYS
+
+    city.current_day += POSTPARTUM_DAYS
+    city._handle_pregnancies()
+    assert mother.pregnancy_status == PregnancyStatus.NOT_PREGNANT and mother.days_since_birth == 0
+    assert len(city.timers) == 0
+
+
+def test_setting_pregnancy_status_in_a_city_queues_its_timer():
+    from agent import PregnancyStatus, PREGNANCY_TERM_DAYS, POSTPARTUM_DAYS
+
+    city = make_seeded_city(4, num_agents=0)
+    mother = generate_random_agent(age_range=(25, 25), city=city)
+    mother.gender = "female"
+    city.add_agent(mother)
+    city.current_day = 10
+    mother.pregnancy_status = PregnancyStatus.PREGNANT
+    assert mother.pregnancy_days == 0 and city.timers.next_day() == 10 + PREGNANCY_TERM_DAYS
+
+    city.current_day += PREGNANCY_TERM_DAYS
+    city._handle_pregnancies()
+    assert mother.pregnancy_status == PregnancyStatus.RECENTLY_GAVE_BIRTH
+    assert city.timers.next_day() == city.current_day + POSTPARTUM_DAYS
+
+
+def test_relationship_start_dates_survive_joining_and_leaving():
+    from agent import Agent, DEFAULT_START_DATE
+
+    city = make_seeded_city(5, num_agents=0)
+    city.current_date = date(2030, 1, 1)
+    a = Agent(age=30, relationship_start_date=date(2020, 1, 1))
+    b = Agent(age=30)
+    b.days_in_relationship = 400  # Outside any city: counted to DEFAULT_START_DATE
+    assert b.relationship_start_date == DEFAULT_START_DATE - timedelta(days=400)
+    city.add_agent(a)
+    city.add_agent(b)
+    assert a.relationship_start_date == date(2020, 1, 1) and a.days_in_relationship == 3653
+
+    city.current_date = date(2031, 1, 1)
+    city.graveyard.add(a)  # Leaves the city
+    city.current_date = date(2040, 1, 1)
+    assert a.relationship_start_date == date(2020, 1, 1) and a.days_in_relationship == 4018
+
+
+
+def test_relationship_duration_follows_the_city_clock():
+    city = make_seeded_city(5, num_agents=0)
+    a, b = (generate_random_agent(age_range=(30, 30), city=city) for _ in range(2))
+    for agent in (a, b):
+        city.add_agent(agent)
+    a.partner_id, b.partner_id = b.id, a.id
+    a.relationship_start_date = b.relationship_start_date = city.current_date
+    assert a.days_in_relationship == 0
+
+    city.current_date += timedelta(days=10)  # No per-agent daily pass keeps count
+    assert a.days_in_relationship == b.days_in_relationship == 10
+
+    a.days_in_relationship = 400  # Setting it moves the start date back
+    assert a.relationship_start_date == city.current_date - timedelta(days=400)
+    a.relationship_start_date = None
+    assert a.days_in_relationship == 0
+
+
+def test_age_follows_the_birthday_on_the_city_clock():
+    from agent import Agent
+
+    city = make_seeded_city(6, num_agents=0)
+    newcomer = Agent(age=40)  # Default birthday, made to agree with the age on arrival
+    city.add_agent(newcomer)
+    assert newcomer.age == 40 and newcomer.birthday == date(1984, 1, 1)
+    assert city.demographics.count("male", 16) == 1
+
+    city.current_date = date(2024, 12, 31)
+    assert newcomer.age == 40
+    city.current_date = date(2025, 1, 1)
+    assert newcomer.age == 41
+
+    newcomer.age = 70  # Moves the birthday and the age band
+    assert newcomer.birthday == date(1955, 1, 1) and city.demographics.count("male", 65) == 1
+
+    city.graveyard.add(newcomer)
+    city.current_date = date(2030, 1, 1)
+    assert newcomer.age == 70  # Age at death once out of the city
+
+
+def test_leap_day_birthdays_keep_the_requested_age():
+    from agent import Agent
+
+    city = make_seeded_city(6, num_agents=0)
+    leapling = Agent(age=30, birthday=date(1996, 2, 29))
+    city.add_agent(leapling)
+    assert leapling.age == 30 and leapling.birthday == date(1993, 2, 28)  # 1993 has no Feb 29
+    assert leapling.id in city.birthdays[(2, 28)]
+
+    leapling.age = 16
+    assert leapling.age == 16 and leapling.birthday == date(2007, 2, 28)
+    keeper = Agent(age=23, birthday=date(2000, 2, 29))
+    city.add_agent(keeper)
+    assert keeper.birthday == date(2000, 2, 29) and keeper.id in city.birthdays[(2, 29)]
+    keeper.age = 21  # Born in a common year now: re-keyed to Feb 28
+    assert keeper.age == 21 and keeper.birthday == date(2002, 2, 28)
+    assert keeper.id in city.birthdays[(2, 28)] and keeper.id not in city.birthdays[(2, 29)]
+    keeper.age = 23
+    assert keeper.age == 23 and keeper.birthday == date(2000, 2, 28)
+
+    city.current_date = date(2025, 2, 28)
+    assert keeper.age == 25 and leapling.age == 18
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Tests for compatibility scoring and caching"""
+
+import random
+
+from city import create_default_city
+from agent import generate_random_agent, LifeGoal
+from compatibility import CompatibilityCache
+
+
+def uncached(agent1, agent2):
+    """Reference score straight from the scalar formulas"""
+    return ((agent1.personality.compatibility_score(agent2.personality) * 0.5)
+            + (agent1.hobby_compatibility(agent2) * 0.25)
+            + (agent1.goal_compatibility(agent2) * 0.25))
+
+
+def make_population(num_agents=30, seed=3):
+    random.seed(seed)
+    city = create_default_city("TestCity")
+    agents = [generate_random_agent() for _ in range(num_agents)]
+    for agent in agents:
+        city.add_agent(agent)
+    return city, agents
+
+
+def test_cached_scores_match_formulas_in_both_directions():
+    city, agents = make_population()
+    for _ in range(2):  # Second pass is served from the cache
+        for a in agents:
+            for b in agents:
+                if a is not b:
+                    assert a.overall_compatibility(b) == uncached(a, b)
+
+    stats = city.compatibility_cache.stats()
+    assert stats["hits"] > 0
+    assert stats["size"] == len(agents) * (len(agents) - 1) // 2
+
+
+def test_directional_goal_bonus_is_kept():
+    city, agents = make_population(2)
+    social, seeker = agents
+    social.life_goals = [LifeGoal.SOCIAL_BUTTERFLY]
+    seeker.life_goals = [LifeGoal.KNOWLEDGE_SEEKER]
+
+    assert social.overall_compatibility(seeker) == uncached(social, seeker)
+    assert seeker.overall_compatibility(social) == uncached(seeker, social)
+    assert social.overall_compatibility(seeker) != seeker.overall_compatibility(social)
+
+
+def test_trait_changes_invalidate_entries():
+    city, agents = make_population(2)
+    a, b = agents
+    a.overall_compatibility(b)
+
+    a.personality.extraversion = 100 - a.personality.extraversion
+    assert a.overall_compatibility(b) == uncached(a, b)
+
+    b.hobbies = ["knitting"]
+    assert a.overall_compatibility(b) == uncached(a, b)
+
+    b.life_goals.append(LifeGoal.NO_CHILDREN)
+    b.invalidate_compatibility()
+    assert a.overall_compatibility(b) == uncached(a, b)
+    assert city.compatibility_cache.misses == 4
+
+
+def test_other_writes_keep_cached_entries():
+    city, agents = make_population(2)
+    a, b = agents
+    a.overall_compatibility(b)
+    version = a._traits_version
+
+    a.happiness, a.energy, a.current_location = 10, 20, "park_1"  # Plain slot writes
+    assert a._traits_version == version
+    a.overall_compatibility(b)
+    assert city.compatibility_cache.misses == 1
+
+
+def test_lru_eviction():
+    city, agents = make_population(4)
+    city.compatibility_cache = cache = CompatibilityCache(maxsize=2)
+    a, b, c, d = agents
+
+    a.overall_compatibility(b)
+    a.overall_compatibility(c)
+    a.overall_compatibility(b)  # Refresh (a, b)
+    a.overall_compatibility(d)  # Evicts (a, c)
+    assert len(cache) == 2
+
+    a.overall_compatibility(b)
+    assert cache.hits == 2
+    a.overall_compatibility(c)
+    assert cache.misses == 4
+
+
+def test_compatibility_matrix_matches_scalar_scores():
+    import compatibility
+
+    _, agents = make_population(25)
+    agents[0].hobbies = []  # Neutral hobby score path
+    matrix = compatibility.compatibility_matrix(agents)
+    for i, a in enumerate(agents):
+        for j, b in enumerate(agents):
+            if i != j:
+                assert matrix[i][j] == uncached(a, b)
+
+
+def test_compatibility_matrix_without_numpy(monkeypatch):
+    import compatibility
+
+    _, agents = make_population(6)
+    monkeypatch.setattr(compatibility, "np", None)
+    matrix = compatibility.compatibility_matrix(agents)
+    for i, a in enumerate(agents):
+        for j, b in enumerate(agents):
+            if i != j:
+                assert matrix[i][j] == uncached(a, b)
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Tests for the simulation event bus and sinks"""
+
+import json
+import random
+from datetime import date
+
+from city import create_default_city
+from agent import generate_random_agent
+from events import (EventBus, MemorySink, FileSink, BatchingSink, ConsoleSink,
+                    FriendshipFormed, Death, Married, SimulationEvent)
+
+
+def make_city(num_agents=30, seed=5):
+    random.seed(seed)
+    city = create_default_city("TestCity")
+    for _ in range(num_agents):
+        city.add_agent(generate_random_agent(age_range=(22, 45)))
+    return city
+
+
+def test_console_sink_prints_legacy_messages(capsys):
+    bus = EventBus()
+    bus.subscribe(ConsoleSink())
+    bus.publish(FriendshipFormed(date(2024, 1, 1), "a", "Ann Lee", "b", "Bob Ray", 61.25))
+    assert capsys.readouterr().out == "👥 Ann Lee and Bob Ray became friends! (Compatibility: 61.2%)\n"
+
+
+def test_filtering_and_inactive_bus():
+    bus = EventBus()
+    assert not bus.active
+
+    deaths = bus.subscribe(MemorySink(), event_types=(Death,))
+    old = bus.subscribe(MemorySink(), where=lambda e: isinstance(e, Death) and e.age >= 80)
+    assert bus.active
+
+    bus.publish(Death(date(2024, 1, 1), "a", "Ann", 70))
+    bus.publish(Death(date(2024, 1, 2), "b", "Bob", 90))
+    bus.publish(Married(date(2024, 1, 3), "c", "Cy", "d", "Di"))
+    assert [e.name for e in deaths.events] == ["Ann", "Bob"]
+    assert [e.name for e in old.events] == ["Bob"]
+
+    bus.clear()
+    assert not bus.active
+
+
+def test_batching_file_sink(tmp_path):
+    path = tmp_path / "events.jsonl"
+    log = FileSink(str(path))
+    batcher = BatchingSink(log, batch_size=3)
+    for age in range(5):
+        batcher(Death(date(2024, 1, 1), str(age), "Ann", age))
+    log.flush()
+    assert len(path.read_text().splitlines()) == 3  # Last two still buffered
+
+    batcher.flush()
+    log.close()
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [r["age"] for r in records] == [0, 1, 2, 3, 4]
+    assert records[0]["event"] == "Death" and records[0]["when"] == "2024-01-01"
+
+
+def test_city_publishes_events_instead_of_printing(capsys):
+    city = make_city()
+    city.events.clear()
+    sink = city.events.subscribe(MemorySink())
+    city.run(hours=24 * 60)
+
+    assert capsys.readouterr().out == ""
+    assert sink.events
+    assert all(isinstance(e, SimulationEvent) for e in sink.events)
+    assert any(isinstance(e, FriendshipFormed) for e in sink.events)
+
+
+def test_quiet_city_is_unaffected_by_missing_sinks():
+    loud, quiet = make_city(), make_city()
+    loud.events.clear()
+    loud.events.subscribe(MemorySink())
+    quiet.events.clear()
+
+    random.seed(11)
+    loud.run(hours=24 * 30)
+    random.seed(11)
+    quiet.run(hours=24 * 30)
+    assert sorted(a.name for a in loud.agents.values()) == sorted(a.name for a in quiet.agents.values())
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""Tests for the accidental-pregnancy engine"""
+
+import random
+
+from agent import Agent, Personality, PregnancyStatus, RelationshipStatus
+from fertility import AccidentalPregnancyEngine
+
+
+def make_crowd():
+    """One fertile woman (most impulsive personality), ten men she mostly knows, and people who don't count"""
+    woman = Agent(id=1, age=24, gender="female", health=100,
+                  personality=Personality(conscientiousness=0, neuroticism=100))
+    men = [Agent(id=10 + i, age=30, gender="male") for i in range(10)]
+    for man in men[:8]:
+        woman.develop_friendship(man)
+    others = [Agent(id=2, age=24, gender="female", pregnancy_status=PregnancyStatus.PREGNANT),
+              Agent(id=3, age=50, gender="female"),
+              Agent(id=4, age=24, gender="female", days_since_birth=30),
+              Agent(id=5, age=15, gender="male")]
+    agents = {agent.id: agent for agent in [woman] + men + others}
+    return woman, agents
+
+
+def test_buckets_skip_everyone_who_cannot_take_part():
+    woman, agents = make_crowd()
+    women, men = AccidentalPregnancyEngine.bucket(list(agents) + [999], agents)
+    assert women == [woman]
+    assert sorted(men) == list(range(10, 20))
+
+
+def test_aggregate_probability_matches_per_encounter_rolls():
+    woman, agents = make_crowd()
+    _, men = AccidentalPregnancyEngine.bucket(agents, agents)
+    probability, known, _, _ = AccidentalPregnancyEngine.conception_probability(woman, men)
+    assert sorted(known) == list(range(10, 18))
+
+    trials = 20_000
+    rng = random.Random(5)
+    per_pair = 0
+    for _ in range(trials):
+        woman.pregnancy_status = PregnancyStatus.NOT_PREGNANT
+        per_pair += any(woman.try_accidental_pregnancy(man, rng) for man in men.values())
+    engine = AccidentalPregnancyEngine(random.Random(6))
+    woman.pregnancy_status = PregnancyStatus.NOT_PREGNANT
+    aggregate = sum(len(engine.daily_conceptions([list(agents)], agents)) for _ in range(trials))
+
+    expected = probability * trials
+    tolerance = 4 * (expected ** 0.5)
+    assert abs(per_pair - expected) < tolerance
+    assert abs(aggregate - expected) < tolerance
+
+
+def test_father_is_one_of_the_men_present():
+    woman, agents = make_crowd()
+    woman.relationship_status = RelationshipStatus.DATING
+    woman.partner_id = 19  # Dating counts as knowing him even without a friendship
+    _, men = AccidentalPregnancyEngine.bucket(agents, agents)
+    assert 19 in AccidentalPregnancyEngine.conception_probability(woman, men)[1]
+
+    engine = AccidentalPregnancyEngine(random.Random(1))
+    engine.rng.random = lambda: 0.0  # Every roll succeeds
+    ((mother, father),) = engine.daily_conceptions([list(agents)], agents)
+    assert mother is woman and father.id in men
+    assert woman.pregnancy_status == PregnancyStatus.NOT_PREGNANT  # The caller applies it
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""Tests for the on-disk graveyard archive"""
+
+import pickle
+from datetime import date
+
+from agent import Agent, generate_random_agent
+from city import create_default_city
+from graveyard import Graveyard
+
+
+def make_deceased(i):
+    return Agent(id=i + 1, name=f"Person {i}", age=70 + i, hobbies=["chess"],
+                 is_deceased=True, date_of_death=date(2030, 1, 1 + i))
+
+
+def test_lookups_load_lazily_and_recent_is_newest_first(tmp_path):
+    graveyard = Graveyard(path=str(tmp_path / "graves.bin"), cache_size=2)
+    for i in range(5):
+        graveyard.add(make_deceased(i))
+
+    assert len(graveyard) == 5 and list(graveyard) == [1, 2, 3, 4, 5]
+    assert 4 in graveyard and 99 not in graveyard
+    assert graveyard.get(99) is None
+    agent = graveyard[3]
+    assert (agent.name, agent.age, agent.hobbies, agent.date_of_death) == ("Person 2", 72, ["chess"], date(2030, 1, 3))
+
+    recent = graveyard.recent()
+    assert [a.id for a in recent] == [5, 4, 3, 2, 1]
+    assert recent[-1].id == 1 and [a.id for a in recent[1:3]] == [4, 3]
+    assert len(graveyard._cache) == 2  # Only the most recent loads stay in memory
+    assert graveyard.bytes_on_disk == (tmp_path / "graves.bin").stat().st_size
+
+
+def test_city_archives_the_dead_and_checkpoints_carry_the_records():
+    city = create_default_city("TestCity", seed=8)
+    city.events.clear()
+    for _ in range(30):
+        agent = generate_random_agent(age_range=(60, 90), city=city)
+        agent.health = 1
+        city.add_agent(agent)
+    city.run(hours=24 * 365)
+    assert isinstance(city.graveyard, Graveyard) and len(city.graveyard) > 0
+    dead = list(city.graveyard.values())
+    assert all(a.is_deceased and a.city is None and a.id not in city.agents for a in dead)
+
+    restored = pickle.loads(pickle.dumps(city))
+    assert [(a.id, a.name, a.date_of_death) for a in restored.graveyard.values()] == \
+        [(a.id, a.name, a.date_of_death) for a in dead]
@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""Tests for the slotted model classes and the memory report"""
+
+import pickle
+
+from city import Location, Job, LocationType
+from agent import Agent, Personality
+from memory_report import bytes_per_agent, memory_report, unslotted_copy
+
+
+def test_model_classes_are_slotted():
+    objects = [Agent(id=1), Personality(), Job(id="j1", title="Clerk", location_id="w1",
+                                                  required_education="high_school", salary_range=(1, 2)),
+               Location(id="l1", name="Park", location_type=LocationType.PARK, position=(0, 0))]
+    for obj in objects:
+        assert not hasattr(obj, "__dict__")
+        assert pickle.loads(pickle.dumps(obj)) == obj
+
+
+def test_report_measures_slotted_agents_smaller():
+    report = memory_report(agents=60, days=10, seed=4)
+    living = report["living"]
+    assert living["agents"] > 0
+    assert 0 < living["slotted"] < living["unslotted"]
+
+    agent = Agent(id=2, name="Ann Lee", hobbies=["reading"])
+    mirror = unslotted_copy(agent)
+    assert mirror.hobbies is agent.hobbies and mirror.personality.openness == agent.personality.openness
+    assert bytes_per_agent([])["agents"] == 0
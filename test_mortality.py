@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""Tests for the vectorized mortality pass"""
+
+import random
+
+import pytest
+
+from agent import Agent
+from mortality import MortalityEngine, death_probabilities, reference_daily_deaths
+
+
+def make_population(count=5000, seed=4):
+    rng = random.Random(seed)
+    return [Agent(id=i + 1, age=rng.randint(0, 105), health=rng.randint(0, 100)) for i in range(count)]
+
+
+def test_hazard_table_matches_scalar_probabilities():
+    pytest.importorskip("numpy")
+    agents = [Agent(age=age, health=health) for age in range(0, 111) for health in range(0, 101)]
+    probabilities = death_probabilities([a.age for a in agents], [a.health for a in agents])
+    assert list(probabilities) == [a.calculate_death_probability() for a in agents]
+
+
+def test_seeded_engine_matches_reference():
+    np = pytest.importorskip("numpy")
+    agents = make_population()
+    engine = MortalityEngine(random.Random(11))
+    reference_generator = np.random.Generator(np.random.PCG64(random.Random(11).getrandbits(128)))
+
+    for _ in range(30):
+        assert engine.daily_deaths(agents) == reference_daily_deaths(agents, reference_generator)
+
+
+def test_death_rates_match_per_agent_path():
+    agents = make_population(2000)
+    days = 200
+    expected = sum(a.calculate_death_probability() for a in agents) * days
+    for vectorized in (True, False):
+        engine = MortalityEngine(random.Random(5), vectorized=vectorized)
+        deaths = sum(len(engine.daily_deaths(agents)) for _ in range(days))
+        assert abs(deaths - expected) < 4 * expected ** 0.5  # Within 4 standard deviations
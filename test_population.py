@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Tests for the columnar population store"""
+
+from datetime import date
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from city import create_default_city
+from agent import Agent, RelationshipStatus, PregnancyStatus, generate_random_agent
+from population import PopulationStore, StoredAgent, STORED_FIELDS
+
+
+def make_city(seed=6, num_agents=40, columnar=False):
+    city = create_default_city("TestCity", seed=seed)
+    city.events.clear()
+    if columnar:
+        city.enable_population_store()
+    for _ in range(num_agents):
+        city.add_agent(generate_random_agent(age_range=(0, 90), city=city))
+    return city
+
+
+def test_attach_and_detach_round_trip():
+    store = PopulationStore(capacity=2)
+    agents = [Agent(id=i + 1, age=30 + i, birthday=date(1994 - i, 3, 1 + i), gender="female" if i % 2 else "male", health=90,
+                    relationship_status=RelationshipStatus.MARRIED, home_location=f"res_{i}")
+              for i in range(5)]
+    before = [{name: getattr(agent, name) for name in STORED_FIELDS} for agent in agents]
+    for agent in agents:
+        store.attach(agent)  # Grows past the initial capacity
+    assert len(store) == 5 and all(isinstance(agent, StoredAgent) for agent in agents)
+    with pytest.raises(AttributeError):
+        Agent.health.__get__(agents[0])  # Moved out of the slot, not copied
+    assert [{name: getattr(agent, name) for name in STORED_FIELDS} for agent in agents] == before
+
+    agent = agents[3]
+    agent.happiness = 12
+    agent.pregnancy_status = PregnancyStatus.PREGNANT
+    agent.current_location = "park_1"
+    agent.work_location = None
+    assert store.column("happiness", [agent])[0] == 12
+    assert list(store.ages(date(2024, 3, 3), agents)) == [30, 31, 32, 32, 33]  # Before the last two birthdays
+    assert list(store.ages(date(2024, 3, 5), agents)) == [30, 31, 32, 33, 34]
+
+    store.detach(agent)
+    assert type(agent) is Agent and len(store) == 4
+    assert (agent.happiness, agent.pregnancy_status, agent.current_location, agent.work_location) == (
+        12, PregnancyStatus.PREGNANT, "park_1", None)
+    assert agent._store is None and agent._row == -1
+
+    newcomer = Agent(id=100, age=1)
+    store.attach(newcomer)
+    assert newcomer._row == 3  # Freed row is reused
+    assert agents[4].age == 34
+
+
+def test_store_backed_city_runs_the_same_simulation():
+    plain = make_city()
+    columnar = make_city(columnar=True)
+    for agent in list(plain.agents.values())[:10] + list(columnar.agents.values())[:10]:
+        agent.health = 5  # Make some deaths happen
+    plain.run(hours=24 * 200)
+    columnar.run(hours=24 * 200)
+
+    def state(city):
+        return ([(a.id, a.age, a.health, a.happiness, a.relationship_status, a.pregnancy_status,
+                  a.current_location, a.home_location) for a in city.agents.values()], list(city.graveyard))
+    assert state(plain) == state(columnar)
+    assert columnar.graveyard
+    assert all(type(agent) is Agent for agent in columnar.graveyard.values())
+    assert all(isinstance(agent, StoredAgent) for agent in columnar.agents.values())
+    assert len(columnar.population) == len(columnar.agents)
+
+
+def test_vectorized_ages_match_age_on():
+    import random
+    from agent import age_on
+    from population import ages_on
+
+    rng = random.Random(3)
+    birthdays = [date.fromordinal(rng.randint(date(1920, 1, 1).toordinal(), date(2024, 12, 31).toordinal()))
+                 for _ in range(2000)] + [date(2000, 2, 29), date(1999, 3, 1), date(2000, 12, 31)]
+    for today in (date(2025, 2, 28), date(2025, 3, 1), date(2024, 2, 29), date(2024, 12, 31), date(2030, 1, 1)):
+        expected = [age_on(birthday, today) for birthday in birthdays]
+        assert list(ages_on([birthday.toordinal() for birthday in birthdays], today)) == expected
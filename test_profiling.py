@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""Tests for the simulate_hour profiler"""
+
+from city import create_default_city
+from agent import generate_random_agent
+from profiling import PHASES, SimulationProfiler
+
+
+def make_city(seed=3, num_agents=40):
+    city = create_default_city("TestCity", seed=seed)
+    city.events.clear()
+    for _ in range(num_agents):
+        city.add_agent(generate_random_agent(age_range=(0, 70), city=city))
+    return city
+
+
+def test_profiler_counts_phases_and_work():
+    city = make_city()
+    profiler = city.enable_profiling(SimulationProfiler(window_hours=24))
+    city.run(hours=24 * 31)
+
+    totals = profiler.totals()
+    calls = {phase: info["calls"] for phase, info in totals["phases"].items()}
+    assert set(calls) == set(PHASES)
+    assert calls["movement"] == calls["social"] == 24 * 31
+    assert calls["birthdays"] == calls["mortality"] == 31
+    assert calls["pregnancies"] == calls["accidental_pregnancies"] == 31
+    assert calls["relationship_health"] == calls["family_planning"] == 2  # Days 0 and 30
+    assert totals["counters"]["hours"] == 24 * 31
+    assert totals["counters"]["pairs_evaluated"] > 0
+    assert totals["counters"]["moves_made"] > 0
+    assert abs(sum(info["share"] for info in totals["phases"].values()) - 1) < 1e-9
+    assert totals["wall_seconds"] >= totals["seconds"] > 0  # Phases are part of each hour
+
+    assert profiler.recent()["counters"]["hours"] == 24  # Last complete day
+    assert "pairs evaluated" in profiler.report()
+
+
+def test_profiling_does_not_change_the_run():
+    plain, profiled = make_city(), make_city()
+    profiled.enable_profiling()
+    plain.run(hours=24 * 20)
+    profiled.run(hours=24 * 20)
+    assert profiled.disable_profiling() is not None and profiled.profiler is None
+
+    def state(city):
+        return [(a.id, a.current_location, a.happiness, list(a.friend_ids)) for a in city.agents.values()]
+    assert state(plain) == state(profiled)
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Tests for city-issued agent ids"""
+
+import pytest
+
+from agent import Agent, format_agent_id, generate_random_agent
+from city import create_default_city
+from registry import AgentRegistry, LOOSE_ID_BASE
+
+
+def test_city_issues_dense_ids_and_never_reuses_them():
+    city = create_default_city("TestCity", seed=11)
+    city.events.clear()
+    for _ in range(30):
+        agent = generate_random_agent(age_range=(70, 90), city=city)
+        agent.health = 1
+        city.add_agent(agent)
+    assert sorted(city.agents) == list(range(1, 31))
+    assert all(agent_id in city.registry for agent_id in city.agents)
+
+    city.run(hours=24 * 365)
+    assert city.graveyard
+    dead_id = next(iter(city.graveyard))
+    assert dead_id not in city.registry
+    newcomer = generate_random_agent(city=city)
+    assert newcomer.id == len(city.registry) > max(list(city.agents) + list(city.graveyard))
+
+    with pytest.raises(ValueError):
+        city.add_agent(Agent(id=dead_id))  # Ids of the dead stay retired
+
+
+def test_registry_reserves_ids_issued_elsewhere():
+    registry = AgentRegistry()
+    loose = Agent(id=5)
+    registry.register(loose.id)
+    assert 5 in registry and len(registry) == 5
+    assert registry.new_id() == 6
+    with pytest.raises(ValueError):
+        registry.register(5)
+    with pytest.raises(TypeError):
+        registry.register("abc")
+    assert format_agent_id(42) == "#000042" and format_agent_id(None) == "-"
+
+
+def test_loose_ids_never_collide_with_city_ids():
+    city = create_default_city("TestCity", seed=12)
+    city.events.clear()
+    pending = generate_random_agent(city=city)  # Id issued, not added yet
+    loose = [Agent() for _ in range(3)]
+    assert all(agent.id >= LOOSE_ID_BASE for agent in loose)
+    for agent in loose:
+        city.add_agent(agent)
+    city.add_agent(pending)
+    assert len(city.registry) == 1  # The loose ids did not pad the dense range
+    assert all(agent.id in city.registry for agent in loose + [pending])
+
+    with pytest.raises(ValueError):
+        city.registry.register(pending.id)  # Taken once registered
+    city.registry.unregister(loose[0].id)
+    with pytest.raises(ValueError):
+        city.add_agent(Agent(id=loose[0].id))
+    assert city.registry.new_id() not in city.registry  # Pending ids are not agents
@@ -0,0 +1,15 @@
+from scheduler import DayScheduler
+
+
+def test_pops_only_due_timers_in_day_then_schedule_order():
+    timers = DayScheduler()
+    timers.schedule(5, "birth", 1)
+    timers.schedule(3, "recovery", 2)
+    timers.schedule(5, "recovery", 3)
+    timers.schedule(9, "birth", 4)
+
+    assert timers.pop_due(2) == []
+    assert timers.pop_due(5) == [("recovery", 2), ("birth", 1), ("recovery", 3)]
+    assert len(timers) == 1 and timers.next_day() == 9
+    assert timers.pop_due(100) == [("birth", 4)]
+    assert timers.next_day() is None
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""Tests for the city's friendship graph"""
+
+import pytest
+
+from agent import generate_random_agent
+from city import create_default_city
+from social_graph import SocialGraph
+
+
+def test_edges_degrees_and_components():
+    graph = SocialGraph()
+    for agent_id in range(1, 7):
+        graph.add_vertex(agent_id)
+    assert graph.add_edge(1, 2) and graph.add_edge(2, 3) and graph.add_edge(4, 5)
+    assert not graph.add_edge(2, 1)  # Already friends
+    assert graph.has_edge(3, 2) and not graph.has_edge(1, 3) and not graph.has_edge(9, 1)
+    assert graph.degrees() == {1: 1, 2: 2, 3: 1, 4: 1, 5: 1, 6: 0} and graph.edge_count() == 3
+    assert graph.components() == [[1, 2, 3], [4, 5], [6]]
+
+    assert graph.remove_vertex(2) == [1, 3]
+    assert 2 not in graph and graph.degree(1) == 0 and graph.degree(3) == 0
+    assert graph.remove_edge(5, 4) and not graph.has_edge(4, 5)
+
+
+def test_friend_ids_is_a_read_only_view_of_the_city_graph():
+    city = create_default_city("TestCity", seed=2)
+    city.events.clear()
+    alice, bob, carol = (generate_random_agent(city=city) for _ in range(3))
+    for agent in (alice, bob, carol):
+        city.add_agent(agent)
+    alice.develop_friendship(bob)
+    alice.develop_friendship(carol)
+    alice.develop_friendship(bob)
+
+    assert alice.friend_ids == [bob.id, carol.id] and bob.id in alice.friend_ids
+    assert alice.friend_ids[-1] == carol.id and len(carol.friend_ids) == 1
+    assert city.social.has_edge(bob.id, alice.id) and city.social.degree(alice.id) == 2
+    with pytest.raises(AttributeError):
+        alice.friend_ids.append(carol.id)
+
+    city._handle_agent_death(alice.id)
+    assert list(bob.friend_ids) == [] and list(carol.friend_ids) == []
+    assert alice.id not in city.social
+
+
+def test_friend_ids_can_be_given_at_construction_and_indexed_from_either_end():
+    from agent import Agent
+
+    agent = Agent(friend_ids=[5, 3, 8, 1, 9])
+    view = agent.friend_ids
+    assert [view[i] for i in range(5)] == [5, 3, 8, 1, 9]
+    assert [view[i] for i in range(-5, 0)] == [5, 3, 8, 1, 9]
+    assert view[1:3] == [3, 8] and 8 in view
+    with pytest.raises(IndexError):
+        view[5]
+    assert Agent().friend_ids == []